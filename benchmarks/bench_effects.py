@@ -0,0 +1,48 @@
+"""Measure how fast each procedural effect renders a full frame.
+
+Each effect is rendered onto a layout, copied into the frame buffer with
+``Layout.set_canvas`` and encoded with ``Layout.render_frame`` — everything a
+streamed frame costs except the network. The device itself accepts roughly
+20-30 frames per second, so every effect should report a rate far above that
+(comfortably so on a Raspberry Pi-class CPU)::
+
+    python benchmarks/bench_effects.py            # 6-module stack
+    python benchmarks/bench_effects.py --modules 10 --frames 2000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from yeelight_matrix import Layout  # noqa: E402
+from yeelight_matrix.effects import DEFAULT_FPS, EFFECTS  # noqa: E402
+
+
+def bench(name: str, modules: int, frames: int) -> float:
+    """Return frames per second for one effect."""
+    layout = Layout("vertical", "bottom", ["5x5_clear"] * modules)
+    effect = EFFECTS[name](layout.canvas_size)
+    start = time.perf_counter()
+    for n in range(frames):
+        layout.set_canvas(effect.render(n / DEFAULT_FPS))
+        layout.render_frame()
+    return frames / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modules", type=int, default=6, help="5x5 modules in the stack")
+    parser.add_argument("--frames", type=int, default=1000, help="frames per effect")
+    args = parser.parse_args()
+
+    print(f"{'effect':<12} {'fps':>10} {'ms/frame':>10}")
+    for name in EFFECTS:
+        fps = bench(name, args.modules, args.frames)
+        print(f"{name:<12} {fps:>10.0f} {1000 / fps:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""pytest-benchmark micro-benchmarks for the colour, layout and image hot paths.
+
+See ``benchmarks/pytest.ini`` for how to store a baseline and compare against it.
+"""
+
+import io
+import tracemalloc
+
+import pytest
+from PIL import Image
+
+from yeelight_matrix.color import encode_many, to_hex, to_rgb
+from yeelight_matrix.enums import Orientation
+from yeelight_matrix.image_utils import DEFAULT_IMAGE_CACHE, load_image_grids, rotate_grid
+from yeelight_matrix.journal import FrameJournal
+from yeelight_matrix.layout import Layout
+from yeelight_matrix.module import Module
+
+ORIENTATIONS = [
+    ("vertical", "top"),
+    ("vertical", "bottom"),
+    ("horizontal", "left"),
+    ("horizontal", "right"),
+]
+GRID = [f"#{(i * 0x0a1b2c) & 0xffffff:06x}" for i in range(25)]
+
+
+# -- colour -------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("color", ["#12ab9f", (18, 171, 159)], ids=["hex", "tuple"])
+def test_to_rgb(benchmark, color):
+    benchmark(to_rgb, color)
+
+
+def test_to_hex(benchmark):
+    benchmark(to_hex, (18, 171, 159))
+
+
+@pytest.mark.parametrize("count", [25, 300])
+def test_encode_many(benchmark, count):
+    benchmark(encode_many, (GRID * 12)[:count])
+
+
+# -- module and layout ----------------------------------------------------------
+
+
+def test_module_set_grid(benchmark):
+    benchmark(Module("5x5_clear").set_grid, GRID)
+
+
+def test_layout_set_pixel(benchmark):
+    layout = Layout("vertical", "bottom", ["5x5_clear"] * 6)
+    benchmark(layout.set_pixel, 3, 2, 4, "#ff8800")
+
+
+@pytest.mark.parametrize("modules", [1, 3, 6, 12])
+@pytest.mark.parametrize("orientation, base", ORIENTATIONS)
+def test_render_frame(benchmark, orientation, base, modules):
+    """A full redraw: every module changed since the last frame."""
+    layout = Layout(orientation, base, ["5x5_clear"] * modules)
+    colors = iter(range(1 << 24))
+
+    def redraw():
+        layout.fill(f"#{next(colors):06x}")
+        return layout.render_frame()
+
+    benchmark(redraw)
+
+
+@pytest.mark.parametrize("modules", [1, 12])
+def test_render_frame_one_dot_changed(benchmark, modules):
+    layout = Layout("vertical", "bottom", ["5x5_clear"] * modules)
+    layout.render_frame()
+    colors = iter(range(1 << 24))
+
+    def redraw():
+        layout.set_pixel(0, 2, 2, f"#{next(colors):06x}")
+        return layout.render_frame()
+
+    benchmark(redraw)
+
+
+@pytest.mark.parametrize("modules", [1, 12])
+def test_state_publication_one_dot_changed(benchmark, modules):
+    """Publish a one-dot draw: commit it to the journal viewers subscribe to.
+
+    ``extra_info["allocated_bytes"]`` records the memory one publication
+    allocates (via :mod:`tracemalloc`); only the edited module's colours are
+    rebuilt and compared, so it stays flat as the stack grows. Copying every
+    module's colours instead costs about 1.8 KB per module, which a 12-module
+    stack would take far over the asserted bound.
+    """
+    layout = Layout("vertical", "bottom", ["5x5_clear"] * modules)
+    journal = FrameJournal(layout)
+    colors = iter(range(1 << 24))
+
+    def publish():
+        layout.set_pixel(0, 2, 2, f"#{next(colors):06x}")
+        return journal.commit()
+
+    publish()
+    tracemalloc.start()
+    publish()
+    allocated = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    benchmark.extra_info["allocated_bytes"] = allocated
+    assert allocated < 6 * 1024
+    benchmark(publish)
+
+
+@pytest.mark.parametrize("degrees", [90, 180, 270])
+def test_rotate_grid(benchmark, degrees):
+    benchmark(rotate_grid, GRID, degrees)
+
+
+# -- images -------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("size", [16, 64, 256, 1024])
+def test_load_image_grids(benchmark, size):
+    """Decode, resize and slice a PNG onto 4 modules (cache cleared each round)."""
+    data = io.BytesIO()
+    Image.effect_noise((size, size), 64).convert("RGB").save(data, "PNG")
+    data = data.getvalue()
+
+    def setup():
+        DEFAULT_IMAGE_CACHE.clear()
+        return (data, 4, Orientation.VERTICAL), {}
+
+    benchmark.pedantic(load_image_grids, setup=setup, rounds=30, warmup_rounds=2)
+
+
+def test_load_image_grids_cached(benchmark):
+    data = io.BytesIO()
+    Image.effect_noise((256, 256), 64).convert("RGB").save(data, "PNG")
+    data = data.getvalue()
+    orientation = Orientation.VERTICAL
+    load_image_grids(data, 4, orientation)
+    benchmark(load_image_grids, data, 4, orientation)
@@ -0,0 +1,187 @@
+"""Measure frame throughput and per-frame latency without hardware.
+
+Frames are rendered with ``Layout.render_frame`` and pushed through
+``CubeMatrix`` (the synchronous driver) and ``AsyncCubeMatrix`` to a local
+``CubeSimulator``, over a control connection and in music mode. The simulator
+can imitate a slow, rate-limited or lossy device::
+
+    python benchmarks/bench_throughput.py
+    python benchmarks/bench_throughput.py --latency 0.005 --frames 200
+    python benchmarks/bench_throughput.py --rate-limit 20 --max-fps 15
+
+The Home Assistant controller itself needs Home Assistant, so its push path is
+measured through the pieces it delegates to: each ``FrameScheduler`` frame is
+a layout edit followed by ``await scheduler.draw()`` (render, change check,
+``max_fps`` limit and send), exactly as a controller draw.
+
+For each path the harness prints frames per second and the median and 95th
+percentile time per frame. Over a control connection a frame's time is the full
+round trip; in music mode (no replies) it is the time to hand the frame to the
+socket, and the rate is measured until the device has received every frame.
+Frames the device rejects (``--rate-limit`` quota errors) are counted, not
+fatal.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from yeelight_matrix import AsyncCubeMatrix, CubeMatrix, Layout  # noqa: E402
+from yeelight_matrix.effects import RainbowScroll  # noqa: E402
+from yeelight_matrix.exceptions import CubeMatrixError  # noqa: E402
+from yeelight_matrix.scheduler import FrameScheduler  # noqa: E402
+from yeelight_matrix.simulator import CubeSimulator, SimulatorThread  # noqa: E402
+
+
+def make_layout(modules: int) -> Layout:
+    return Layout("vertical", "bottom", ["5x5_clear"] * modules)
+
+
+def make_canvases(layout: Layout, count: int):
+    """Return ``count`` distinct canvas images for ``layout``."""
+    effect = RainbowScroll(layout.canvas_size)
+    return [effect.render(n / 30) for n in range(count)]
+
+
+def make_frames(modules: int, count: int):
+    """Render ``count`` distinct frames; return them and the render times."""
+    layout = make_layout(modules)
+    frames, times = [], []
+    for pixels in make_canvases(layout, count):
+        layout.set_canvas(pixels)
+        start = time.perf_counter()
+        frames.append(layout.render_frame())
+        times.append(time.perf_counter() - start)
+    return frames, times
+
+
+def report(name: str, times, total: float, rejected: int = 0) -> None:
+    times = sorted(times)
+    p95 = times[min(len(times) - 1, int(len(times) * 0.95))]
+    print(
+        f"{name:<32} {(len(times) - rejected) / total:>10.0f} "
+        f"{statistics.median(times) * 1000:>10.3f} {p95 * 1000:>10.3f}"
+    )
+    if rejected:
+        print(f"  {rejected} of {len(times)} frames rejected by the device")
+
+
+def wait_for_frames(device: CubeSimulator, count: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while len(device.frames) + device.dropped < count and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+async def async_wait_for_frames(device: CubeSimulator, count: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while len(device.frames) + device.dropped < count and time.monotonic() < deadline:
+        await asyncio.sleep(0.001)
+
+
+def bench_sync(frames, simulator: CubeSimulator, music_mode: bool) -> None:
+    with SimulatorThread(simulator) as device:
+        cube = CubeMatrix("127.0.0.1", device.port, music_mode=music_mode)
+        times, rejected = [], 0
+        start = time.perf_counter()
+        for frame in frames:
+            sent = time.perf_counter()
+            try:
+                cube.update_leds(frame)
+            except CubeMatrixError:
+                rejected += 1
+            times.append(time.perf_counter() - sent)
+        wait_for_frames(device.simulator, len(frames) - rejected)
+        total = time.perf_counter() - start
+    report(f"CubeMatrix {'music' if music_mode else 'control'}", times, total, rejected)
+
+
+async def bench_async(
+    frames, simulator: CubeSimulator, music_mode: bool, packet_loss: float = 0.0
+) -> None:
+    async with simulator as device:
+        async with AsyncCubeMatrix("127.0.0.1", device.port, music_mode=music_mode) as cube:
+            # Lose frames only once connected, so the handshake always completes.
+            device.packet_loss = packet_loss
+            times, rejected = [], 0
+            start = time.perf_counter()
+            for frame in frames:
+                sent = time.perf_counter()
+                try:
+                    await cube.update_leds(frame)
+                except CubeMatrixError:
+                    rejected += 1
+                times.append(time.perf_counter() - sent)
+            await async_wait_for_frames(device, len(frames) - rejected)
+            total = time.perf_counter() - start
+    name = f"AsyncCubeMatrix {'music' if music_mode else 'control'}"
+    if packet_loss:
+        name += f" {packet_loss:.0%} loss"
+    report(name, times, total, rejected)
+    if packet_loss:
+        print(f"  {device.dropped} of {len(frames)} frames lost")
+
+
+async def bench_scheduler(
+    modules: int, count: int, simulator: CubeSimulator, music_mode: bool, max_fps: float
+) -> None:
+    """Edit the layout and draw each frame through FrameScheduler (the controller's path)."""
+    layout = make_layout(modules)
+    canvases = make_canvases(layout, count)
+    async with simulator as device:
+        async with AsyncCubeMatrix("127.0.0.1", device.port, music_mode=music_mode) as cube:
+            scheduler = FrameScheduler(cube, layout.render_frame, max_fps)
+            times, rejected = [], 0
+            start = time.perf_counter()
+            for pixels in canvases:
+                layout.set_canvas(pixels)
+                sent = time.perf_counter()
+                try:
+                    await scheduler.draw()
+                except CubeMatrixError:
+                    rejected += 1
+                times.append(time.perf_counter() - sent)
+            await async_wait_for_frames(device, count - rejected)
+            total = time.perf_counter() - start
+    name = f"FrameScheduler {'music' if music_mode else 'control'}"
+    if max_fps:
+        name += f" {max_fps:g} fps"
+    report(name, times, total, rejected)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modules", type=int, default=6, help="5x5 modules in the stack")
+    parser.add_argument("--frames", type=int, default=500, help="frames per run")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per command")
+    parser.add_argument("--rate-limit", type=float, help="control commands per second")
+    parser.add_argument("--packet-loss", type=float, default=0.0, help="chance a frame is lost")
+    parser.add_argument(
+        "--max-fps", type=float, default=0.0, help="FrameScheduler frame-rate limit (0: none)"
+    )
+    args = parser.parse_args()
+
+    def simulator() -> CubeSimulator:
+        return CubeSimulator(latency=args.latency, rate_limit=args.rate_limit, seed=0)
+
+    frames, render_times = make_frames(args.modules, args.frames)
+    print(f"{'path':<32} {'fps':>10} {'p50 ms':>10} {'p95 ms':>10}")
+    report("Layout.render_frame", render_times, sum(render_times))
+
+    for music_mode in (False, True):
+        bench_sync(frames, simulator(), music_mode)
+        asyncio.run(bench_async(frames, simulator(), music_mode))
+        asyncio.run(
+            bench_scheduler(args.modules, args.frames, simulator(), music_mode, args.max_fps)
+        )
+
+    if args.packet_loss:
+        asyncio.run(bench_async(frames, simulator(), True, args.packet_loss))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+"""Make the ``yeelight_matrix`` package importable when running benchmarks in-place."""
+
+import os
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
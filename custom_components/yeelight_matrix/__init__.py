@@ -1,19 +1,29 @@
 """The Yeelight Matrix integration."""
 from __future__ import annotations
 
+import logging
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_PORT, Platform
 from homeassistant.core import HomeAssistant
-from yeelight_matrix import CubeMatrix, Layout
+from homeassistant.exceptions import ConfigEntryNotReady
+from yeelight_matrix import AsyncCubeMatrix, CubeMatrixError, Layout
 
 from .const import (
     CONF_BASE_POSITION,
     CONF_LAYOUT_ORIENTATION,
+    CONF_MAX_FPS,
     CONF_MODULES,
+    CONF_REALTIME_PORT,
+    DEFAULT_MAX_FPS,
+    DEFAULT_REALTIME_PORT,
     DOMAIN,
 )
 from .controller import YeelightMatrixController
 from .frontend import async_register_card
+from .websocket import async_register_websocket_commands
+
+_LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.LIGHT]
 
@@ -26,17 +36,29 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     base = entry.data[CONF_BASE_POSITION]
     modules = entry.data[CONF_MODULES]
 
-    # Constructing the cube performs network I/O; keep it off the event loop.
-    cube = await hass.async_add_executor_job(CubeMatrix, host, port)
+    cube = AsyncCubeMatrix(host, port)
+    try:
+        await cube.connect()
+    except CubeMatrixError as exc:
+        raise ConfigEntryNotReady(f"Cannot reach the cube at {host}:{port}") from exc
     layout = Layout(orientation, base, modules)
-    controller = YeelightMatrixController(hass, cube, layout, entry.entry_id)
+    max_fps = entry.data.get(CONF_MAX_FPS, DEFAULT_MAX_FPS)
+    controller = YeelightMatrixController(hass, cube, layout, entry.entry_id, max_fps)
 
     # Restore the last frame so the card/layout come back after a restart (the
     # device can't report its own LED state).
     await controller.async_restore()
 
+    realtime_port = entry.data.get(CONF_REALTIME_PORT, DEFAULT_REALTIME_PORT)
+    if realtime_port:
+        try:
+            await controller.async_start_realtime(realtime_port)
+        except OSError as exc:
+            _LOGGER.error("Cannot listen for DDP frames on UDP port %s: %s", realtime_port, exc)
+
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = controller
 
+    async_register_websocket_commands(hass)
     await async_register_card(hass)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
@@ -45,6 +67,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id, None)
+        controller = hass.data[DOMAIN].pop(entry.entry_id, None)
+        if controller is not None:
+            controller.async_stop_realtime()
+            await controller.async_stop_animation()
+            await controller.cube.close()
 
     return unload_ok
@@ -14,9 +14,13 @@ from .const import (
     CONF_BASE_POSITION,
     CONF_DOT_ENTITIES,
     CONF_LAYOUT_ORIENTATION,
+    CONF_MAX_FPS,
     CONF_MODULES,
+    CONF_REALTIME_PORT,
     DEFAULT_DOT_ENTITIES,
+    DEFAULT_MAX_FPS,
     DEFAULT_PORT,
+    DEFAULT_REALTIME_PORT,
     DOMAIN,
 )
 
@@ -45,6 +49,12 @@ STEP_LAYOUT_DATA_SCHEMA = vol.Schema(
         ),
         vol.Required(CONF_MODULES): str,
         vol.Required(CONF_DOT_ENTITIES, default=DEFAULT_DOT_ENTITIES): bool,
+        vol.Required(CONF_MAX_FPS, default=DEFAULT_MAX_FPS): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=60)
+        ),
+        vol.Required(CONF_REALTIME_PORT, default=DEFAULT_REALTIME_PORT): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=65535)
+        ),
     }
 )
 
@@ -92,6 +102,8 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 self.data[CONF_BASE_POSITION] = base
                 self.data[CONF_MODULES] = modules
                 self.data[CONF_DOT_ENTITIES] = user_input[CONF_DOT_ENTITIES]
+                self.data[CONF_MAX_FPS] = user_input[CONF_MAX_FPS]
+                self.data[CONF_REALTIME_PORT] = user_input[CONF_REALTIME_PORT]
                 return self.async_create_entry(title=self.data[CONF_HOST], data=self.data)
 
         return self.async_show_form(
@@ -7,17 +7,28 @@ CONF_LAYOUT_ORIENTATION = "layout_orientation"
 CONF_BASE_POSITION = "base_position"
 CONF_MODULES = "modules"
 CONF_DOT_ENTITIES = "dot_entities"
+CONF_MAX_FPS = "max_fps"
+CONF_REALTIME_PORT = "realtime_port"
 
 # Defaults.
 DEFAULT_PORT = 55443
 DEFAULT_DOT_ENTITIES = False
+DEFAULT_MAX_FPS = 20
+DEFAULT_REALTIME_PORT = 0  # disabled; DDP senders default to 4048
 
 # Service names.
 SERVICE_SET_PIXEL = "set_pixel"
 SERVICE_SET_PIXELS = "set_pixels"
+SERVICE_SET_FRAME = "set_frame"
 SERVICE_SET_MODULE_COLOR = "set_module_color"
 SERVICE_SET_MODULE_COLORS = "set_module_colors"
 SERVICE_SET_IMAGE = "set_image"
+SERVICE_SET_ANIMATION = "set_animation"
+SERVICE_STOP_ANIMATION = "stop_animation"
 SERVICE_CLEAR = "clear"
 SERVICE_SET_FX_MODE = "set_fx_mode"
 SERVICE_SET_POWER = "set_power"
+
+# Encodings accepted by the set_frame service.
+FRAME_ENCODING_RGB = "rgb"
+FRAME_ENCODING_RLE = "rle"
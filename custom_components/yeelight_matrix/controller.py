@@ -4,6 +4,25 @@ A single :class:`YeelightMatrixController` is created per config entry and share
 by every entity and service. It serialises access to the device and turns the
 high-level "edit then draw" operations into the single ``update_leds`` frame the
 hardware expects.
+
+Draws are coalesced by a :class:`~yeelight_matrix.scheduler.FrameScheduler`:
+edits only request a frame, and one draw task at a time pushes the newest frame
+(rate limited to a maximum frame rate), so a burst of edits costs at most one
+extra frame rather than one frame per edit.
+
+Animated images play in a background task that pushes their frames through the
+same rate limit and change suppression.
+
+Realtime sources (music visualisers, screen capture) can stream raw frames over
+UDP in the DDP format (see :mod:`yeelight_matrix.ddp`). Each frame replaces the
+layout's dots and requests a draw, so the device is sent the newest frame at
+the configured rate and frames arriving in between are dropped (latest wins).
+
+Every frame sent is committed to a :class:`~yeelight_matrix.journal.FrameJournal`
+and only the dots that changed are broadcast (see :func:`frame_delta_signal`),
+for the painter card's websocket subscription. Per-dot entities register with
+:meth:`YeelightMatrixController.async_add_dot_listener` and are called only
+when their own dot changed.
 """
 
 from __future__ import annotations
@@ -11,17 +30,21 @@ from __future__ import annotations
 import asyncio
 import base64
 import logging
-import os
-import tempfile
-from typing import Iterable, Sequence, Tuple
+from typing import Callable, Iterable, Sequence, Tuple
 
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.storage import Store
-from yeelight_matrix import CubeMatrix, Layout
-from yeelight_matrix.color import ColorLike
+from yeelight_matrix import AsyncCubeMatrix, Layout, Palette
+from yeelight_matrix.animation import AnimationPlayer, PlaybackMode
+from yeelight_matrix.color import ColorLike, color_cache_info, decode_rle
+from yeelight_matrix.ddp import DdpReceiver, create_ddp_endpoint
+from yeelight_matrix.exceptions import CubeMatrixError
+from yeelight_matrix.image_utils import DEFAULT_IMAGE_CACHE, load_image_tiles
+from yeelight_matrix.journal import FrameJournal
+from yeelight_matrix.scheduler import FrameScheduler
 
-from .const import DOMAIN
+from .const import DEFAULT_MAX_FPS, DOMAIN, FRAME_ENCODING_RLE, FRAME_ENCODING_RGB
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -39,18 +62,47 @@ def updated_signal(entry_id: str) -> str:
     return f"{DOMAIN}_{entry_id}_updated"
 
 
+def frame_delta_signal(entry_id: str) -> str:
+    """Dispatcher signal fired with ``(session, sequence, changes)`` after a frame changed dots."""
+    return f"{DOMAIN}_{entry_id}_frame_delta"
+
+
 class YeelightMatrixController:
     """Owns one cube + layout and provides async, drawing-aware operations."""
 
     def __init__(
-        self, hass: HomeAssistant, cube: CubeMatrix, layout: Layout, entry_id: str
+        self,
+        hass: HomeAssistant,
+        cube: AsyncCubeMatrix,
+        layout: Layout,
+        entry_id: str,
+        max_fps: float = DEFAULT_MAX_FPS,
     ) -> None:
         self._hass = hass
         self._cube = cube
         self._layout = layout
         self._entry_id = entry_id
-        self._lock = asyncio.Lock()
         self._store: Store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+        # Coalescing, rate-limited draws that skip frames identical to the last.
+        self._scheduler = FrameScheduler(
+            cube,
+            layout.render_frame,
+            max_fps,
+            on_sent=self._frame_sent,
+            create_task=lambda coro: hass.async_create_background_task(
+                coro, f"{DOMAIN} draw {entry_id}"
+            ),
+        )
+        # Which dots changed with each frame sent, for incremental viewers.
+        self._journal = FrameJournal(layout)
+        # The animation currently playing, if any.
+        self._animation: AnimationPlayer | None = None
+        self._animation_task: asyncio.Task | None = None
+        # The UDP endpoint receiving realtime DDP frames, if enabled.
+        self._realtime: asyncio.DatagramTransport | None = None
+        self._realtime_receiver: DdpReceiver | None = None
+        # Realtime frames are held back while the device is switched off.
+        self._realtime_paused = False
 
     async def async_restore(self) -> None:
         """Reload the last saved frame into the layout (call before adding entities).
@@ -59,30 +111,87 @@ class YeelightMatrixController:
         anything to the device (the cubes keep showing their last frame on their
         own, and we don't want a restart to force them back on).
         """
-        data = await self._store.async_load()
-        grids = (data or {}).get("modules")
+        data = await self._store.async_load() or {}
+        grids = data.get("modules")
         if not grids:
             return
+        # Frames are saved as palette indices; older saves hold hex strings.
+        palette = Palette(data.get("palette", ()))
         for module, colors in zip(self._layout.modules, grids):
             if isinstance(colors, list) and len(colors) == module.led_count:
                 try:
-                    module.set_grid(colors)
+                    if "palette" in data:
+                        module.set_rgb(palette.expand(bytes(colors)))
+                    else:
+                        module.set_grid(colors)
                 except ValueError:  # pragma: no cover - layout changed
                     continue
+        # The restored frame is what viewers subscribing now should start from.
+        self._journal.commit()
         _LOGGER.debug("Restored last frame for %s", self._entry_id)
 
     @callback
     def _data_to_save(self) -> dict:
-        return {"modules": [module.colors for module in self._layout.modules]}
+        modules = self._layout.modules
+        palette = Palette()
+        try:
+            indices = [list(palette.index_rgb(module.rgb)) for module in modules]
+        except ValueError:  # more colours than a palette holds
+            return {"modules": [module.colors for module in modules]}
+        return {"palette": palette.colors, "modules": indices}
 
     @property
-    def cube(self) -> CubeMatrix:
+    def cube(self) -> AsyncCubeMatrix:
         return self._cube
 
     @property
     def layout(self) -> Layout:
         return self._layout
 
+    @property
+    def journal(self) -> FrameJournal:
+        """Sequence-numbered dot changes of the frames sent."""
+        return self._journal
+
+    @property
+    def frames_suppressed(self) -> int:
+        """Number of draws skipped because the frame matched the last one sent."""
+        return self._scheduler.frames_suppressed
+
+    @callback
+    def diagnostics(self) -> dict:
+        """Counters and state for the integration's diagnostics download."""
+        return {
+            "frames_sent": self._scheduler.frames_sent,
+            "frames_suppressed": self._scheduler.frames_suppressed,
+            "connection": {
+                "state": self._cube.state.value,
+                "latency": self._cube.latency,
+                "reconnects": self._cube.reconnects,
+                "last_error": self._cube.last_error,
+            },
+            "image_cache": DEFAULT_IMAGE_CACHE.info()._asdict(),
+            "color_cache": color_cache_info()._asdict(),
+            "realtime": None
+            if self._realtime_receiver is None
+            else {
+                "packets": self._realtime_receiver.packets,
+                "frames": self._realtime_receiver.frames,
+                "errors": self._realtime_receiver.errors,
+                "paused": self._realtime_receiver.paused,
+            },
+        }
+
+    @callback
+    def async_add_dot_listener(
+        self, module_index: int, x: int, y: int, update: Callable[[str], None]
+    ) -> Callable[[], None]:
+        """Call ``update(color)`` whenever a frame sent changes one dot.
+
+        Returns a callback that removes the listener.
+        """
+        return self._journal.add_dot_listener(module_index, x, y, update)
+
     # -- editing operations -------------------------------------------------
 
     async def async_set_pixel(
@@ -95,8 +204,25 @@ class YeelightMatrixController:
 
     async def async_set_pixels(self, edits: Iterable[PixelEdit], draw: bool = True) -> None:
         """Apply many dot edits as one batch and push a single frame."""
-        for module_index, x, y, color in edits:
-            self._layout.set_pixel(module_index, x, y, color)
+        self._layout.set_pixels(edits)
+        if draw:
+            await self.async_draw()
+
+    async def async_set_frame(
+        self,
+        data: str,
+        encoding: str = FRAME_ENCODING_RGB,
+        start_module: int = 0,
+        draw: bool = True,
+    ) -> None:
+        """Set whole modules from a base64 payload and push a single frame.
+
+        ``data`` holds packed RGB bytes (three per dot, row-major, modules in
+        logical order from ``start_module``), optionally run-length encoded as
+        ``(count, r, g, b)`` runs. It is decoded once and copied into the layout
+        module by module.
+        """
+        self._layout.set_rgb(_frame_bytes(data, encoding), start_module)
         if draw:
             await self.async_draw()
 
@@ -123,28 +249,89 @@ class YeelightMatrixController:
         image_path: str | None = None,
         image_data: str | None = None,
     ) -> None:
-        """Render a picture (from a path or base64 data) across the matrix."""
-        path, cleanup = await self._hass.async_add_executor_job(
-            _resolve_image, image_path, image_data
+        """Render a picture (from a path or base64 data) across the matrix.
+
+        Uploaded data is decoded and sliced fully in memory in the executor; the
+        tiles are then copied into the layout on the event loop, where it is
+        rendered.
+        """
+        await self.async_stop_animation()
+        source = await self._hass.async_add_executor_job(
+            _image_source, image_path, image_data
+        )
+        modules = self._layout.image_modules(start_module, max_modules)
+        tiles = await self._hass.async_add_executor_job(
+            load_image_tiles, source, len(modules), self._layout.orientation
+        )
+        self._layout.set_image_tiles(modules, tiles)
+        await self.async_draw()
+
+    async def async_set_animation(
+        self,
+        start_module: int,
+        max_modules: int,
+        image_path: str | None = None,
+        image_data: str | None = None,
+        mode: str = PlaybackMode.ONCE,
+        loops: int | None = None,
+    ) -> None:
+        """Start playing an animated image (GIF, APNG, WebP) across the matrix.
+
+        Returns once playback has started; any running animation is stopped
+        first. Frames are decoded in the executor as playback reaches them and
+        drawn onto the layout on the event loop; only looping modes keep the
+        encoded frames for replay.
+        """
+        await self.async_stop_animation()
+        mode = PlaybackMode(mode)
+        source = await self._hass.async_add_executor_job(
+            _image_source, image_path, image_data
+        )
+        animation = self._layout.load_animation(
+            source, start_module, max_modules, mode is not PlaybackMode.ONCE
+        )
+        self._animation = AnimationPlayer(_AnimationOutput(self), animation, mode, loops)
+        self._animation_task = self._hass.async_create_background_task(
+            self._async_play_animation(self._animation),
+            f"{DOMAIN} animation {self._entry_id}",
         )
+
+    async def async_stop_animation(self) -> None:
+        """Stop the running animation (if any), leaving its current frame shown."""
+        player, task = self._animation, self._animation_task
+        self._animation = self._animation_task = None
+        if player is None:
+            return
+        player.stop()
+        if task is not None:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _async_play_animation(self, player: AnimationPlayer) -> None:
         try:
-            await self._hass.async_add_executor_job(
-                self._layout.set_image, path, start_module, max_modules
-            )
-            await self.async_draw()
+            await player.async_play()
+        except CubeMatrixError as exc:
+            _LOGGER.warning("Animation on %s stopped: %s", self._entry_id, exc)
+        except Exception:  # noqa: BLE001 - must not fail whoever stops playback
+            _LOGGER.exception("Animation on %s failed", self._entry_id)
         finally:
-            if cleanup:
-                await self._hass.async_add_executor_job(_safe_unlink, path)
+            if self._animation is player:
+                self._animation = self._animation_task = None
 
     async def async_clear(self, draw: bool = True) -> None:
-        """Turn every dot off."""
+        """Turn every dot off (stopping any animation)."""
+        await self.async_stop_animation()
         self._layout.clear()
         if draw:
             await self.async_draw()
 
     async def async_set_fx_mode(self, mode: str) -> None:
         """Activate a device effect mode (use ``direct`` for per-LED control)."""
-        await self._hass.async_add_executor_job(self._cube.set_fx_mode, mode)
+        await self._cube.set_fx_mode(mode)
+        # The device no longer shows the last frame; send the next one in full.
+        self._scheduler.invalidate()
 
     async def async_set_power(self, on: bool) -> None:
         """Power the matrix on (direct mode + current frame) or off.
@@ -153,44 +340,136 @@ class YeelightMatrixController:
         is the explicit control for that (used by the card's power toggle).
         """
         if on:
-            await self._hass.async_add_executor_job(self._power_on)
-            await self.async_draw()
+            await self.async_turn_on()
+            await self._cube.set_fx_mode("direct")
+            # Switching to direct mode may blank the LEDs; always resend.
+            await self.async_draw(force=True)
         else:
-            await self._hass.async_add_executor_job(self._cube.bulb.turn_off)
+            await self.async_turn_off()
+
+    async def async_turn_on(self) -> None:
+        """Power the device on and accept realtime frames again."""
+        await self._cube.turn_on()
+        self._set_realtime_paused(False)
+        self._scheduler.invalidate()
+
+    async def async_turn_off(self) -> None:
+        """Stop the animation and realtime stream driving the frame, then power off.
+
+        Otherwise the next frame they push would mark the light on again.
+        """
+        await self.async_stop_animation()
+        self._set_realtime_paused(True)
+        await self._cube.turn_off()
+        self._scheduler.invalidate()
+
+    @callback
+    def async_invalidate_frame(self) -> None:
+        """Resend the next frame even if unchanged (the device state was changed directly)."""
+        self._scheduler.invalidate()
+
+    # -- realtime streaming -----------------------------------------------------
+
+    async def async_start_realtime(self, port: int, host: str = "0.0.0.0") -> None:
+        """Accept DDP frames for the whole stack on UDP ``host:port``.
+
+        Raises:
+            OSError: If the port cannot be bound.
+        """
+        self.async_stop_realtime()
+        self._realtime, self._realtime_receiver = await create_ddp_endpoint(
+            len(self._layout.frame), self._realtime_frame, host, port
+        )
+        self._realtime_receiver.paused = self._realtime_paused
+        _LOGGER.debug("Listening for DDP frames for %s on port %s", self._entry_id, port)
+
+    @callback
+    def async_stop_realtime(self) -> None:
+        """Close the realtime endpoint, if open."""
+        if self._realtime is not None:
+            self._realtime.close()
+        self._realtime = self._realtime_receiver = None
+
+    @callback
+    def _set_realtime_paused(self, paused: bool) -> None:
+        self._realtime_paused = paused
+        if self._realtime_receiver is not None:
+            self._realtime_receiver.paused = paused
 
-    def _power_on(self) -> None:
-        self._cube.bulb.turn_on()
-        self._cube.set_fx_mode("direct")
+    @callback
+    def _realtime_frame(self, frame: bytes) -> None:
+        if self._animation is not None:
+            # A live stream takes over from an animation.
+            self._hass.async_create_task(self.async_stop_animation())
+        self._layout.set_rgb(frame)
+        self.async_request_draw().add_done_callback(_log_stream_error)
 
     # -- rendering ----------------------------------------------------------
 
-    async def async_draw(self) -> None:
-        """Render the current layout and push it to the device (serialised)."""
-        async with self._lock:
-            await self._hass.async_add_executor_job(self._draw)
+    @callback
+    def async_request_draw(self, force: bool = False) -> asyncio.Future:
+        """Schedule a draw of the current layout without waiting for it.
+
+        Returns a future resolved once a frame containing every edit made so far
+        has been pushed (or suppressed as unchanged). Requests arriving while a
+        frame is being sent are coalesced into the next one.
+        """
+        return self._scheduler.request_draw(force)
+
+    async def async_draw(self, force: bool = False) -> None:
+        """Push the current layout and wait until it reaches the device.
+
+        If the rendered frame is identical to the last one sent the device
+        command, the update signal and the save are all skipped, unless
+        ``force`` is set.
+        """
+        await self._scheduler.draw(force)
+
+    async def _async_show_animation_frame(self, frame: str) -> None:
+        """Push an animation frame, honouring the frame-rate limit."""
+        await self._scheduler.show(frame)
+
+    @callback
+    def _frame_sent(self) -> None:
         async_dispatcher_send(self._hass, updated_signal(self._entry_id))
+        if (delta := self._journal.commit()) is not None:
+            async_dispatcher_send(
+                self._hass, frame_delta_signal(self._entry_id), self._journal.session, *delta
+            )
         # Remember the frame so it survives a restart (debounced disk write).
         self._store.async_delay_save(self._data_to_save, _SAVE_DELAY)
 
-    def _draw(self) -> None:
-        self._cube.update_leds(self._layout.render_frame())
 
+class _AnimationOutput:
+    """The "cube" an animation plays on: frames go through the controller."""
+
+    def __init__(self, controller: YeelightMatrixController) -> None:
+        self._controller = controller
+
+    async def update_leds(self, frame: str) -> None:
+        await self._controller._async_show_animation_frame(frame)
+
+
+def _log_stream_error(future: asyncio.Future) -> None:
+    """Consume the outcome of a draw nobody awaits (a streamed frame)."""
+    if not future.cancelled() and future.exception() is not None:
+        _LOGGER.debug("Streamed frame not sent: %s", future.exception())
 
-def _resolve_image(image_path: str | None, image_data: str | None) -> Tuple[str, bool]:
-    """Return ``(path, is_temporary)`` for the requested image source."""
+
+def _frame_bytes(data: str, encoding: str) -> bytes:
+    """Decode a ``set_frame`` payload into packed RGB bytes."""
+    raw = base64.b64decode(data, validate=True)
+    if encoding == FRAME_ENCODING_RLE:
+        return decode_rle(raw)
+    if encoding != FRAME_ENCODING_RGB:
+        raise ValueError(f"Unknown frame encoding: {encoding!r}")
+    return raw
+
+
+def _image_source(image_path: str | None, image_data: str | None) -> str | bytes:
+    """Return the image to load: decoded base64 data, else the path."""
     if image_data:
-        raw = base64.b64decode(image_data)
-        fd, path = tempfile.mkstemp(suffix=".png")
-        with os.fdopen(fd, "wb") as handle:
-            handle.write(raw)
-        return path, True
+        return base64.b64decode(image_data)
     if image_path:
-        return image_path, False
+        return image_path
     raise ValueError("Either image_path or image_data must be provided")
-
-
-def _safe_unlink(path: str) -> None:
-    try:
-        os.unlink(path)
-    except OSError:  # pragma: no cover - best effort cleanup
-        pass
@@ -5,8 +5,9 @@ Exposes three things:
 * a whole-device light (power / brightness / colour) backed by the bulb;
 * optional per-dot light entities, one per addressable LED, so individual dots
   can be tapped and coloured straight from the dashboard;
-* a set of services (``set_pixel``, ``set_pixels``, ``set_image`` …) for
-  scripted and custom-card control of individual dots and pixel-art images.
+* a set of services (``set_pixel``, ``set_pixels``, ``set_frame``,
+  ``set_image``, ``set_animation`` …) for scripted and custom-card control of
+  individual dots and pixel-art images.
 """
 
 from __future__ import annotations
@@ -23,17 +24,23 @@ from homeassistant.components.light import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_PORT
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import config_validation as cv, entity_platform
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from yeelight_matrix.animation import PlaybackMode
+from yeelight_matrix.color import to_rgb
 
 from .const import (
     CONF_DOT_ENTITIES,
     DEFAULT_DOT_ENTITIES,
     DOMAIN,
+    FRAME_ENCODING_RGB,
+    FRAME_ENCODING_RLE,
     SERVICE_CLEAR,
+    SERVICE_SET_ANIMATION,
+    SERVICE_SET_FRAME,
     SERVICE_SET_FX_MODE,
     SERVICE_SET_IMAGE,
     SERVICE_SET_MODULE_COLOR,
@@ -41,6 +48,7 @@ from .const import (
     SERVICE_SET_PIXEL,
     SERVICE_SET_PIXELS,
     SERVICE_SET_POWER,
+    SERVICE_STOP_ANIMATION,
 )
 from .controller import YeelightMatrixController, updated_signal
 
@@ -108,6 +116,19 @@ def _register_services() -> None:
         {vol.Required("pixels"): vol.All(cv.ensure_list, [_PIXEL_SCHEMA])},
         "async_service_set_pixels",
     )
+    platform.async_register_entity_service(
+        SERVICE_SET_FRAME,
+        {
+            vol.Required("data"): cv.string,
+            vol.Required("encoding", default=FRAME_ENCODING_RGB): vol.In(
+                [FRAME_ENCODING_RGB, FRAME_ENCODING_RLE]
+            ),
+            vol.Required("module_index", default=0): vol.All(
+                vol.Coerce(int), vol.Range(min=0)
+            ),
+        },
+        "async_service_set_frame",
+    )
     platform.async_register_entity_service(
         SERVICE_SET_MODULE_COLOR,
         {
@@ -138,6 +159,27 @@ def _register_services() -> None:
         },
         "async_service_set_image",
     )
+    platform.async_register_entity_service(
+        SERVICE_SET_ANIMATION,
+        {
+            vol.Optional("image_path"): cv.string,
+            vol.Optional("image_data"): cv.string,
+            vol.Required("start_module", default=0): vol.All(
+                vol.Coerce(int), vol.Range(min=0)
+            ),
+            vol.Required("max_modules", default=1): vol.All(
+                vol.Coerce(int), vol.Range(min=1)
+            ),
+            vol.Required("mode", default=PlaybackMode.ONCE.value): vol.In(
+                [mode.value for mode in PlaybackMode]
+            ),
+            vol.Optional("loops"): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        },
+        "async_service_set_animation",
+    )
+    platform.async_register_entity_service(
+        SERVICE_STOP_ANIMATION, {}, "async_service_stop_animation"
+    )
     platform.async_register_entity_service(
         SERVICE_CLEAR, {}, "async_service_clear"
     )
@@ -175,6 +217,11 @@ class _MatrixEntity(LightEntity):
         edits = [(p["module_index"], p["x"], p["y"], p["color"]) for p in pixels]
         await self._controller.async_set_pixels(edits)
 
+    async def async_service_set_frame(
+        self, data: str, encoding: str, module_index: int
+    ) -> None:
+        await self._controller.async_set_frame(data, encoding, module_index)
+
     async def async_service_set_module_color(self, module_index: int, color: str) -> None:
         await self._controller.async_set_module_color(module_index, color)
 
@@ -194,6 +241,22 @@ class _MatrixEntity(LightEntity):
             start_module, max_modules, image_path, image_data
         )
 
+    async def async_service_set_animation(
+        self,
+        start_module: int,
+        max_modules: int,
+        mode: str,
+        image_path: str | None = None,
+        image_data: str | None = None,
+        loops: int | None = None,
+    ) -> None:
+        await self._controller.async_set_animation(
+            start_module, max_modules, image_path, image_data, mode, loops
+        )
+
+    async def async_service_stop_animation(self) -> None:
+        await self._controller.async_stop_animation()
+
     async def async_service_clear(self) -> None:
         await self._controller.async_clear()
 
@@ -210,11 +273,10 @@ class YeelightMatrixLight(_MatrixEntity):
     _attr_name = None  # use the device name
     _attr_supported_color_modes = {ColorMode.RGB}
     _attr_color_mode = ColorMode.RGB
-    # Layout + live frame; the colours change on every draw, so keep them all
-    # out of the recorder/history to avoid database bloat.
-    _unrecorded_attributes = frozenset(
-        {"modules", "orientation", "base_position", "module_colors"}
-    )
+    # The layout never changes at runtime; keep it out of the recorder/history.
+    # The live frame is not an attribute: viewers subscribe to its changes over
+    # the ``yeelight_matrix/subscribe_frames`` websocket command.
+    _unrecorded_attributes = frozenset({"modules", "orientation", "base_position"})
 
     def __init__(
         self,
@@ -230,25 +292,25 @@ class YeelightMatrixLight(_MatrixEntity):
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
-        """Expose the layout and current pixel colours for custom cards."""
+        """Expose the layout for custom cards."""
         layout = self._controller.layout
         return {
             "orientation": layout.orientation.value,
             "base_position": layout.base.value,
             "modules": [module.type.value for module in layout.modules],
-            "module_colors": [module.colors for module in layout.modules],
         }
 
     async def async_added_to_hass(self) -> None:
-        """Republish state after each draw so cards can read the latest frame.
+        """Mark the light on after each draw (drawing implies the cubes are lit).
 
-        The card only *reads* this on load and after an upload (never on every
-        change), so this does not interfere with live editing.
+        The state only changes when the light was off, so a draw does not
+        broadcast a new state by itself.
         """
 
         def _updated() -> None:
-            self._attr_is_on = True
-            self.async_write_ha_state()
+            if not self._attr_is_on:
+                self._attr_is_on = True
+                self.async_write_ha_state()
 
         self.async_on_remove(
             async_dispatcher_connect(
@@ -258,33 +320,33 @@ class YeelightMatrixLight(_MatrixEntity):
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the light on, optionally setting brightness/colour."""
-        bulb = self._controller.cube.bulb
-        await self.hass.async_add_executor_job(bulb.turn_on)
+        cube = self._controller.cube
+        await self._controller.async_turn_on()
         self._attr_is_on = True
 
         if ATTR_BRIGHTNESS in kwargs:
             brightness = max(1, round(kwargs[ATTR_BRIGHTNESS] * 100 / 255))
-            await self.hass.async_add_executor_job(bulb.set_brightness, brightness)
+            await cube.set_brightness(brightness)
             self._attr_brightness = kwargs[ATTR_BRIGHTNESS]
 
         if ATTR_RGB_COLOR in kwargs:
             r, g, b = kwargs[ATTR_RGB_COLOR]
-            await self.hass.async_add_executor_job(bulb.set_rgb, r, g, b)
+            await cube.set_rgb(r, g, b)
             self._attr_rgb_color = kwargs[ATTR_RGB_COLOR]
 
+        # Powering on or recolouring the device replaces the frame it showed.
+        self._controller.async_invalidate_frame()
         self.async_write_ha_state()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
-        """Turn the light off."""
-        await self.hass.async_add_executor_job(self._controller.cube.bulb.turn_off)
+        """Turn the light off, stopping any animation or realtime stream first."""
+        await self._controller.async_turn_off()
         self._attr_is_on = False
         self.async_write_ha_state()
 
     async def async_update(self) -> None:
         """Poll the bulb for power/brightness/colour."""
-        properties = await self.hass.async_add_executor_job(
-            self._controller.cube.bulb.get_properties
-        )
+        properties = await self._controller.cube.get_properties()
         if not properties:
             return
         self._attr_is_on = properties.get("power") == "on"
@@ -326,26 +388,28 @@ class YeelightMatrixDot(_MatrixEntity):
         self._refresh_from_layout()
 
     def _refresh_from_layout(self) -> None:
-        from yeelight_matrix.color import to_rgb
-
         module = self._controller.layout.module_at(self._module_index)
-        rgb = to_rgb(module.get_pixel(self._x, self._y))
+        self._set_color(module.colors[self._y * module.width + self._x])
+
+    def _set_color(self, color: str) -> None:
+        rgb = to_rgb(color)
         self._attr_rgb_color = rgb
         self._attr_is_on = rgb != BLACK_RGB
 
     async def async_added_to_hass(self) -> None:
-        """Refresh when any draw happens so the dot stays in sync."""
-
-        def _updated() -> None:
-            self._refresh_from_layout()
-            self.async_write_ha_state()
-
+        """Follow this dot: the controller calls back only when a draw changes it."""
+        self._refresh_from_layout()
         self.async_on_remove(
-            async_dispatcher_connect(
-                self.hass, updated_signal(self._entry.entry_id), _updated
+            self._controller.async_add_dot_listener(
+                self._module_index, self._x, self._y, self._async_color_changed
             )
         )
 
+    @callback
+    def _async_color_changed(self, color: str) -> None:
+        self._set_color(color)
+        self.async_write_ha_state()
+
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Colour this dot (defaults to white if no colour is given)."""
         rgb = kwargs.get(ATTR_RGB_COLOR, (255, 255, 255))
@@ -0,0 +1,86 @@
+"""Websocket API streaming frame changes to the painter card.
+
+``yeelight_matrix/subscribe_frames`` subscribes to one matrix (by its light
+entity). The first event is the whole frame::
+
+    {"session": "3f0c...", "sequence": 12, "modules": [["#rrggbb", ...], ...]}
+
+and every draw after that sends only the dots that changed::
+
+    {"session": "3f0c...", "sequence": 13, "changes": [[module_index, x, y, "#rrggbb"], ...]}
+
+A client that reconnects can pass the ``session`` and last ``since`` sequence
+it applied; it is sent the changes it missed instead of the whole frame when
+the session is the controller's current one and its journal still covers them.
+Sequences restart with every controller (restart or reload), so a changes event
+from another session means the client must subscribe again for a snapshot.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv, entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import DOMAIN
+from .controller import YeelightMatrixController, frame_delta_signal
+
+WS_SUBSCRIBE_FRAMES = f"{DOMAIN}/subscribe_frames"
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the integration's websocket commands (safe to call repeatedly)."""
+    websocket_api.async_register_command(hass, ws_subscribe_frames)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_SUBSCRIBE_FRAMES,
+        vol.Required("entity_id"): cv.entity_id,
+        vol.Optional("since"): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        vol.Optional("session"): str,
+    }
+)
+@callback
+def ws_subscribe_frames(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Send the current frame, then the changed dots after every draw."""
+    entry = er.async_get(hass).async_get(msg["entity_id"])
+    controller: YeelightMatrixController | None = (
+        hass.data.get(DOMAIN, {}).get(entry.config_entry_id) if entry else None
+    )
+    if controller is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, f"{msg['entity_id']} is not a Yeelight Matrix"
+        )
+        return
+
+    @callback
+    def forward(session: str, sequence: int, changes: list) -> None:
+        connection.send_message(
+            websocket_api.event_message(
+                msg["id"], {"session": session, "sequence": sequence, "changes": changes}
+            )
+        )
+
+    connection.subscriptions[msg["id"]] = async_dispatcher_connect(
+        hass, frame_delta_signal(entry.config_entry_id), forward
+    )
+    connection.send_result(msg["id"])
+
+    journal = controller.journal
+    changes = None
+    if "since" in msg and "session" in msg:
+        changes = journal.changes_since(msg["since"], msg["session"])
+    if changes is None:
+        sequence, modules = journal.snapshot()
+        event = {"session": journal.session, "sequence": sequence, "modules": modules}
+    else:
+        event = {"session": journal.session, "sequence": journal.sequence, "changes": changes}
+    connection.send_message(websocket_api.event_message(msg["id"], event))
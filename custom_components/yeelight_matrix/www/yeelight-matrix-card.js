@@ -4,8 +4,9 @@
  * Renders the cube matrix as a grid of dots. Pick a colour (full colour picker
  * or a quick swatch), then tap/drag to paint. Edits are batched into one
  * `yeelight_matrix.set_pixels` call so the device draws a single frame. The card
- * also mirrors the real device state (published by the light entity), so Clear,
- * uploads and changes made elsewhere are reflected here.
+ * also mirrors the real device state, so Clear, uploads and changes made
+ * elsewhere are reflected here: it subscribes to `yeelight_matrix/subscribe_frames`,
+ * which sends the whole frame once and then only the dots each draw changed.
  *
  * Configuration:
  *   type: custom:yeelight-matrix-card
@@ -40,8 +41,13 @@ class YeelightMatrixCard extends HTMLElement {
     return 6;
   }
 
+  connectedCallback() {
+    if (this._built) this._subscribe();
+  }
+
   disconnectedCallback() {
     if (this._resizeObserver) this._resizeObserver.disconnect();
+    this._unsubscribe();
   }
 
   _stateObj() {
@@ -155,25 +161,59 @@ class YeelightMatrixCard extends HTMLElement {
     this._resizeObserver = new ResizeObserver(() => this._resizeCells());
     this._resizeObserver.observe(this);
     requestAnimationFrame(() => this._resizeCells());
-    this._pullState(); // restore the current device frame on (re)load
+    this._subscribe(); // the current device frame, then its changes
     this._updatePower();
   }
 
-  _pullState() {
-    if (!this._cells) return;
-    const stateObj = this._stateObj();
-    if (!stateObj) return;
-    const colors = stateObj.attributes.module_colors;
-    if (!colors) return;
-    this._modules.forEach((type, m) => {
-      const size = this._moduleSize(type);
-      const grid = colors[m] || [];
-      for (let y = 0; y < size; y++) {
-        for (let x = 0; x < size; x++) {
-          const cell = this._cells[`${m},${x},${y}`];
-          if (cell) cell.style.background = grid[y * size + x] || "#000000";
+  _subscribe() {
+    if (this._subscription || !this._hass || !this._cells) return;
+    const message = { type: "yeelight_matrix/subscribe_frames", entity_id: this._config.entity };
+    // Resume from the last frame applied, so a re-attached card only gets what it missed.
+    if (this._session !== undefined) {
+      message.session = this._session;
+      message.since = this._sequence;
+    }
+    this._subscription = this._hass.connection
+      .subscribeMessage((event) => this._applyFrame(event), message)
+      .catch((err) => {
+        console.warn("yeelight-matrix-card: frame subscription failed", err);
+        this._subscription = undefined;
+      });
+  }
+
+  _unsubscribe() {
+    if (!this._subscription) return;
+    this._subscription.then((unsub) => unsub && unsub());
+    this._subscription = undefined;
+  }
+
+  _applyFrame(event) {
+    if (!event.modules && event.session !== this._session) {
+      // Changes from another controller session (Home Assistant restarted or
+      // the entry was reloaded) don't apply to this frame: start over.
+      this._unsubscribe();
+      this._session = this._sequence = undefined;
+      this._subscribe();
+      return;
+    }
+    this._session = event.session;
+    this._sequence = event.sequence;
+    if (event.modules) {
+      this._modules.forEach((type, m) => {
+        const size = this._moduleSize(type);
+        const grid = event.modules[m] || [];
+        for (let y = 0; y < size; y++) {
+          for (let x = 0; x < size; x++) {
+            const cell = this._cells[`${m},${x},${y}`];
+            if (cell) cell.style.background = grid[y * size + x] || "#000000";
+          }
         }
-      }
+      });
+      return;
+    }
+    (event.changes || []).forEach(([m, x, y, color]) => {
+      const cell = this._cells[`${m},${x},${y}`];
+      if (cell) cell.style.background = color;
     });
   }
 
@@ -332,8 +372,7 @@ class YeelightMatrixCard extends HTMLElement {
       { image_data: base64, start_module: 0, max_modules: clearModules },
       { entity_id: this._config.entity }
     );
-    // Pull the resulting frame once it has propagated to the entity state.
-    setTimeout(() => this._pullState(), 500);
+    // The resulting frame arrives through the frame subscription.
   }
 }
 
@@ -202,7 +202,7 @@ class YeelightGUI:
 
             module = self.layout.modules[module_index]
             if module.type.startswith("5x5"):
-                initial_colors = module.colors  # Use existing module data.
+                initial_colors = list(module.colors)  # Editable copy of the module data.
                 color_picker = ColorPickerGrid(self.master, module_index, initial_colors,
                                      lambda colors: self.layout.set_module_colors(module_index, colors)) # pass callback
                 self.master.wait_window(color_picker)  # Wait for color picker to close
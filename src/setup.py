@@ -19,7 +19,7 @@ except OSError:
 
 setup(
     name="YeelightMatrix",
-    version="0.2.0",
+    version="0.3.0",
     description="Python library for controlling the Yeelight Cube Matrix (modular LED cubes).",
     long_description=long_description,
     long_description_content_type="text/markdown",
@@ -34,6 +34,7 @@ setup(
     install_requires=[
         "yeelight>=0.7.14",
         "Pillow>=11.0.0",
+        "numpy>=1.24",
     ],
     classifiers=[
         "Programming Language :: Python :: 3",
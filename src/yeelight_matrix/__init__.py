@@ -13,23 +13,41 @@ Typical usage::
     layout.set_image("art.png", start_module=0, max_modules=2)
 
     cube.update_leds(layout.render_frame())
+
+:class:`AsyncCubeMatrix` offers the same commands as coroutines over a native
+asyncio connection (``await cube.update_leds(layout.render_frame())``), and
+:class:`AnimationPlayer` plays sequences of pre-rendered frames on either.
+:class:`CubeGroup` drives several cubes as one display, and a layout's
+:class:`Palette` colours modules by index for cheap recolouring.
 """
 
 from __future__ import annotations
 
-from .color import BLACK, ColorLike, encode, encode_many, to_hex, to_rgb
+from .animation import Animation, AnimationPlayer, PlaybackMode
+from .async_cube_matrix import AsyncCubeMatrix, ConnectionState
+from .color import BLACK, ColorLike, encode, encode_many, encode_rgb, to_hex, to_rgb
 from .cube_matrix import FX_MODE_DIRECT, CubeMatrix
 from .enums import BasePosition, ModuleType, Orientation
 from .exceptions import CubeMatrixError, LayoutError, YeelightMatrixError
+from .group import CubeGroup, GroupStats
 from .layout import Layout
 from .module import Module
+from .palette import Palette
 
-__version__ = "0.2.0"
+__version__ = "0.3.0"
 
 __all__ = [
+    "Animation",
+    "AnimationPlayer",
+    "PlaybackMode",
+    "AsyncCubeMatrix",
     "CubeMatrix",
+    "CubeGroup",
+    "GroupStats",
+    "ConnectionState",
     "Layout",
     "Module",
+    "Palette",
     "ModuleType",
     "Orientation",
     "BasePosition",
@@ -38,6 +56,7 @@ __all__ = [
     "to_hex",
     "encode",
     "encode_many",
+    "encode_rgb",
     "BLACK",
     "FX_MODE_DIRECT",
     "YeelightMatrixError",
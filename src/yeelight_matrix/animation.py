@@ -0,0 +1,345 @@
+"""Frame-sequence playback for the Yeelight Cube Matrix.
+
+An :class:`Animation` is a sequence of pre-encoded frames (the base64 payloads
+returned by :meth:`Layout.render_frame`) with a duration for each, supplied as
+a list or lazily from a generator. A lazy source may instead yield raw items
+(e.g. decoded image tiles) that a ``render`` callable turns into payloads; the
+source is then advanced off the event loop while ``render`` runs on it. An
+:class:`AnimationPlayer` pushes those
+payloads to a :class:`CubeMatrix` (blocking or in a thread) or an
+:class:`AsyncCubeMatrix` (as a coroutine), so playback does no colour work at
+all.
+
+Frames are scheduled against absolute deadlines on a monotonic clock rather
+than by sleeping for each duration, so the time spent sending a frame does not
+accumulate into drift. A player that falls more than a frame behind (e.g. after
+a slow send) resynchronises instead of bursting the missed frames out::
+
+    frames = []
+    for step in range(10):
+        layout.fill((step * 25, 0, 0))
+        frames.append(layout.render_frame())
+
+    player = AnimationPlayer(cube, Animation(frames, 0.1), PlaybackMode.PING_PONG)
+    player.start()       # background thread; or player.play() to block
+    ...
+    player.pause(); player.resume(); player.stop()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+import time
+from enum import Enum
+from itertools import repeat
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple, Union
+
+#: Frame duration used when none is given (seconds).
+DEFAULT_FRAME_DURATION = 0.1
+
+#: A pre-encoded frame and how long it stays on screen (seconds).
+Frame = Tuple[str, float]
+
+# Marks the end of an animation's source.
+_END = object()
+
+
+class PlaybackMode(str, Enum):
+    """How an :class:`AnimationPlayer` walks through the frames."""
+
+    #: Play every frame once.
+    ONCE = "once"
+    #: Restart from the first frame after the last one.
+    LOOP = "loop"
+    #: Play forwards, then backwards (without repeating the end frames).
+    PING_PONG = "ping_pong"
+
+
+class Animation:
+    """A sequence of pre-encoded frames with per-frame durations.
+
+    Args:
+        frames: The base64 frame payloads, as a sequence or any iterable
+            (a generator is consumed lazily, as playback reaches it).
+        durations: One duration in seconds for every frame, or an iterable of
+            per-frame durations.
+        keep_frames: Remember frames pulled from ``frames`` so they can be
+            played again. Required for looping and ping-pong; turn it off to
+            stream a long, play-once generator without holding it in memory.
+        render: Turns each item of ``frames`` into its payload when the frame
+            is reached. Without it the items are the payloads.
+    """
+
+    def __init__(
+        self,
+        frames: Iterable[Any],
+        durations: Union[float, Iterable[float]] = DEFAULT_FRAME_DURATION,
+        keep_frames: bool = True,
+        render: Optional[Callable[[Any], str]] = None,
+    ) -> None:
+        if isinstance(durations, (int, float)):
+            durations = repeat(float(durations))
+        self._source: Iterator[Tuple[Any, float]] = zip(frames, durations)
+        self._render = render
+        self._frames: List[Frame] = []
+        self._keep = keep_frames
+        self._exhausted = False
+        self._next: Any = None
+
+    @classmethod
+    def from_frames(
+        cls,
+        frames: Iterable[Tuple[Any, float]],
+        keep_frames: bool = True,
+        render: Optional[Callable[[Any], str]] = None,
+    ) -> "Animation":
+        """Build an animation from ``(item, duration)`` pairs (e.g. a generator)."""
+        animation = cls((), keep_frames=keep_frames, render=render)
+        animation._source = iter(frames)
+        return animation
+
+    @property
+    def keep_frames(self) -> bool:
+        """True if frames are remembered for replay."""
+        return self._keep
+
+    @property
+    def frames(self) -> List[Frame]:
+        """The ``(payload, duration)`` pairs pulled from the source so far."""
+        return list(self._frames)
+
+    def render_ahead(self) -> "Animation":
+        """Pull every remaining frame from the source now (returns ``self``)."""
+        for _ in self.forward():
+            pass
+        return self
+
+    def prefetch(self) -> None:
+        """Pull the next item from the source now, without rendering it.
+
+        Safe to call from a worker thread while ``render`` state is used
+        elsewhere: only the source is advanced. :meth:`forward` renders the
+        prefetched item when it gets there.
+        """
+        if self._next is None and not self._exhausted:
+            self._next = next(self._source, _END)
+
+    def forward(self) -> Iterator[Frame]:
+        """Yield one forward pass, pulling lazily from the source as needed."""
+        yield from list(self._frames)
+        while not self._exhausted:
+            self.prefetch()
+            item, self._next = self._next, None
+            if item is _END:
+                self._exhausted = True
+                return
+            raw, duration = item
+            frame = (raw if self._render is None else self._render(raw), duration)
+            if self._keep:
+                self._frames.append(frame)
+            yield frame
+
+
+class AnimationPlayer:
+    """Plays an :class:`Animation` on a cube with drift-corrected timing.
+
+    ``cube`` is anything with an ``update_leds(payload)`` method: a
+    :class:`CubeMatrix` for :meth:`play`/:meth:`start`, or an
+    :class:`AsyncCubeMatrix` (whose ``update_leds`` is a coroutine) for
+    :meth:`async_play`. :meth:`pause`, :meth:`resume` and :meth:`stop` may be
+    called from any thread.
+
+    Args:
+        cube: The device (or anything accepting ``update_leds``).
+        animation: The frames to play.
+        mode: Once, loop or ping-pong.
+        loops: For looping modes, stop after this many passes (``None`` plays
+            until stopped).
+        clock: Monotonic clock in seconds (overridable for tests).
+    """
+
+    def __init__(
+        self,
+        cube: Any,
+        animation: Animation,
+        mode: Union[PlaybackMode, str] = PlaybackMode.ONCE,
+        loops: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.mode = PlaybackMode(mode)
+        if self.mode is not PlaybackMode.ONCE and not animation.keep_frames:
+            raise ValueError(f"{self.mode.value} playback needs an animation that keeps its frames")
+        self._cube = cube
+        self._animation = animation
+        self._loops = loops
+        self._clock = clock
+        self._due = 0.0
+        self._paused_at: Optional[float] = None
+        self._stopped = False
+        self._wake = threading.Event()
+        self._async_wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._frames_played = 0
+        self._late_frames = 0
+
+    # -- state ----------------------------------------------------------------
+
+    @property
+    def paused(self) -> bool:
+        """True while playback is paused."""
+        return self._paused_at is not None
+
+    @property
+    def stopped(self) -> bool:
+        """True once :meth:`stop` has been called."""
+        return self._stopped
+
+    @property
+    def frames_played(self) -> int:
+        """Number of frames sent so far."""
+        return self._frames_played
+
+    @property
+    def late_frames(self) -> int:
+        """Number of times playback fell a frame behind and resynchronised."""
+        return self._late_frames
+
+    def pause(self) -> None:
+        """Hold the current frame until :meth:`resume`."""
+        if self._paused_at is None:
+            self._paused_at = self._clock()
+            self._notify()
+
+    def resume(self) -> None:
+        """Continue after :meth:`pause`, keeping the remaining frame time."""
+        if self._paused_at is not None:
+            self._due += self._clock() - self._paused_at
+            self._paused_at = None
+            self._notify()
+
+    def stop(self) -> None:
+        """Stop playback; :meth:`play`/:meth:`async_play` return promptly.
+
+        This is final: called before playback starts, playback does not begin,
+        and a stopped player does not play again (create a new one).
+        """
+        self._stopped = True
+        self._notify()
+
+    # -- playback -------------------------------------------------------------
+
+    def play(self) -> None:
+        """Play on a synchronous cube, blocking until finished or stopped."""
+        self._begin()
+        for payload, duration in self._sequence():
+            while True:
+                delay = self._delay(duration)
+                if delay is None:
+                    return
+                if delay <= 0:
+                    break
+                self._wake.wait(None if math.isinf(delay) else delay)
+                self._wake.clear()
+            self._cube.update_leds(payload)
+            self._advance(duration)
+        # Let the final frame stay up for its duration.
+        while (delay := self._delay(math.inf)) is not None and delay > 0:
+            self._wake.wait(None if math.isinf(delay) else delay)
+            self._wake.clear()
+
+    def start(self) -> threading.Thread:
+        """Run :meth:`play` in a background daemon thread and return it."""
+        self._thread = threading.Thread(
+            target=self.play, name="yeelight-matrix-animation", daemon=True
+        )
+        self._thread.start()
+        return self._thread
+
+    async def async_play(self) -> None:
+        """Play on an :class:`AsyncCubeMatrix`, until finished or stopped.
+
+        The animation's source is advanced in the default executor (see
+        :meth:`Animation.prefetch`), so a lazy source that decodes as it goes
+        does not block the event loop; frames are rendered on the loop, where
+        the layout they come from is edited (see :meth:`Layout.load_animation`).
+        """
+        self._loop = loop = asyncio.get_running_loop()
+        self._async_wake = asyncio.Event()
+        self._begin()
+        sequence = self._sequence()
+        while True:
+            await loop.run_in_executor(None, self._animation.prefetch)
+            if (frame := next(sequence, None)) is None:
+                break
+            payload, duration = frame
+            while True:
+                delay = self._delay(duration)
+                if delay is None:
+                    return
+                if delay <= 0:
+                    break
+                await self._async_wait(delay)
+            await self._cube.update_leds(payload)
+            self._advance(duration)
+        while (delay := self._delay(math.inf)) is not None and delay > 0:
+            await self._async_wait(delay)
+
+    # -- scheduling -------------------------------------------------------------
+
+    def _begin(self) -> None:
+        # A stop() issued before playback starts still applies.
+        self._due = self._clock()
+
+    def _sequence(self) -> Iterator[Frame]:
+        """Yield frames in playback order for the configured mode."""
+        passes = 0
+        while True:
+            yield from self._animation.forward()
+            if self.mode is PlaybackMode.PING_PONG:
+                yield from reversed(self._animation.frames[1:-1])
+            passes += 1
+            if (
+                self.mode is PlaybackMode.ONCE
+                or not self._animation.frames
+                or (self._loops is not None and passes >= self._loops)
+            ):
+                return
+
+    def _delay(self, duration: float) -> Optional[float]:
+        """Seconds until the next frame is due; ``None`` if stopped, inf if paused.
+
+        If playback is more than ``duration`` behind schedule the timeline is
+        reset to now, so missed frames are not sent back to back.
+        """
+        if self._stopped:
+            return None
+        if self._paused_at is not None:
+            return math.inf
+        now = self._clock()
+        remaining = self._due - now
+        if remaining < -duration:
+            self._due = now
+            self._late_frames += 1
+            return 0.0
+        return remaining
+
+    def _advance(self, duration: float) -> None:
+        self._frames_played += 1
+        self._due += duration
+
+    def _notify(self) -> None:
+        self._wake.set()
+        if self._loop is not None and self._async_wake is not None:
+            self._loop.call_soon_threadsafe(self._async_wake.set)
+
+    async def _async_wait(self, delay: float) -> None:
+        try:
+            await asyncio.wait_for(
+                self._async_wake.wait(), None if math.isinf(delay) else delay
+            )
+        except asyncio.TimeoutError:
+            pass
+        self._async_wake.clear()
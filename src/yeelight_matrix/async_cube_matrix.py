@@ -0,0 +1,466 @@
+"""Native asyncio driver for a Yeelight Cube Matrix device.
+
+:class:`AsyncCubeMatrix` speaks the Yeelight JSON-over-TCP control protocol
+directly on asyncio streams instead of wrapping the blocking
+:class:`yeelight.Bulb`, so every command is a coroutine and no executor thread
+is needed. It offers the same matrix commands as
+:class:`~yeelight_matrix.cube_matrix.CubeMatrix` plus the handful of standard
+bulb controls (power, brightness, colour, properties) the integration uses.
+
+Each command is one JSON object per line (``{"id": 1, "method": ..., "params":
+[...]}``) answered by a line with the same ``id``. In music mode the device
+opens a reverse connection to us; commands sent over it are not rate limited
+and are never answered.
+
+After :meth:`AsyncCubeMatrix.connect` the connection is supervised: TCP
+keepalive and write timeouts detect dead sockets, and a dropped connection is
+re-established (music mode included) with exponential backoff, after which the
+last frame is replayed so animations carry on.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import socket
+import time
+from enum import Enum
+from typing import Any, Dict, List, Optional, Sequence
+
+from .color import ColorLike, encode_many
+from .cube_matrix import FX_MODE_DIRECT
+from .exceptions import CubeMatrixError
+
+_LOGGER = logging.getLogger(__name__)
+
+#: Properties requested by :meth:`AsyncCubeMatrix.get_properties` by default.
+DEFAULT_PROPS = ("power", "bright", "rgb", "color_mode")
+
+#: Transition used for power/brightness/colour changes (as the yeelight library).
+_EFFECT = "smooth"
+_DURATION = 300
+
+#: TCP keepalive probing (idle seconds, interval seconds, failed probes) used
+#: to notice a cube that dropped off the network without closing the socket.
+_KEEPALIVE = (10, 5, 3)
+
+
+class ConnectionState(str, Enum):
+    """Health of the connection to the device."""
+
+    DISCONNECTED = "disconnected"
+    CONNECTING = "connecting"
+    CONNECTED = "connected"
+    MUSIC = "music"
+
+
+class AsyncCubeMatrix:
+    """Asyncio client for a physical Yeelight Cube Matrix on the network.
+
+    Without :meth:`connect` the control connection is opened lazily by the
+    first command. :meth:`connect` starts a supervised session instead: if the
+    connection drops it is re-established in the background (with music mode,
+    when requested) and the last frame is replayed. Commands issued while
+    reconnecting fail fast with :class:`CubeMatrixError`.
+
+    Args:
+        ip: IP address of the device.
+        port: Control port (usually ``55443``).
+        music_mode: If ``True`` (default) :meth:`connect` also switches the
+            device to music mode, avoiding its per-command rate limiting.
+        timeout: Seconds to wait for connections, writes and command responses.
+        reconnect_delay: First delay before reconnecting; doubled after every
+            failed attempt.
+        max_reconnect_delay: Upper bound for the reconnect delay.
+    """
+
+    def __init__(
+        self,
+        ip: str,
+        port: int = 55443,
+        music_mode: bool = True,
+        timeout: float = 5.0,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 60.0,
+    ) -> None:
+        self._ip = ip
+        self._port = port
+        self._want_music = music_mode
+        self._timeout = timeout
+        self._reconnect_delay = reconnect_delay
+        self._max_reconnect_delay = max_reconnect_delay
+        self._supervised = False
+        self._session_music = False
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._last_frame: Optional[str] = None
+        self._latency: Optional[float] = None
+        self._reconnects = 0
+        self._last_error: Optional[str] = None
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._music = False
+        self._cmd_id = 0
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._properties: Dict[str, Any] = {}
+        self._write_lock = asyncio.Lock()
+        # Serialises opening the control connection, so concurrent first
+        # commands share one socket.
+        self._connect_lock = asyncio.Lock()
+
+    @property
+    def ip(self) -> str:
+        """IP address of the device."""
+        return self._ip
+
+    @property
+    def port(self) -> int:
+        """Control port of the device."""
+        return self._port
+
+    @property
+    def connected(self) -> bool:
+        """True while a control (or music) connection is open."""
+        return self._writer is not None and not self._writer.is_closing()
+
+    @property
+    def music_mode(self) -> bool:
+        """True while commands are sent over the music-mode connection."""
+        return self._music and self.connected
+
+    @property
+    def state(self) -> ConnectionState:
+        """Current health of the connection."""
+        if self.connected:
+            return ConnectionState.MUSIC if self._music else ConnectionState.CONNECTED
+        if self._reconnect_task is not None:
+            return ConnectionState.CONNECTING
+        return ConnectionState.DISCONNECTED
+
+    @property
+    def latency(self) -> Optional[float]:
+        """Round-trip time in seconds of the last answered command, if any.
+
+        Music-mode commands are never answered, so this is refreshed by the
+        control-connection handshake on every (re)connect.
+        """
+        return self._latency
+
+    @property
+    def reconnects(self) -> int:
+        """Number of times the session was re-established after a drop."""
+        return self._reconnects
+
+    @property
+    def last_error(self) -> Optional[str]:
+        """Description of the most recent connection failure, if any."""
+        return self._last_error
+
+    # -- connection management ----------------------------------------------
+
+    async def connect(self) -> None:
+        """Open the control connection and, if requested, enable music mode.
+
+        From then on the connection is supervised and re-established after
+        drops, until :meth:`close`.
+
+        Raises:
+            CubeMatrixError: If the device cannot be reached.
+        """
+        await self._ensure_connected()
+        if self._want_music:
+            await self.start_music()
+        # Only insist on music mode when reconnecting if the device accepted it.
+        self._session_music = self.music_mode
+        self._supervised = True
+
+    async def close(self) -> None:
+        """Close the connection to the device and stop reconnecting."""
+        self._supervised = False
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            try:
+                await self._reconnect_task
+            except asyncio.CancelledError:
+                pass
+            self._reconnect_task = None
+        writer, task = self._writer, self._reader_task
+        self._drop_connection(self._reader, CubeMatrixError("Connection closed"))
+        if writer is not None:
+            try:
+                await writer.wait_closed()
+            except OSError:  # pragma: no cover - already gone
+                pass
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def __aenter__(self) -> "AsyncCubeMatrix":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def _ensure_connected(self) -> None:
+        if self.connected:
+            return
+        async with self._connect_lock:
+            if self.connected:
+                return
+            try:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(self._ip, self._port), self._timeout
+                )
+            except (OSError, asyncio.TimeoutError) as exc:
+                self._last_error = f"Could not connect to {self._ip}:{self._port}: {exc!r}"
+                raise CubeMatrixError(self._last_error) from exc
+            self._use_connection(reader, writer, music=False)
+
+    def _use_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, music: bool
+    ) -> None:
+        _enable_keepalive(writer)
+        self._reader, self._writer, self._music = reader, writer, music
+        self._reader_task = asyncio.get_running_loop().create_task(self._read_loop(reader))
+
+    def _drop_connection(self, reader: Optional[asyncio.StreamReader], exc: Exception) -> None:
+        """Forget the connection read by ``reader`` (if still current) and fail waiters."""
+        if reader is None or reader is not self._reader:
+            return
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = self._reader_task = None
+        self._music = False
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(exc)
+        if self._supervised and self._reconnect_task is None:
+            self._last_error = str(exc)
+            _LOGGER.info("Lost connection to %s (%s); reconnecting", self._ip, exc)
+            self._reconnect_task = asyncio.get_running_loop().create_task(
+                self._reconnect_loop()
+            )
+
+    async def _reconnect_loop(self) -> None:
+        """Re-establish the session with exponential backoff, then replay the frame."""
+        delay = self._reconnect_delay
+        try:
+            while True:
+                await asyncio.sleep(delay)
+                try:
+                    await self._ensure_connected()
+                    if self._session_music:
+                        await self._start_music()
+                    if self._last_frame is not None:
+                        await self._send("update_leds", [self._last_frame])
+                except CubeMatrixError as exc:
+                    self._last_error = str(exc)
+                    _LOGGER.debug("Reconnect to %s failed: %s", self._ip, exc)
+                    # Start the next attempt from a clean slate.
+                    self._drop_connection(self._reader, exc)
+                    delay = min(delay * 2, self._max_reconnect_delay)
+                    continue
+                self._reconnects += 1
+                _LOGGER.info("Reconnected to %s", self._ip)
+                return
+        finally:
+            self._reconnect_task = None
+
+    async def _read_loop(self, reader: asyncio.StreamReader) -> None:
+        """Dispatch responses to waiting commands and cache property updates."""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    _LOGGER.debug("Ignoring malformed line from %s: %r", self._ip, line)
+                    continue
+                if message.get("method") == "props":
+                    self._properties.update(message.get("params") or {})
+                    continue
+                future = self._pending.pop(message.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(message)
+        except OSError as exc:
+            _LOGGER.debug("Connection to %s failed: %s", self._ip, exc)
+        finally:
+            self._drop_connection(reader, CubeMatrixError("Connection closed by the device"))
+
+    async def _write(self, method: str, payload: bytes) -> None:
+        writer, reader = self._writer, self._reader
+        if writer is None:
+            raise CubeMatrixError(f"Command {method!r} failed: not connected")
+        async with self._write_lock:
+            try:
+                writer.write(payload)
+                # A dead peer stops acknowledging data; don't wait on it forever.
+                await asyncio.wait_for(writer.drain(), self._timeout)
+            except (OSError, asyncio.TimeoutError) as exc:
+                self._drop_connection(reader, CubeMatrixError("Connection lost"))
+                raise CubeMatrixError(f"Command {method!r} failed: {exc!r}") from exc
+
+    # -- commands -----------------------------------------------------------
+
+    async def send_command(self, method: str, params: Optional[list] = None) -> Any:
+        """Send a raw command and return its ``result`` list.
+
+        In music mode the device does not answer, so ``["ok"]`` is returned
+        once the command has been written.
+
+        Raises:
+            CubeMatrixError: On connection failure, timeout or a device error,
+                or while the session is reconnecting.
+        """
+        if self._reconnect_task is not None:
+            raise CubeMatrixError(f"Command {method!r} failed: reconnecting to {self._ip}")
+        return await self._send(method, params)
+
+    async def _send(self, method: str, params: Optional[list]) -> Any:
+        await self._ensure_connected()
+        self._cmd_id += 1
+        command_id = self._cmd_id
+        command = {"id": command_id, "method": method, "params": params or []}
+        payload = (json.dumps(command, separators=(",", ":")) + "\r\n").encode("utf8")
+        _LOGGER.debug("%s > %s", self._ip, payload)
+
+        if self._music:
+            await self._write(method, payload)
+            return ["ok"]
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[command_id] = future
+        started = time.monotonic()
+        try:
+            await self._write(method, payload)
+            response = await asyncio.wait_for(future, self._timeout)
+        except asyncio.TimeoutError as exc:
+            raise CubeMatrixError(f"Command {method!r} timed out") from exc
+        finally:
+            self._pending.pop(command_id, None)
+        self._latency = time.monotonic() - started
+        if "error" in response:
+            raise CubeMatrixError(f"Command {method!r} failed: {response['error']}")
+        return response.get("result")
+
+    async def start_music(self) -> None:
+        """Enable music mode (best-effort; ignores failures, like ``CubeMatrix``)."""
+        if self.music_mode:
+            return
+        try:
+            await self._start_music()
+        except CubeMatrixError as exc:
+            _LOGGER.debug("start_music failed: %s", exc)
+
+    async def _start_music(self) -> None:
+        await self._ensure_connected()
+        loop = asyncio.get_running_loop()
+        accepted: asyncio.Future = loop.create_future()
+
+        def _on_connect(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            if accepted.done():
+                writer.close()
+            else:
+                accepted.set_result((reader, writer))
+
+        # Listen on the interface the device already reaches us through.
+        local_ip = self._writer.get_extra_info("sockname")[0]
+        try:
+            server = await asyncio.start_server(_on_connect, local_ip, 0)
+        except OSError as exc:
+            raise CubeMatrixError(f"Could not listen for music mode: {exc!r}") from exc
+        try:
+            music_port = server.sockets[0].getsockname()[1]
+            await self._send("set_music", [1, local_ip, music_port])
+            reader, writer = await asyncio.wait_for(accepted, self._timeout)
+        except asyncio.TimeoutError as exc:
+            raise CubeMatrixError("Device did not open the music connection") from exc
+        finally:
+            server.close()
+
+        control = self._writer
+        self._use_connection(reader, writer, music=True)
+        control.close()
+
+    async def set_fx_mode(self, mode: str = FX_MODE_DIRECT) -> None:
+        """Activate an effect mode. Use ``"direct"`` for per-LED control."""
+        await self.send_command("activate_fx_mode", [{"mode": mode}])
+
+    async def update_leds(self, rgb_data: str) -> None:
+        """Push a full frame of LED data (concatenated base64) to the device.
+
+        The frame is remembered and replayed after a reconnect, even if this
+        call fails because the device is currently unreachable.
+        """
+        self._last_frame = rgb_data
+        await self.send_command("update_leds", [rgb_data])
+
+    async def set_pixels(self, colors: Sequence[ColorLike]) -> None:
+        """Encode and push an ordered sequence of colours as one frame."""
+        await self.update_leds(encode_many(colors))
+
+    async def turn_on(self) -> None:
+        """Power the device on."""
+        await self.send_command("set_power", ["on", _EFFECT, _DURATION])
+        self._properties["power"] = "on"
+
+    async def turn_off(self) -> None:
+        """Power the device off."""
+        await self.send_command("set_power", ["off", _EFFECT, _DURATION])
+        self._properties["power"] = "off"
+
+    async def set_brightness(self, brightness: int) -> None:
+        """Set the brightness in percent (``1..100``)."""
+        await self.send_command("set_bright", [brightness, _EFFECT, _DURATION])
+        self._properties["bright"] = str(brightness)
+
+    async def set_rgb(self, red: int, green: int, blue: int) -> None:
+        """Set the whole-device colour."""
+        value = (red << 16) | (green << 8) | blue
+        await self.send_command("set_rgb", [value, _EFFECT, _DURATION])
+        self._properties["rgb"] = str(value)
+
+    async def get_properties(self, props: Sequence[str] = DEFAULT_PROPS) -> Dict[str, Any]:
+        """Return the device properties.
+
+        In music mode the device does not answer queries, so the values cached
+        from earlier queries, notifications and our own commands are returned.
+        """
+        if not self.music_mode:
+            result: List[Any] = await self.send_command("get_prop", list(props))
+            self._properties.update(
+                {name: value if value else None for name, value in zip(props, result)}
+            )
+        return dict(self._properties)
+
+    def __repr__(self) -> str:  # pragma: no cover - debugging aid
+        return f"AsyncCubeMatrix(ip={self._ip!r}, port={self._port!r})"
+
+
+def _enable_keepalive(writer: asyncio.StreamWriter) -> None:
+    """Turn on aggressive TCP keepalive so half-open connections get noticed."""
+    sock = writer.get_extra_info("socket")
+    if sock is None:  # pragma: no cover - non-socket transport
+        return
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        idle, interval, count = _KEEPALIVE
+        if hasattr(socket, "TCP_KEEPIDLE"):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, idle)
+        if hasattr(socket, "TCP_KEEPINTVL"):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, interval)
+        if hasattr(socket, "TCP_KEEPCNT"):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, count)
+    except OSError as exc:  # pragma: no cover - platform without these options
+        _LOGGER.debug("Could not enable TCP keepalive: %s", exc)
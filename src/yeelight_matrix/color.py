@@ -5,12 +5,17 @@ be supplied either as a hex string (``"#ff0000"`` or ``"ff0000"``) or as an
 ``(r, g, b)`` tuple of integers in the ``0..255`` range. The helpers here
 normalise those representations and produce the base64 payload expected by the
 device's ``update_leds`` command.
+
+Parsing is memoised: each distinct colour value is parsed once into its tuple,
+hex and packed-byte forms and kept in a bounded LRU cache, since pictures and
+edits tend to reuse a small palette.
 """
 
 from __future__ import annotations
 
 import base64
-from typing import Tuple, Union
+from functools import lru_cache
+from typing import NamedTuple, Tuple, Union
 
 #: A colour accepted by the public API: a hex string or an ``(r, g, b)`` tuple.
 ColorLike = Union[str, Tuple[int, int, int]]
@@ -19,49 +24,146 @@ ColorLike = Union[str, Tuple[int, int, int]]
 BLACK: str = "#000000"
 
 
+#: Maximum number of distinct colour values remembered by the parsing cache.
+COLOR_CACHE_SIZE = 4096
+
+
+class ColorCacheInfo(NamedTuple):
+    """Statistics reported by :func:`color_cache_info`."""
+
+    hits: int
+    misses: int
+    entries: int
+    max_size: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache (0 when unused)."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
 def to_rgb(color: ColorLike) -> Tuple[int, int, int]:
     """Return ``color`` as an ``(r, g, b)`` tuple of ints in ``0..255``.
 
     Accepts a hex string (with or without a leading ``#``) or an existing
-    ``(r, g, b)`` tuple/list.
+    ``(r, g, b)`` tuple/list. Parsed values are cached (see
+    :func:`color_cache_info`), so a repeated colour costs a dictionary lookup.
 
     Raises:
         ValueError: If the value cannot be interpreted as a colour.
     """
+    return _lookup(color)[0]
+
+
+def to_hex(color: ColorLike) -> str:
+    """Return ``color`` as a normalised ``"#rrggbb"`` lower-case hex string."""
+    return _lookup(color)[1]
+
+
+def to_rgb_bytes(color: ColorLike) -> bytes:
+    """Return ``color`` packed as three bytes (as stored in a frame buffer)."""
+    return _lookup(color)[2]
+
+
+def color_cache_info() -> ColorCacheInfo:
+    """Return hit/miss counts and the size of the colour parsing cache."""
+    info = _parse.cache_info()
+    return ColorCacheInfo(info.hits, info.misses, info.currsize, info.maxsize)
+
+
+def clear_color_cache() -> None:
+    """Empty the colour parsing cache and reset its statistics."""
+    _parse.cache_clear()
+
+
+def _lookup(color: ColorLike) -> Tuple[Tuple[int, int, int], str, bytes]:
+    if isinstance(color, list):
+        color = tuple(color)
+    try:
+        return _parse(color)
+    except TypeError as exc:  # unhashable
+        raise ValueError(f"Unsupported colour value: {color!r}") from exc
+
+
+@lru_cache(maxsize=COLOR_CACHE_SIZE)
+def _parse(color: ColorLike) -> Tuple[Tuple[int, int, int], str, bytes]:
+    """Parse a colour once into its ``(rgb, hex, packed bytes)`` forms."""
     if isinstance(color, str):
         value = color.lstrip("#")
         if len(value) != 6:
             raise ValueError(f"Invalid hex colour: {color!r}")
         try:
-            return (
+            rgb = (
                 int(value[0:2], 16),
                 int(value[2:4], 16),
                 int(value[4:6], 16),
             )
         except ValueError as exc:
             raise ValueError(f"Invalid hex colour: {color!r}") from exc
-
-    if isinstance(color, (tuple, list)) and len(color) == 3:
-        r, g, b = (int(channel) for channel in color)
-        for channel in (r, g, b):
+    elif isinstance(color, tuple) and len(color) == 3:
+        rgb = tuple(int(channel) for channel in color)
+        for channel in rgb:
             if not 0 <= channel <= 255:
                 raise ValueError(f"Colour channel out of range (0-255): {color!r}")
-        return (r, g, b)
+    else:
+        raise ValueError(f"Unsupported colour value: {color!r}")
+    return rgb, "#{:02x}{:02x}{:02x}".format(*rgb), bytes(rgb)
 
-    raise ValueError(f"Unsupported colour value: {color!r}")
 
+def encode(color: ColorLike) -> str:
+    """Encode a single colour as the base64 string used by ``update_leds``."""
+    return base64.b64encode(to_rgb_bytes(color)).decode("ascii")
 
-def to_hex(color: ColorLike) -> str:
-    """Return ``color`` as a normalised ``"#rrggbb"`` lower-case hex string."""
-    r, g, b = to_rgb(color)
-    return f"#{r:02x}{g:02x}{b:02x}"
 
+def encode_rgb(data: bytes) -> str:
+    """Encode packed RGB bytes (three per LED) as the ``update_leds`` payload.
 
-def encode(color: ColorLike) -> str:
-    """Encode a single colour as the base64 string used by ``update_leds``."""
-    return base64.b64encode(bytes(to_rgb(color))).decode("ascii")
+    Each LED encodes to exactly four base64 characters, so this is identical to
+    concatenating :func:`encode` for every LED.
+    """
+    return base64.b64encode(data).decode("ascii")
 
 
 def encode_many(colors) -> str:
-    """Encode an iterable of colours into a single concatenated base64 string."""
-    return "".join(encode(color) for color in colors)
+    """Encode an iterable of colours into a single concatenated base64 string.
+
+    The colours are packed into one byte buffer and encoded in a single pass;
+    the result matches concatenating :func:`encode` for every colour.
+    """
+    packed = bytearray()
+    for color in colors:
+        packed += to_rgb_bytes(color)
+    return encode_rgb(packed)
+
+
+def encode_rle(data: bytes) -> bytes:
+    """Run-length encode packed RGB bytes as ``(count, r, g, b)`` runs.
+
+    Each run is four bytes: a repeat count of 1-255 followed by one colour.
+    A picture made of a few flat areas shrinks to a handful of runs.
+    """
+    if len(data) % 3:
+        raise ValueError(f"RGB data must be a multiple of 3 bytes, got {len(data)}")
+    runs = bytearray()
+    previous, count = None, 0
+    for offset in range(0, len(data), 3):
+        rgb = data[offset : offset + 3]
+        if rgb == previous and count < 255:
+            count += 1
+            continue
+        if previous is not None:
+            runs.append(count)
+            runs += previous
+        previous, count = rgb, 1
+    if previous is not None:
+        runs.append(count)
+        runs += previous
+    return bytes(runs)
+
+
+def decode_rle(runs: bytes) -> bytes:
+    """Expand ``(count, r, g, b)`` runs (see :func:`encode_rle`) to packed RGB bytes."""
+    if len(runs) % 4:
+        raise ValueError(f"Run-length data must be a multiple of 4 bytes, got {len(runs)}")
+    return b"".join(runs[i + 1 : i + 4] * runs[i] for i in range(0, len(runs), 4))
@@ -60,7 +60,11 @@ class CubeMatrix:
         self._send("update_leds", [rgb_data])
 
     def set_pixels(self, colors: Sequence[ColorLike]) -> None:
-        """Encode and push an ordered sequence of colours as one frame."""
+        """Encode and push an ordered sequence of colours as one frame.
+
+        The colours are packed and base64-encoded in one pass (see
+        :func:`~yeelight_matrix.color.encode_many`).
+        """
         self.update_leds(encode_many(colors))
 
     @staticmethod
@@ -0,0 +1,151 @@
+"""Receive raw RGB frames over UDP in the DDP packet format.
+
+`DDP <http://www.3waylabs.com/ddp/>`_ (Distributed Display Protocol) is the
+compact realtime protocol spoken by LED tools such as WLED, LedFx, xLights and
+Hyperion. Each datagram carries a 10-byte header (14 with a timecode) and a run
+of RGB bytes written at a byte offset into the display; the packet with the
+*push* flag completes the frame::
+
+    flags  seq  type  dest  offset (u32, big-endian)  length (u16)  [timecode]  data
+
+A :class:`DdpReceiver` assembles the packets for one display into a frame buffer
+and hands every completed frame to a callback. For a layout the frame is the
+packed RGB bytes of every module in logical order, row-major per module, as
+accepted by :meth:`~yeelight_matrix.layout.Layout.set_rgb`::
+
+    transport, receiver = await create_ddp_endpoint(
+        len(layout.frame), lambda frame: layout.set_rgb(frame)
+    )
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import struct
+from typing import Callable, NamedTuple, Optional, Tuple
+
+_LOGGER = logging.getLogger(__name__)
+
+#: UDP port DDP senders use by default.
+DDP_PORT = 4048
+
+FLAG_VERSION_MASK = 0xC0
+FLAG_VERSION_1 = 0x40
+FLAG_TIMECODE = 0x10
+FLAG_STORAGE = 0x08
+FLAG_REPLY = 0x04
+FLAG_QUERY = 0x02
+FLAG_PUSH = 0x01
+
+#: Destination id of the default output device; 0 is accepted as an alias.
+DEST_DISPLAY = 1
+
+_HEADER = struct.Struct(">BBBBIH")
+_TIMECODE_SIZE = 4
+
+
+class DdpPacket(NamedTuple):
+    """One decoded DDP datagram."""
+
+    flags: int
+    sequence: int
+    data_type: int
+    destination: int
+    offset: int
+    data: bytes
+
+    @property
+    def push(self) -> bool:
+        """True if this packet completes a frame."""
+        return bool(self.flags & FLAG_PUSH)
+
+
+def parse_packet(packet: bytes) -> DdpPacket:
+    """Decode a DDP datagram.
+
+    Raises:
+        ValueError: If the packet is truncated or not DDP version 1.
+    """
+    if len(packet) < _HEADER.size:
+        raise ValueError(f"DDP packet too short ({len(packet)} bytes)")
+    flags, sequence, data_type, destination, offset, length = _HEADER.unpack_from(packet)
+    if flags & FLAG_VERSION_MASK != FLAG_VERSION_1:
+        raise ValueError(f"Unsupported DDP version in flags 0x{flags:02x}")
+    start = _HEADER.size + (_TIMECODE_SIZE if flags & FLAG_TIMECODE else 0)
+    data = packet[start : start + length]
+    if len(data) != length:
+        raise ValueError(f"DDP packet truncated: {len(data)} of {length} data bytes")
+    return DdpPacket(flags, sequence & 0x0F, data_type, destination, offset, bytes(data))
+
+
+def build_packet(
+    data: bytes, offset: int = 0, push: bool = True, sequence: int = 0
+) -> bytes:
+    """Encode one DDP data packet for the default display (for senders and tests)."""
+    flags = FLAG_VERSION_1 | (FLAG_PUSH if push else 0)
+    header = _HEADER.pack(flags, sequence & 0x0F, 0x01, DEST_DISPLAY, offset, len(data))
+    return header + bytes(data)
+
+
+class DdpReceiver(asyncio.DatagramProtocol):
+    """Assembles DDP packets into frames of ``frame_size`` RGB bytes.
+
+    Args:
+        frame_size: Bytes per frame (three per dot).
+        on_frame: Called with the frame bytes each time one completes: on a
+            packet with the push flag, or when a packet fills the frame's last
+            byte. Data beyond ``frame_size`` is ignored.
+
+    While :attr:`paused` is set, packets are still assembled but completed
+    frames are not delivered (nor counted).
+    """
+
+    def __init__(self, frame_size: int, on_frame: Callable[[bytes], None]) -> None:
+        self._frame = bytearray(frame_size)
+        self._on_frame = on_frame
+        self.transport: Optional[asyncio.DatagramTransport] = None
+        #: Datagrams accepted, frames delivered, and datagrams rejected.
+        self.packets = 0
+        self.frames = 0
+        self.errors = 0
+        #: Hold back completed frames (e.g. while the display is off).
+        self.paused = False
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport  # type: ignore[assignment]
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        try:
+            packet = parse_packet(data)
+        except ValueError as exc:
+            self.errors += 1
+            _LOGGER.debug("Ignoring datagram from %s: %s", addr, exc)
+            return
+        if packet.flags & (FLAG_QUERY | FLAG_REPLY) or packet.destination not in (
+            0,
+            DEST_DISPLAY,
+        ):
+            # Status/config queries and other outputs are not served.
+            return
+        self.packets += 1
+        frame = self._frame
+        end = min(packet.offset + len(packet.data), len(frame))
+        if packet.offset < end:
+            frame[packet.offset : end] = packet.data[: end - packet.offset]
+        if (packet.push or end == len(frame)) and not self.paused:
+            self.frames += 1
+            self._on_frame(bytes(frame))
+
+
+async def create_ddp_endpoint(
+    frame_size: int,
+    on_frame: Callable[[bytes], None],
+    host: str = "0.0.0.0",
+    port: int = DDP_PORT,
+) -> Tuple[asyncio.DatagramTransport, DdpReceiver]:
+    """Listen for DDP datagrams on ``host:port``; see :class:`DdpReceiver`."""
+    loop = asyncio.get_running_loop()
+    return await loop.create_datagram_endpoint(
+        lambda: DdpReceiver(frame_size, on_frame), local_addr=(host, port)
+    )
@@ -0,0 +1,326 @@
+"""Procedural effects rendered over the whole stack with NumPy.
+
+Each effect computes complete canvas frames — ``(height, width, 3)`` ``uint8``
+arrays covering :attr:`Layout.canvas_size` — from vectorised maths over the
+canvas coordinates, so an effect flows across module boundaries as one picture.
+:func:`effect_animation` turns an effect into a lazily rendered
+:class:`~yeelight_matrix.animation.Animation` streamed at a target frame rate::
+
+    layout = Layout("vertical", "bottom", ["5x5_clear"] * 4)
+    effect = Plasma(layout.canvas_size)
+    AnimationPlayer(cube, effect_animation(layout, effect, fps=30)).play()
+
+Effects are rendered for a time ``t`` in seconds. The stateful ones (fire,
+matrix rain, sparkle) advance by the time elapsed since the previous frame and
+take a ``seed`` so their output is reproducible.
+"""
+
+from __future__ import annotations
+
+from itertools import count
+from typing import TYPE_CHECKING, Dict, Optional, Tuple, Type
+
+import numpy as np
+
+from .animation import Animation
+from .color import ColorLike, to_rgb
+
+if TYPE_CHECKING:  # pragma: no cover - imported for annotations only
+    from .layout import Layout
+
+#: Frame rate used by :func:`effect_animation` when none is given.
+DEFAULT_FPS = 30.0
+
+_TAU = 2 * np.pi
+
+
+class Effect:
+    """Base class for procedural effects on a ``width`` x ``height`` canvas.
+
+    Subclasses implement :meth:`render`. ``self.x`` and ``self.y`` hold the
+    column and row of every dot as ``float32`` arrays of the canvas shape.
+
+    Args:
+        size: ``(width, height)`` of the canvas, e.g. ``layout.canvas_size``.
+    """
+
+    def __init__(self, size: Tuple[int, int]) -> None:
+        self.width, self.height = size
+        self.y, self.x = np.mgrid[0 : self.height, 0 : self.width].astype(np.float32)
+
+    def render(self, t: float) -> np.ndarray:
+        """Return the frame at time ``t`` (seconds) as a ``(height, width, 3)`` uint8 array."""
+        raise NotImplementedError
+
+    @property
+    def along(self) -> np.ndarray:
+        """Position of every dot along the stack (the canvas's longer axis)."""
+        return self.y if self.height >= self.width else self.x
+
+
+class _StepEffect(Effect):
+    """An effect with state that advances by the time between frames."""
+
+    def __init__(self, size: Tuple[int, int], seed: Optional[int] = None) -> None:
+        super().__init__(size)
+        self._rng = np.random.default_rng(seed)
+        self._last_t: Optional[float] = None
+
+    def render(self, t: float) -> np.ndarray:
+        dt = 0.0 if self._last_t is None else max(0.0, t - self._last_t)
+        self._last_t = t
+        return self._step(dt)
+
+    def _step(self, dt: float) -> np.ndarray:
+        raise NotImplementedError
+
+
+class Plasma(Effect):
+    """Classic demo-scene plasma: overlapping sine waves mapped to a rainbow.
+
+    Args:
+        size: Canvas ``(width, height)``.
+        speed: How fast the pattern moves.
+        scale: Spatial frequency of the waves (higher is busier).
+    """
+
+    def __init__(self, size: Tuple[int, int], speed: float = 1.0, scale: float = 0.35) -> None:
+        super().__init__(size)
+        self.speed = speed
+        x, y = self.x * scale, self.y * scale
+        self._sx = x
+        self._sy = y
+        self._sxy = (x + y) * 0.5
+        self._radius = np.hypot(x - x.mean(), y - y.mean())
+
+    def render(self, t: float) -> np.ndarray:
+        t *= self.speed
+        value = (
+            np.sin(self._sx + t)
+            + np.sin(self._sy * 1.3 - t * 1.1)
+            + np.sin(self._sxy + t * 0.7)
+            + np.sin(self._radius * 1.5 - t * 1.7)
+        )
+        return _rainbow(value * 0.125 + t * 0.05)
+
+
+class RainbowScroll(Effect):
+    """A rainbow running along the stack.
+
+    Args:
+        size: Canvas ``(width, height)``.
+        speed: Colour cycles per second.
+        spread: How many full rainbows fit along the stack.
+    """
+
+    def __init__(self, size: Tuple[int, int], speed: float = 0.25, spread: float = 1.0) -> None:
+        super().__init__(size)
+        self.speed = speed
+        self._phase = self.along * (spread / max(self.along.max() + 1, 1))
+
+    def render(self, t: float) -> np.ndarray:
+        return _rainbow(self._phase - t * self.speed)
+
+
+class Breathing(Effect):
+    """The whole stack fading smoothly in and out in one colour.
+
+    Args:
+        size: Canvas ``(width, height)``.
+        color: Colour at full brightness.
+        period: Seconds per breath.
+    """
+
+    def __init__(
+        self, size: Tuple[int, int], color: ColorLike = (255, 255, 255), period: float = 4.0
+    ) -> None:
+        super().__init__(size)
+        self.color = np.array(to_rgb(color), dtype=np.float32)
+        self.period = period
+
+    def render(self, t: float) -> np.ndarray:
+        level = 0.5 - 0.5 * np.cos(_TAU * t / self.period)
+        pixel = (self.color * level).astype(np.uint8)
+        return np.broadcast_to(pixel, (self.height, self.width, 3))
+
+
+class Fire(_StepEffect):
+    """Flames rising from the bottom of the canvas.
+
+    Args:
+        size: Canvas ``(width, height)``.
+        cooling: How quickly heat fades as it rises (per second).
+        sparking: Chance per second and column of a new burst at the base.
+        seed: Random seed, for reproducible flames.
+    """
+
+    #: Heat propagation steps per second.
+    RATE = 30.0
+
+    def __init__(
+        self,
+        size: Tuple[int, int],
+        cooling: float = 1.6,
+        sparking: float = 6.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        super().__init__(size, seed)
+        self.cooling = cooling
+        self.sparking = sparking
+        self._heat = np.zeros((self.height, self.width), dtype=np.float32)
+        self._pending = 0.0
+
+    def _step(self, dt: float) -> np.ndarray:
+        self._pending += dt * self.RATE
+        steps, self._pending = int(self._pending), self._pending % 1
+        heat = self._heat
+        for _ in range(steps):
+            heat -= self._rng.random(heat.shape, dtype=np.float32) * (self.cooling / self.RATE)
+            np.clip(heat, 0.0, 1.0, out=heat)
+            # Each row takes the blurred heat of the rows below it.
+            below = np.vstack((heat[1:], heat[-1:]))
+            further = np.vstack((heat[2:], heat[-1:], heat[-1:]))
+            sides = np.roll(below, 1, axis=1) + np.roll(below, -1, axis=1)
+            heat[:] = (below * 2 + further + sides) / 5
+            sparks = self._rng.random(self.width) < self.sparking / self.RATE
+            heat[-1, sparks] = np.minimum(
+                1.0, heat[-1, sparks] + 0.6 + 0.4 * self._rng.random(int(sparks.sum()))
+            )
+        # Black -> red -> yellow -> white as the heat rises.
+        frame = np.clip(heat[..., None] * 3 - np.array([0, 1, 2], dtype=np.float32), 0, 1)
+        return _to_uint8(frame * 255)
+
+
+class MatrixRain(_StepEffect):
+    """Falling green streaks with fading trails, in the style of *The Matrix*.
+
+    Args:
+        size: Canvas ``(width, height)``.
+        color: Colour of the streaks.
+        speed: Fall speed in dots per second.
+        density: Chance per second and column of a new streak.
+        trail: Seconds a trail takes to fade out.
+        seed: Random seed.
+    """
+
+    def __init__(
+        self,
+        size: Tuple[int, int],
+        color: ColorLike = (0, 255, 70),
+        speed: float = 8.0,
+        density: float = 0.6,
+        trail: float = 0.6,
+        seed: Optional[int] = None,
+    ) -> None:
+        super().__init__(size, seed)
+        self.color = np.array(to_rgb(color), dtype=np.float32)
+        self.speed = speed
+        self.density = density
+        self.trail = trail
+        self._field = np.zeros((self.height, self.width), dtype=np.float32)
+        # Head row of the streak in each column (NaN: no streak).
+        self._heads = np.full(self.width, np.nan, dtype=np.float32)
+
+    def _step(self, dt: float) -> np.ndarray:
+        field = self._field
+        if dt:
+            field *= np.float32(np.exp(-dt * 3 / self.trail))
+            idle = np.isnan(self._heads)
+            spawn = idle & (self._rng.random(self.width) < self.density * dt)
+            self._heads[spawn] = 0.0
+            previous = self._heads.copy()
+            self._heads += self.speed * dt
+            columns = np.flatnonzero(~np.isnan(self._heads))
+            for column in columns:
+                start = 0 if np.isnan(previous[column]) else int(previous[column])
+                stop = min(int(self._heads[column]) + 1, self.height)
+                field[start:stop, column] = 1.0
+            self._heads[self._heads >= self.height] = np.nan
+        return _to_uint8(field[..., None] * self.color)
+
+
+class Sparkle(_StepEffect):
+    """Random dots flashing and fading out.
+
+    Args:
+        size: Canvas ``(width, height)``.
+        color: Colour of the sparkles (``None`` for random hues).
+        density: New sparkles per second, as a fraction of all dots.
+        decay: Seconds a sparkle takes to fade out.
+        seed: Random seed.
+    """
+
+    def __init__(
+        self,
+        size: Tuple[int, int],
+        color: Optional[ColorLike] = (255, 255, 255),
+        density: float = 0.5,
+        decay: float = 0.4,
+        seed: Optional[int] = None,
+    ) -> None:
+        super().__init__(size, seed)
+        self.color = None if color is None else np.array(to_rgb(color), dtype=np.float32)
+        self.density = density
+        self.decay = decay
+        self._frame = np.zeros((self.height, self.width, 3), dtype=np.float32)
+
+    def _step(self, dt: float) -> np.ndarray:
+        frame = self._frame
+        if dt:
+            frame *= np.float32(np.exp(-dt * 3 / self.decay))
+            new = self._rng.random((self.height, self.width)) < self.density * dt
+            if self.color is None:
+                frame[new] = _rainbow(self._rng.random(int(new.sum()))).astype(np.float32)
+            else:
+                frame[new] = self.color
+        return _to_uint8(frame)
+
+
+#: Built-in effects by name.
+EFFECTS: Dict[str, Type[Effect]] = {
+    "plasma": Plasma,
+    "fire": Fire,
+    "rainbow": RainbowScroll,
+    "matrix_rain": MatrixRain,
+    "breathing": Breathing,
+    "sparkle": Sparkle,
+}
+
+
+def effect_animation(
+    layout: "Layout",
+    effect: Effect,
+    fps: float = DEFAULT_FPS,
+    duration: Optional[float] = None,
+) -> Animation:
+    """Return an :class:`Animation` streaming ``effect`` on ``layout`` at ``fps``.
+
+    Frame ``n`` is the effect at ``t = n / fps``, drawn onto the layout with
+    :meth:`Layout.set_canvas` and rendered when playback reaches it; nothing
+    is kept, so the animation plays once (``duration`` seconds, or until the
+    player is stopped when ``None``). ``layout`` may also be a
+    :class:`~yeelight_matrix.group.CubeGroup`.
+    """
+    if fps <= 0:
+        raise ValueError("fps must be positive")
+    interval = 1.0 / fps
+    frames = count() if duration is None else range(round(duration * fps))
+
+    def payloads():
+        for n in frames:
+            layout.set_canvas(effect.render(n * interval))
+            yield layout.render_frame()
+
+    return Animation(payloads(), interval, keep_frames=False)
+
+
+def _rainbow(hue: np.ndarray) -> np.ndarray:
+    """Map hues (cycles, any range) to fully saturated uint8 RGB."""
+    hue = np.asarray(hue, dtype=np.float32)[..., None]
+    rgb = 0.5 + 0.5 * np.cos(_TAU * (hue - np.array([0.0, 1 / 3, 2 / 3], dtype=np.float32)))
+    return _to_uint8(rgb * 255)
+
+
+def _to_uint8(values: np.ndarray) -> np.ndarray:
+    """Clip to 0..255 and convert to ``uint8``."""
+    return np.clip(values, 0, 255).astype(np.uint8)
@@ -0,0 +1,168 @@
+"""Several cube matrices driven as one display.
+
+A :class:`CubeGroup` joins the canvases of several ``(cube, layout)`` members
+side by side (or one above the other) into one virtual canvas. A frame drawn on
+that canvas is split back into one payload per device, and
+:meth:`CubeGroup.update_leds` pushes them concurrently with
+:func:`asyncio.gather`, so every device receives its part within the same few
+milliseconds. The spread between the first and the last device finishing (the
+*skew*) is measured for every frame::
+
+    group = CubeGroup([(cube_a, layout_a), (cube_b, layout_b)], "horizontal")
+    await group.connect()
+    group.set_canvas(pixels)                  # (height, width, 3) array
+    await group.update_leds(group.render_frame())
+    print(group.stats().max_skew)
+
+The group offers ``canvas_size``, ``set_canvas``, ``render_frame`` and
+``update_leds`` like a single layout and cube, so effects and animations can
+be played on it directly::
+
+    AnimationPlayer(group, effect_animation(group, Plasma(group.canvas_size))).async_play()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from .async_cube_matrix import AsyncCubeMatrix
+from .cube_matrix import FX_MODE_DIRECT
+from .enums import Orientation
+from .layout import Layout
+
+
+class GroupStats(NamedTuple):
+    """Timing of the frames pushed by a :class:`CubeGroup` (seconds)."""
+
+    #: Frames pushed to every member.
+    frames: int
+    #: Skew of the most recent frame.
+    last_skew: float
+    #: Largest skew seen.
+    max_skew: float
+    #: Mean skew over all frames.
+    mean_skew: float
+
+
+class CubeGroup:
+    """Drives several ``(AsyncCubeMatrix, Layout)`` pairs as one canvas.
+
+    Args:
+        members: The devices and their layouts, in canvas order (left to right,
+            or top to bottom).
+        arrangement: ``"horizontal"`` to place the members' canvases side by
+            side, ``"vertical"`` to stack them. Members shorter (or narrower)
+            than the others use the top (or left) part of the group canvas.
+    """
+
+    def __init__(
+        self,
+        members: Sequence[Tuple[AsyncCubeMatrix, Layout]],
+        arrangement: Orientation | str = Orientation.HORIZONTAL,
+    ) -> None:
+        if not members:
+            raise ValueError("A group needs at least one member")
+        self.arrangement = Orientation(arrangement)
+        self._members: List[Tuple[AsyncCubeMatrix, Layout]] = list(members)
+        self._frames = 0
+        self._last_skew = self._max_skew = self._total_skew = 0.0
+
+    @property
+    def members(self) -> List[Tuple[AsyncCubeMatrix, Layout]]:
+        """The ``(cube, layout)`` pairs, in canvas order."""
+        return list(self._members)
+
+    @property
+    def canvas_size(self) -> Tuple[int, int]:
+        """``(width, height)`` of the combined canvas."""
+        sizes = [layout.canvas_size for _, layout in self._members]
+        if self.arrangement is Orientation.HORIZONTAL:
+            return sum(w for w, _ in sizes), max(h for _, h in sizes)
+        return max(w for w, _ in sizes), sum(h for _, h in sizes)
+
+    def set_canvas(self, pixels: np.ndarray) -> None:
+        """Split a ``(height, width, 3)`` array across the members' layouts."""
+        pixels = np.asarray(pixels, dtype=np.uint8)
+        width, height = self.canvas_size
+        if pixels.shape != (height, width, 3):
+            raise ValueError(
+                f"Expected a canvas of shape {(height, width, 3)}, got {pixels.shape}"
+            )
+        offset = 0
+        for _, layout in self._members:
+            w, h = layout.canvas_size
+            if self.arrangement is Orientation.HORIZONTAL:
+                layout.set_canvas(pixels[:h, offset : offset + w])
+                offset += w
+            else:
+                layout.set_canvas(pixels[offset : offset + h, :w])
+                offset += h
+
+    def render_frame(self) -> List[str]:
+        """Render every member's layout; one payload per device, in order."""
+        return [layout.render_frame() for _, layout in self._members]
+
+    async def update_leds(self, frames: Sequence[str]) -> float:
+        """Push one payload to each device concurrently and return the skew.
+
+        The skew is the time between the first and the last device's send
+        completing, in seconds; it is also folded into :meth:`stats`.
+        """
+        if len(frames) != len(self._members):
+            raise ValueError(f"Expected {len(self._members)} frames, got {len(frames)}")
+
+        async def push(cube: AsyncCubeMatrix, frame: str) -> float:
+            await cube.update_leds(frame)
+            return time.perf_counter()
+
+        finished = await asyncio.gather(
+            *(push(cube, frame) for (cube, _), frame in zip(self._members, frames))
+        )
+        skew = max(finished) - min(finished)
+        self._frames += 1
+        self._last_skew = skew
+        self._max_skew = max(self._max_skew, skew)
+        self._total_skew += skew
+        return skew
+
+    async def draw(self) -> float:
+        """Render and push every member's current layout (see :meth:`update_leds`)."""
+        return await self.update_leds(self.render_frame())
+
+    def stats(self) -> GroupStats:
+        """Frame count and skew statistics since creation."""
+        mean = self._total_skew / self._frames if self._frames else 0.0
+        return GroupStats(self._frames, self._last_skew, self._max_skew, mean)
+
+    # -- whole-group commands ---------------------------------------------------
+
+    async def connect(self) -> None:
+        """Connect every member concurrently."""
+        await asyncio.gather(*(cube.connect() for cube, _ in self._members))
+
+    async def close(self) -> None:
+        """Close every member's connection."""
+        await asyncio.gather(*(cube.close() for cube, _ in self._members))
+
+    async def set_fx_mode(self, mode: str = FX_MODE_DIRECT) -> None:
+        """Activate an FX mode on every member."""
+        await asyncio.gather(*(cube.set_fx_mode(mode) for cube, _ in self._members))
+
+    async def turn_on(self) -> None:
+        """Power every member on."""
+        await asyncio.gather(*(cube.turn_on() for cube, _ in self._members))
+
+    async def turn_off(self) -> None:
+        """Power every member off."""
+        await asyncio.gather(*(cube.turn_off() for cube, _ in self._members))
+
+    async def __aenter__(self) -> "CubeGroup":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
@@ -1,27 +1,130 @@
 """Image helpers for mapping pictures onto the cube matrix.
 
 These functions deal purely in *logical* (un-rotated) colour grids stored in
-row-major order. Orientation is applied later by the layout via
-:func:`rotate_grid`, so an image is split the same way regardless of how the
-physical stack is mounted.
+row-major order. The layout applies orientation only when it renders a frame,
+through a per-module permutation built from :func:`rotation_table`, so an
+image is split the same way regardless of how the physical stack is mounted.
+:func:`rotate_grid` applies the same rotation to a list of colours.
+
+Images are handled as NumPy ``uint8`` arrays: the resized picture is converted
+once and cut into module tiles with reshapes, so no per-pixel Python work (or
+hex strings) is involved. Sliced tiles are kept in a bounded LRU
+:class:`ImageCache` keyed by the image's content digest and the target
+geometry, so re-showing a recent picture skips decoding and resizing.
+Animated images (GIF, APNG, WebP) are sliced one frame at a time by
+:func:`iter_image_frames`.
 """
 
 from __future__ import annotations
 
-from typing import List, Sequence
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import BinaryIO, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
 
-from PIL import Image
+import numpy as np
+from PIL import Image, ImageSequence
 
-from .color import to_hex
+from .animation import DEFAULT_FRAME_DURATION
 from .enums import Orientation
 
 #: Width/height in LEDs of a single 5x5 module.
 MODULE_SIZE = 5
 
+#: A picture accepted by the image helpers: a file path, the encoded file
+#: contents (bytes or a binary file-like object), or an already-open PIL image.
+ImageSource = Union[str, "os.PathLike[str]", bytes, bytearray, memoryview, BinaryIO, Image.Image]
+
+
+class ImageCacheInfo(NamedTuple):
+    """Statistics reported by :meth:`ImageCache.info`."""
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size: int
+    max_size: int
+
+
+class ImageCache:
+    """Bounded LRU cache of sliced module tiles.
+
+    Entries are keyed by ``(content digest, module_count, orientation)`` and
+    the cache holds at most ``max_size`` bytes of tile data, evicting the least
+    recently used entries first. It is safe to use from several threads.
+
+    Args:
+        max_size: Memory budget in bytes (tile data only).
+    """
+
+    def __init__(self, max_size: int = 1 << 20) -> None:
+        self._max_size = max_size
+        self._entries: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._size = 0
+        self._hits = self._misses = self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[np.ndarray]:
+        """Return the tiles cached under ``key`` (marking them recently used)."""
+        with self._lock:
+            tiles = self._entries.get(key)
+            if tiles is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return tiles
+
+    def put(self, key: tuple, tiles: np.ndarray) -> None:
+        """Cache ``tiles`` under ``key``; they must not be modified afterwards."""
+        if tiles.nbytes > self._max_size:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous.nbytes
+            self._entries[key] = tiles
+            self._size += tiles.nbytes
+            while self._size > self._max_size:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.nbytes
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry (statistics are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def info(self) -> ImageCacheInfo:
+        """Return hit/miss/eviction counts and the current memory use."""
+        with self._lock:
+            return ImageCacheInfo(
+                self._hits,
+                self._misses,
+                self._evictions,
+                len(self._entries),
+                self._size,
+                self._max_size,
+            )
+
+
+#: Cache used by :func:`load_image_tiles` (and so :meth:`Layout.set_image`).
+DEFAULT_IMAGE_CACHE = ImageCache()
+
+
+# image_to_hex and hex_to_image are public since 0.2.0; the library no longer
+# needs them, but they remain the supported bridge between PIL images and
+# colour grids (e.g. Module.colors / Module.set_grid).
+
 
 def image_to_hex(img: Image.Image) -> List[str]:
     """Flatten a PIL image into a row-major list of ``"#rrggbb"`` colours."""
-    return ["#{:02x}{:02x}{:02x}".format(*pixel[:3]) for pixel in img.convert("RGB").getdata()]
+    return _rgb_to_hex(img.convert("RGB").tobytes())
 
 
 def hex_to_image(colors: Sequence[str], width: int, height: int) -> Image.Image:
@@ -31,6 +134,34 @@ def hex_to_image(colors: Sequence[str], width: int, height: int) -> Image.Image:
     return img
 
 
+@lru_cache(maxsize=None)
+def rotation_table(degrees: int, size: int = MODULE_SIZE) -> Tuple[int, ...]:
+    """Return the source index of every dot of a square grid rotated by ``degrees``.
+
+    Entry ``i`` of the result is the row-major index in the un-rotated grid
+    whose colour ends up at index ``i`` after an anticlockwise rotation (the
+    same convention as :meth:`PIL.Image.Image.rotate`). Tables are computed
+    once per ``(degrees, size)`` and cached.
+    """
+    if degrees % 90:
+        raise ValueError(f"Rotation must be a multiple of 90 degrees, got {degrees}")
+    last = size - 1
+    turns = (degrees // 90) % 4
+    table = []
+    for y in range(size):
+        for x in range(size):
+            if turns == 0:
+                src_x, src_y = x, y
+            elif turns == 1:
+                src_x, src_y = last - y, x
+            elif turns == 2:
+                src_x, src_y = last - x, last - y
+            else:
+                src_x, src_y = y, last - x
+            table.append(src_y * size + src_x)
+    return tuple(table)
+
+
 def rotate_grid(colors: Sequence[str], degrees: int, size: int = MODULE_SIZE) -> List[str]:
     """Rotate a square colour grid by ``degrees`` (0/90/180/270, anticlockwise).
 
@@ -39,43 +170,133 @@ def rotate_grid(colors: Sequence[str], degrees: int, size: int = MODULE_SIZE) ->
     """
     if degrees % 360 == 0 or size == 1:
         return list(colors)
-    img = hex_to_image(colors, size, size).rotate(degrees)
-    return image_to_hex(img)
+    return [colors[src] for src in rotation_table(degrees, size)]
 
 
-def load_image_grids(
-    image_path: str,
+def load_image_tiles(
+    image: ImageSource,
     module_count: int,
     orientation: Orientation,
-) -> List[List[str]]:
-    """Load an image and slice it into ``module_count`` logical 5x5 grids.
+    cache: Optional[ImageCache] = DEFAULT_IMAGE_CACHE,
+) -> np.ndarray:
+    """Load an image and slice it into ``module_count`` logical 5x5 RGB tiles.
 
-    The image is resized to span ``module_count`` modules along the stacking
-    axis (height for a vertical layout, width for a horizontal one) and then cut
-    into consecutive 5x5 tiles.
+    ``image`` may be a path, the encoded image bytes, a binary file-like object
+    or a PIL image; everything is decoded in memory. The image is resized to
+    span ``module_count`` modules along the stacking axis (height for a
+    vertical layout, width for a horizontal one) and then cut into consecutive
+    5x5 tiles. Results are looked up in and stored to
+    ``cache`` (pass ``None`` to bypass caching).
 
     Returns:
-        A list of ``module_count`` grids, each a row-major list of 25 colours.
+        A read-only ``uint8`` array of shape ``(module_count, 5, 5, 3)``;
+        ``tiles[i]`` is module ``i``'s grid (``tiles[i].tobytes()`` is its
+        packed RGB data).
+    """
+    if module_count < 1:
+        raise ValueError("module_count must be at least 1")
+
+    if isinstance(image, Image.Image):
+        digest = hashlib.blake2b(
+            f"{image.mode}:{image.size}".encode() + image.tobytes(), digest_size=16
+        ).digest()
+    else:
+        data = _read_image_data(image)
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+    key = (digest, module_count, orientation)
+    if cache is not None:
+        tiles = cache.get(key)
+        if tiles is not None:
+            return tiles
+
+    if not isinstance(image, Image.Image):
+        image = Image.open(io.BytesIO(data))
+    tiles = _slice_image(image, module_count, orientation)
+    tiles.setflags(write=False)
+    if cache is not None:
+        cache.put(key, tiles)
+    return tiles
+
+
+def iter_image_frames(
+    image: ImageSource,
+    module_count: int,
+    orientation: Orientation,
+) -> Iterator[Tuple[np.ndarray, float]]:
+    """Yield ``(tiles, duration)`` for every frame of a possibly animated image.
+
+    Frames are decoded and sliced one at a time (as for
+    :func:`load_image_tiles`, without caching), so a long animation is never
+    held fully decoded in memory. ``duration`` is the frame's delay in seconds
+    as stored in the file, or :data:`DEFAULT_FRAME_DURATION` if it has none.
+    A still image yields a single frame.
     """
     if module_count < 1:
         raise ValueError("module_count must be at least 1")
+    if isinstance(image, Image.Image):
+        yield from _iter_frames(image, module_count, orientation)
+        return
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        image = io.BytesIO(bytes(image))
+    with Image.open(image) as opened:
+        yield from _iter_frames(opened, module_count, orientation)
+
+
+def _iter_frames(
+    image: Image.Image, module_count: int, orientation: Orientation
+) -> Iterator[Tuple[np.ndarray, float]]:
+    for frame in ImageSequence.Iterator(image):
+        duration = frame.info.get("duration") or 0
+        tiles = _slice_image(frame, module_count, orientation)
+        tiles.setflags(write=False)
+        yield tiles, duration / 1000 if duration > 0 else DEFAULT_FRAME_DURATION
 
+
+def _slice_image(image: Image.Image, module_count: int, orientation: Orientation) -> np.ndarray:
+    """Resize ``image`` to span ``module_count`` modules and cut it into tiles."""
     span = MODULE_SIZE * module_count
     if orientation is Orientation.VERTICAL:
         width, height = MODULE_SIZE, span
     else:
         width, height = span, MODULE_SIZE
 
-    img = Image.open(image_path).convert("RGB").resize((width, height), Image.Resampling.LANCZOS)
+    img = image.convert("RGB").resize((width, height), Image.Resampling.LANCZOS)
+    pixels = np.asarray(img, dtype=np.uint8)  # (height, width, 3)
+
+    if orientation is Orientation.VERTICAL:
+        tiles = pixels.reshape(module_count, MODULE_SIZE, MODULE_SIZE, 3)
+    else:
+        tiles = pixels.reshape(MODULE_SIZE, module_count, MODULE_SIZE, 3).transpose(1, 0, 2, 3)
+    return np.ascontiguousarray(tiles)
+
+
+def load_image_grids(
+    image: ImageSource,
+    module_count: int,
+    orientation: Orientation,
+) -> List[List[str]]:
+    """Like :func:`load_image_tiles`, but as lists of ``"#rrggbb"`` colours.
+
+    Returns:
+        A list of ``module_count`` grids, each a row-major list of 25 colours.
+    """
+    tiles = load_image_tiles(image, module_count, orientation)
+    return [_rgb_to_hex(tile.tobytes()) for tile in tiles]
+
+
+def _read_image_data(image: ImageSource) -> bytes:
+    """Return the encoded image bytes of a path, bytes-like or file-like source."""
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        return bytes(image)
+    if hasattr(image, "read"):
+        return image.read()
+    with open(image, "rb") as handle:
+        return handle.read()
+
 
-    grids: List[List[str]] = []
-    for i in range(module_count):
-        if orientation is Orientation.VERTICAL:
-            box = (0, i * MODULE_SIZE, MODULE_SIZE, (i + 1) * MODULE_SIZE)
-        else:
-            box = (i * MODULE_SIZE, 0, (i + 1) * MODULE_SIZE, MODULE_SIZE)
-        grids.append(image_to_hex(img.crop(box)))
-    return grids
+def _rgb_to_hex(data: bytes) -> List[str]:
+    packed = data.hex()
+    return ["#" + packed[i : i + 6] for i in range(0, len(packed), 6)]
 
 
 def _hex_to_rgb(color: str) -> tuple:
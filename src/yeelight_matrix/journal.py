@@ -0,0 +1,146 @@
+"""Sequence-numbered changes between the frames of a layout.
+
+A :class:`FrameJournal` follows a :class:`~yeelight_matrix.layout.Layout`. Each
+:meth:`~FrameJournal.commit` (once per frame drawn) compares the layout with the
+previous commit and, if any dot changed, records the changed dots under the
+next sequence number. A viewer holding frame ``n`` catches up with
+:meth:`~FrameJournal.changes_since` instead of re-reading every dot::
+
+    journal = FrameJournal(layout)
+    sequence, modules = journal.snapshot()      # full frame for a new viewer
+    layout.set_pixel(0, 2, 2, "#ff0000")
+    journal.commit()                            # (1, [(0, 2, 2, "#ff0000")])
+    journal.changes_since(sequence)             # [(0, 2, 2, "#ff0000")]
+
+Observers of single dots register with :meth:`~FrameJournal.add_dot_listener`
+and are called by :meth:`~FrameJournal.commit` only when their dot changed.
+
+Only the last ``history`` frames are kept; older sequences get ``None`` and
+should reload the snapshot. Sequence numbers start again at 0 in every journal,
+so each has a random :attr:`~FrameJournal.session` id; a viewer passes it back
+with its sequence so that a number from another journal (e.g. before a restart)
+is never mistaken for one of this journal's.
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections import deque
+from typing import TYPE_CHECKING, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover - imported for annotations only
+    from .layout import Layout
+
+#: One changed dot: ``(module_index, x, y, "#rrggbb")``.
+DotChange = Tuple[int, int, int, str]
+
+#: Frames of changes a journal keeps by default.
+DEFAULT_HISTORY = 64
+
+
+class FrameJournal:
+    """Records which dots of a layout changed from one committed frame to the next.
+
+    Args:
+        layout: The layout to follow.
+        history: Number of committed frames whose changes are kept.
+    """
+
+    def __init__(self, layout: "Layout", history: int = DEFAULT_HISTORY) -> None:
+        self._layout = layout
+        #: Identifies this journal's sequence numbers.
+        self.session = uuid.uuid4().hex
+        #: Sequence number of the last committed frame (0 before the first change).
+        self.sequence = 0
+        self._entries: Deque[Tuple[int, Dict[Tuple[int, int, int], str]]] = deque(
+            maxlen=history
+        )
+        self._colors: List[Sequence[str]] = [module.colors for module in layout.modules]
+        # Oldest sequence a viewer may resume from (later after a module change).
+        self._valid_from = 0
+        self._dot_listeners: Dict[Tuple[int, int, int], List[Callable[[str], None]]] = {}
+
+    def add_dot_listener(
+        self, module_index: int, x: int, y: int, update: Callable[[str], None]
+    ) -> Callable[[], None]:
+        """Call ``update(color)`` from :meth:`commit` whenever one dot changes.
+
+        Returns a function that removes the listener.
+        """
+        key = (module_index, x, y)
+        self._dot_listeners.setdefault(key, []).append(update)
+
+        def remove() -> None:
+            listeners = self._dot_listeners.get(key, [])
+            if update in listeners:
+                listeners.remove(update)
+            if not listeners:
+                self._dot_listeners.pop(key, None)
+
+        return remove
+
+    def snapshot(self) -> Tuple[int, List[Sequence[str]]]:
+        """Return the last committed sequence and every module's colours then."""
+        return self.sequence, list(self._colors)
+
+    def commit(self) -> Optional[Tuple[int, List[DotChange]]]:
+        """Record the layout's current frame.
+
+        Returns the new sequence number and the dots that changed since the
+        previous commit, or ``None`` (and keeps the sequence) if none did. The
+        listeners of the changed dots are called first.
+        """
+        modules = self._layout.modules
+        colors: List[Sequence[str]] = [module.colors for module in modules]
+        if len(colors) != len(self._colors):
+            # The modules changed: the old sequence numbers no longer apply.
+            self._entries.clear()
+            self._colors = [()] * len(colors)
+            self._valid_from = self.sequence + 1
+        changes: Dict[Tuple[int, int, int], str] = {}
+        for index, (module, new, old) in enumerate(zip(modules, colors, self._colors)):
+            # Colour lists are shared until a module changes, so identity is
+            # enough to skip untouched modules.
+            if new is old:
+                continue
+            width = module.width
+            for dot, color in enumerate(new):
+                if dot >= len(old) or old[dot] != color:
+                    changes[(index, dot % width, dot // width)] = color
+        self._colors = colors
+        if not changes:
+            return None
+        self.sequence += 1
+        self._entries.append((self.sequence, changes))
+        if self._dot_listeners:
+            for dot, color in changes.items():
+                for update in self._dot_listeners.get(dot, ()):
+                    update(color)
+        return self.sequence, _as_list(changes)
+
+    def changes_since(
+        self, sequence: int, session: Optional[str] = None
+    ) -> Optional[List[DotChange]]:
+        """Return the dots that changed after frame ``sequence``, up to the latest.
+
+        Each dot appears once, with its latest colour. Returns ``None`` if
+        ``sequence`` is no longer (or not yet) in the journal, or if ``session``
+        is given and is not this journal's; the caller then needs the
+        :meth:`snapshot`.
+        """
+        if session is not None and session != self.session:
+            return None
+        if sequence == self.sequence:
+            return []
+        oldest = self._entries[0][0] if self._entries else self.sequence + 1
+        if sequence < self._valid_from or not oldest - 1 <= sequence < self.sequence:
+            return None
+        merged: Dict[Tuple[int, int, int], str] = {}
+        for number, changes in self._entries:
+            if number > sequence:
+                merged.update(changes)
+        return _as_list(merged)
+
+
+def _as_list(changes: Dict[Tuple[int, int, int], str]) -> List[DotChange]:
+    return [(index, x, y, color) for (index, x, y), color in changes.items()]
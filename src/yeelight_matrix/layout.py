@@ -4,22 +4,47 @@ A :class:`Layout` knows how the physical modules are stacked (orientation and
 which end is the base) and turns the per-module logical colour grids into the
 single base64 frame understood by the device.
 
+All dots of the stack live in one packed RGB frame buffer (three bytes per dot,
+modules back to back in storage order); each :class:`Module` is a view into its
+slice of that buffer, so editing and rendering never go through per-dot
+strings.
+
 Modules are addressed by their *logical* index (0 is the visual first module,
 matching the order you would read the picture). Internally the modules may be
 stored reversed and each is rotated at render time so that pictures appear the
 right way up regardless of how the stack is mounted.
+
+The whole stack can also be treated as one continuous *canvas* of dots (see
+:attr:`Layout.canvas_size`), laid out top to bottom or left to right as the
+modules appear, which is what images and procedural effects are drawn on.
+
+Modules can also be coloured by index into the layout's shared
+:attr:`Layout.palette` (see :mod:`yeelight_matrix.palette`), so recolouring
+every dot of one colour is a single palette change.
 """
 
 from __future__ import annotations
 
 import logging
-from typing import List, Optional, Sequence
+from functools import lru_cache
+from operator import itemgetter
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
 
-from .color import ColorLike, encode_many
+import numpy as np
+
+from .animation import Animation
+from .color import BLACK, ColorLike, encode_rgb, to_rgb
 from .enums import BasePosition, ModuleType, Orientation
 from .exceptions import LayoutError
-from .image_utils import load_image_grids, rotate_grid
+from .image_utils import (
+    MODULE_SIZE,
+    ImageSource,
+    iter_image_frames,
+    load_image_tiles,
+    rotation_table,
+)
 from .module import Module
+from .palette import Palette
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -59,6 +84,17 @@ class Layout:
 
         # Modules in transmission/storage order (reversed when flipped).
         self._modules: List[Module] = []
+        # The same modules in logical order, rebuilt whenever the list changes.
+        self._logical: Tuple[Module, ...] = ()
+        # Packed RGB bytes for every dot, modules in storage order.
+        self._frame = bytearray()
+        # Modules in transmission order, each with the gather that reorders its
+        # bytes for the device, and the cached base64 segment for each.
+        self._render_plan: List[Tuple[Module, Callable[[memoryview], tuple]]] = []
+        self._segments: List[str] = []
+        self._views: List[np.ndarray] = []
+        #: Colours shared by the modules in palette mode.
+        self.palette = Palette()
         if modules:
             self.add_modules(modules)
 
@@ -68,9 +104,15 @@ class Layout:
         return len(self._modules)
 
     @property
-    def modules(self) -> List[Module]:
-        """Modules in logical order (index 0 = visual first module)."""
-        return list(reversed(self._modules)) if self._flipped else list(self._modules)
+    def modules(self) -> Tuple[Module, ...]:
+        """Modules in logical order (index 0 = visual first module), read-only."""
+        return self._logical
+
+    @property
+    def frame(self) -> memoryview:
+        """Read-only view of the packed RGB frame buffer (modules in storage order)."""
+        self._sync_palette()
+        return memoryview(self._frame).toreadonly()
 
     def add_modules(self, modules: Sequence[ModuleType | str], clear: bool = True) -> None:
         """Add a list of module types, replacing existing modules by default."""
@@ -80,11 +122,38 @@ class Layout:
         if self._flipped:
             wrapped = list(reversed(wrapped))
         self._modules.extend(wrapped)
+        self._bind_frame()
 
     def add_module(self, module_type: ModuleType | str, index: Optional[int] = None) -> None:
         """Insert a single module at the given logical ``index`` (append if None)."""
         logical = len(self._modules) if index is None else index
         self._modules.insert(max(0, self._storage_index(logical)), Module(module_type))
+        self._bind_frame()
+
+    def _bind_frame(self) -> None:
+        """Reallocate the frame buffer and point every module at its slice."""
+        frame = bytearray(3 * sum(module.led_count for module in self._modules))
+        view = memoryview(frame)
+        offset = 0
+        for module in self._modules:
+            size = 3 * module.led_count
+            module._attach(view[offset : offset + size])
+            offset += size
+        self._frame = frame
+        self._logical = tuple(reversed(self._modules) if self._flipped else self._modules)
+        # NumPy (height, width, 3) views of every module's dots, for the canvas.
+        pixels = np.frombuffer(frame, dtype=np.uint8)
+        self._views = []
+        offset = 0
+        for module in self._modules:
+            size = 3 * module.led_count
+            view = pixels[offset : offset + size]
+            self._views.append(view.reshape(module.height, module.width, 3))
+            offset += size
+        self._render_plan = [
+            (module, _segment_gather(self.rotation, module.type)) for module in self._logical
+        ]
+        self._segments = [""] * len(self._modules)
 
     def module_at(self, index: int) -> Module:
         """Return the module at the given logical index."""
@@ -132,13 +201,151 @@ class Layout:
         for module in self._modules:
             module.clear()
 
-    def set_image(self, image_path: str, start_module: int = 0, max_modules: Optional[int] = None) -> None:
+    def set_rgb(self, data: bytes, start_module: int = 0) -> None:
+        """Set dots from packed RGB bytes, modules in logical order.
+
+        From logical index ``start_module`` on, each module takes three bytes
+        per dot, row-major, in turn. ``data`` must end on a module boundary;
+        the whole layout is ``len(layout.frame)`` bytes. Modules whose bytes did
+        not change are left untouched, so they are not re-encoded.
+        """
+        if not 0 <= start_module < len(self._modules):
+            raise LayoutError(f"No module at index {start_module}")
+        modules = self.modules[start_module:]
+        data = memoryview(data)
+        spans = []
+        offset = 0
+        for module in modules:
+            if offset >= len(data):
+                break
+            spans.append((module, data[offset : offset + 3 * module.led_count]))
+            offset += 3 * module.led_count
+        if offset != len(data) or not spans:
+            raise ValueError(
+                f"{len(data)} bytes of RGB data do not cover whole modules "
+                f"from module {start_module}"
+            )
+        for module, chunk in spans:
+            if module.palette is not None or module.rgb != chunk or not module.used:
+                module.set_rgb(chunk)
+
+    def set_pixels(self, edits: Iterable[Tuple[int, int, int, ColorLike]]) -> None:
+        """Apply many ``(module_index, x, y, color)`` dot edits in one call."""
+        edits = list(edits)
+        _LOGGER.debug("Set %s pixels", len(edits))
+        for module_index, x, y, color in edits:
+            self.module_at(module_index).set_pixel(x, y, color)
+
+    def set_module_indices(self, index: int, indices: Sequence[int]) -> None:
+        """Colour a module by :attr:`palette` index (row-major, one per dot).
+
+        The module stays in palette mode, following later palette changes,
+        until its colours are set directly.
+        """
+        self.module_at(index).set_indices(indices, self.palette)
+
+    def set_pixel_index(self, module_index: int, x: int, y: int, index: int) -> None:
+        """Set one dot of a palette-mode module to :attr:`palette` entry ``index``."""
+        self.module_at(module_index).set_pixel_index(x, y, index)
+
+    def to_palette(self) -> None:
+        """Switch every used module to palette mode, keeping its colours.
+
+        Colours not yet in :attr:`palette` are added, so a picture drawn with
+        :meth:`set_image` can then be colour-cycled by editing the palette.
+
+        Raises:
+            ValueError: If the stack uses more colours than a palette holds.
+        """
+        for module in self._modules:
+            if module.used:
+                module.to_palette(self.palette)
+
+    def _sync_palette(self) -> None:
+        """Bring palette-mode modules up to date before reading the frame directly."""
+        for module in self._modules:
+            module._sync()
+
+    def set_image(self, image: ImageSource, start_module: int = 0, max_modules: Optional[int] = None) -> None:
         """Render a picture across consecutive unused 5x5 modules.
 
-        Starting from logical index ``start_module`` the image is mapped onto up
-        to ``max_modules`` consecutive, currently-unused 5x5 (clear) modules.
+        ``image`` is a file path, the encoded image bytes, a binary file-like
+        object or a PIL image. Starting from logical index ``start_module`` the
+        image is mapped onto up to ``max_modules`` consecutive, currently-unused
+        5x5 (clear) modules.
+        Decoded tiles are cached (see
+        :data:`~yeelight_matrix.image_utils.DEFAULT_IMAGE_CACHE`), so showing a
+        recently used picture again skips decoding and resizing.
+
+        To decode in a worker thread while editing the layout on its own, do
+        the three steps separately: :meth:`image_modules`,
+        :func:`~yeelight_matrix.image_utils.load_image_tiles` (the only slow
+        one, touching nothing but the image) and :meth:`set_image_tiles`.
         """
-        _LOGGER.debug("Set image %s from module %s (max %s)", image_path, start_module, max_modules)
+        _LOGGER.debug(
+            "Set image %s from module %s (max %s)",
+            image if isinstance(image, str) else type(image).__name__,
+            start_module,
+            max_modules,
+        )
+        modules = self.image_modules(start_module, max_modules)
+        self.set_image_tiles(modules, load_image_tiles(image, len(modules), self.orientation))
+
+    def image_modules(
+        self, start_module: int = 0, max_modules: Optional[int] = None
+    ) -> Tuple[Module, ...]:
+        """Return the modules :meth:`set_image` would cover, in image order.
+
+        Raises:
+            LayoutError: If no free 5x5 module is available.
+        """
+        first, count = self._image_span(start_module, max_modules)
+        return tuple(self._modules[first : first + count])
+
+    def set_image_tiles(self, modules: Sequence[Module], tiles: np.ndarray) -> None:
+        """Copy image tiles (from :func:`load_image_tiles`) onto ``modules``."""
+        for module, tile in zip(modules, tiles):
+            module.set_rgb(tile.tobytes())
+
+    def load_animation(
+        self,
+        image: ImageSource,
+        start_module: int = 0,
+        max_modules: Optional[int] = None,
+        keep_frames: bool = True,
+    ) -> Animation:
+        """Prepare an animated image (GIF, APNG, WebP) for playback.
+
+        The target modules are chosen exactly as for :meth:`set_image`, right
+        away. Frames are then decoded lazily, as playback reaches them, and
+        each is copied onto those modules and the whole layout rendered into a
+        frame payload, with the delay stored in the file as its duration. With
+        ``keep_frames`` the encoded payloads are kept for replaying (looping);
+        without it nothing but the current frame is held in memory.
+
+        Decoding touches nothing but the image, so it may run in a worker
+        thread (:meth:`Animation.prefetch`); the copy and render modify the
+        layout and belong on the thread that edits it.
+
+        Play the result with :class:`~yeelight_matrix.animation.AnimationPlayer`.
+        """
+        _LOGGER.debug("Load animation from module %s (max %s)", start_module, max_modules)
+        modules = self.image_modules(start_module, max_modules)
+        for module in modules:
+            module.used = True
+
+        def show(tiles: np.ndarray) -> str:
+            self.set_image_tiles(modules, tiles)
+            return self.render_frame()
+
+        return Animation.from_frames(
+            iter_image_frames(image, len(modules), self.orientation),
+            keep_frames=keep_frames,
+            render=show,
+        )
+
+    def _image_span(self, start_module: int, max_modules: Optional[int]) -> Tuple[int, int]:
+        """Return ``(first storage index, count)`` of the modules an image covers."""
         # Scan in transmission order. For base-at-end layouts (bottom/right) the
         # image always begins at the base; for base-at-start layouts (top/left)
         # it honours ``start_module``. This matches the device's reading order.
@@ -163,22 +370,199 @@ class Layout:
             if count >= limit or not self._is_free_matrix(module):
                 break
             count += 1
-
-        grids = load_image_grids(image_path, count, self.orientation)
-        for module, grid in zip(self._modules[first : first + count], grids):
-            module.set_grid(grid)
+        return first, count
 
     @staticmethod
     def _is_free_matrix(module: Module) -> bool:
         return module.type is ModuleType.CLEAR and not module.used
 
+    # -- canvas -------------------------------------------------------------
+
+    @property
+    def canvas_size(self) -> Tuple[int, int]:
+        """``(width, height)`` of the layout seen as one continuous grid of dots.
+
+        Every module takes a 5x5 block, in visual order (top to bottom for a
+        vertical stack, left to right for a horizontal one). A spotlight shows
+        the colour drawn at the centre of its block, and reads back as that
+        colour across the whole block.
+        """
+        span = MODULE_SIZE * len(self._modules)
+        if self.orientation is Orientation.VERTICAL:
+            return MODULE_SIZE, span
+        return span, MODULE_SIZE
+
+    def get_canvas(self) -> np.ndarray:
+        """Return a copy of the whole canvas as a ``(height, width, 3)`` uint8 array."""
+        self._sync_palette()
+        width, height = self.canvas_size
+        canvas = np.empty((height, width, 3), dtype=np.uint8)
+        for (top, left), view in zip(self._block_origins(), self._views):
+            canvas[top : top + MODULE_SIZE, left : left + MODULE_SIZE] = view
+        return canvas
+
+    def set_canvas(self, pixels: np.ndarray) -> None:
+        """Set every module from a ``(height, width, 3)`` RGB array.
+
+        ``pixels`` covers the whole :attr:`canvas_size`; values are taken as
+        ``uint8``. Each module's block is copied straight into the frame buffer.
+        """
+        pixels = np.asarray(pixels, dtype=np.uint8)
+        width, height = self.canvas_size
+        if pixels.shape != (height, width, 3):
+            raise ValueError(
+                f"Expected a canvas of shape {(height, width, 3)}, got {pixels.shape}"
+            )
+        self._write_canvas(0, 0, pixels)
+
+    def get_canvas_pixel(self, x: int, y: int) -> str:
+        """Return the ``"#rrggbb"`` colour at canvas position ``(x, y)``."""
+        width, height = self.canvas_size
+        if not (0 <= x < width and 0 <= y < height):
+            raise LayoutError(f"Canvas position ({x}, {y}) is outside {width}x{height}")
+        index, local_x, local_y = self._canvas_locate(x, y)
+        self._modules[index]._sync()
+        view = self._views[index]
+        if view.shape[0] == 1:
+            local_x = local_y = 0
+        return "#" + view[local_y, local_x].tobytes().hex()
+
+    def set_canvas_pixel(self, x: int, y: int, color: ColorLike) -> None:
+        """Set the dot at canvas position ``(x, y)`` (ignored if off the canvas)."""
+        self.fill_rect(x, y, 1, 1, color)
+
+    def fill_rect(self, x: int, y: int, width: int, height: int, color: ColorLike) -> None:
+        """Fill a rectangle of the canvas with one colour (clipped to the canvas)."""
+        pixel = np.array(to_rgb(color), dtype=np.uint8)
+        self._write_canvas(x, y, np.broadcast_to(pixel, (max(0, height), max(0, width), 3)))
+
+    def blit(self, pixels: np.ndarray, x: int = 0, y: int = 0) -> None:
+        """Draw a ``(h, w, 3)`` RGB array with its top-left corner at ``(x, y)``.
+
+        Parts falling outside the canvas are clipped.
+        """
+        pixels = np.asarray(pixels, dtype=np.uint8)
+        if pixels.ndim != 3 or pixels.shape[2] != 3:
+            raise ValueError(f"Expected an array of shape (h, w, 3), got {pixels.shape}")
+        self._write_canvas(x, y, pixels)
+
+    def draw_line(self, x0: int, y0: int, x1: int, y1: int, color: ColorLike) -> None:
+        """Draw a straight line between two canvas points, inclusive (clipped)."""
+        steps = max(abs(x1 - x0), abs(y1 - y0))
+        xs = np.rint(np.linspace(x0, x1, steps + 1)).astype(np.intp)
+        ys = np.rint(np.linspace(y0, y1, steps + 1)).astype(np.intp)
+        width, height = self.canvas_size
+        inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+        xs, ys = xs[inside], ys[inside]
+        pixel = np.array(to_rgb(color), dtype=np.uint8)
+
+        blocks, local_x, local_y = self._canvas_locate(xs, ys)
+        centre = MODULE_SIZE // 2
+        for index in np.unique(blocks):
+            module, view = self._modules[index], self._views[index]
+            mine = blocks == index
+            module._leave_palette()
+            if view.shape[0] == MODULE_SIZE:
+                view[local_y[mine], local_x[mine]] = pixel
+            elif np.any((local_x[mine] == centre) & (local_y[mine] == centre)):
+                view[0, 0] = pixel
+            else:
+                continue
+            module.used = module.dirty = True
+
+    def shift(self, dx: int, dy: int, wrap: bool = False, fill: ColorLike = BLACK) -> None:
+        """Scroll the whole canvas by ``(dx, dy)`` dots.
+
+        Dots moved off one edge re-enter on the opposite edge when ``wrap`` is
+        set; otherwise the uncovered area is painted with ``fill``.
+        """
+        canvas = self.get_canvas()
+        if wrap:
+            shifted = np.roll(canvas, (dy, dx), axis=(0, 1))
+        else:
+            height, width = canvas.shape[:2]
+            shifted = np.empty_like(canvas)
+            shifted[:] = to_rgb(fill)
+            src_y, dst_y = _shift_span(height, dy)
+            src_x, dst_x = _shift_span(width, dx)
+            shifted[dst_y, dst_x] = canvas[src_y, src_x]
+        self._write_canvas(0, 0, shifted)
+
+    def _block_origins(self) -> Iterator[Tuple[int, int]]:
+        """Yield the ``(top, left)`` canvas corner of every module's 5x5 block."""
+        for index in range(len(self._modules)):
+            offset = MODULE_SIZE * index
+            yield (offset, 0) if self.orientation is Orientation.VERTICAL else (0, offset)
+
+    def _canvas_locate(self, x: int, y: int) -> Tuple[int, int, int]:
+        """Return ``(storage index, local x, local y)`` of canvas positions.
+
+        Works element-wise on NumPy arrays of positions as well as on ints.
+        """
+        if self.orientation is Orientation.VERTICAL:
+            return y // MODULE_SIZE, x, y % MODULE_SIZE
+        return x // MODULE_SIZE, x % MODULE_SIZE, y
+
+    def _write_canvas(self, x: int, y: int, pixels: np.ndarray) -> None:
+        """Copy ``pixels`` (``(h, w, 3)`` uint8) onto the canvas at ``(x, y)``.
+
+        Every module overlapped by the area gets one slice assignment into its
+        view of the frame buffer (a spotlight takes the colour at its centre).
+        """
+        height, width = pixels.shape[:2]
+        centre = MODULE_SIZE // 2
+        for module, view, (top, left) in zip(self._modules, self._views, self._block_origins()):
+            # Overlap of the drawn area with this block, in canvas coordinates.
+            y0, y1 = max(y, top), min(y + height, top + MODULE_SIZE)
+            x0, x1 = max(x, left), min(x + width, left + MODULE_SIZE)
+            if y0 >= y1 or x0 >= x1:
+                continue
+            module._leave_palette()
+            if view.shape[0] == MODULE_SIZE:
+                view[y0 - top : y1 - top, x0 - left : x1 - left] = pixels[
+                    y0 - y : y1 - y, x0 - x : x1 - x
+                ]
+            elif y0 <= top + centre < y1 and x0 <= left + centre < x1:
+                view[0, 0] = pixels[top + centre - y, left + centre - x]
+            else:
+                continue
+            module.used = module.dirty = True
+
     # -- rendering ----------------------------------------------------------
 
     def render_frame(self) -> str:
         """Return the full base64 LED frame for :meth:`CubeMatrix.update_leds`."""
-        frame = ""
-        for module in reversed(self._modules) if self._flipped else self._modules:
-            colors = rotate_grid(module.colors, self.rotation, module.width) if module.is_matrix \
-                else module.colors
-            frame += encode_many(colors)
-        return frame
+        # Each module encodes to an aligned, self-contained base64 segment (three
+        # bytes per LED), so only modules edited since the last render are
+        # re-encoded; the rest reuse their cached segment.
+        segments = self._segments
+        for position, (module, gather) in enumerate(self._render_plan):
+            if module.dirty:
+                segments[position] = encode_rgb(bytes(gather(module.rgb)))
+                module.dirty = False
+        return "".join(segments)
+
+
+@lru_cache(maxsize=None)
+def _segment_gather(rotation: int, module_type: ModuleType) -> Callable[[memoryview], tuple]:
+    """Return a getter reordering one module's RGB bytes into transmission order.
+
+    The permutation (rotation included) is computed once per rotation and
+    module type and shared by every module and layout.
+    """
+    if module_type.is_matrix:
+        dots = rotation_table(rotation, module_type.width)
+    else:
+        dots = range(module_type.led_count)
+    offsets = []
+    for dot in dots:
+        offsets.extend((3 * dot, 3 * dot + 1, 3 * dot + 2))
+    return itemgetter(*offsets)
+
+
+def _shift_span(length: int, offset: int) -> Tuple[slice, slice]:
+    """Source and destination slices moving ``length`` items by ``offset``."""
+    offset = max(-length, min(length, offset))
+    if offset >= 0:
+        return slice(0, length - offset), slice(offset, length)
+    return slice(-offset, length), slice(0, length + offset)
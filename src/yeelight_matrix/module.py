@@ -2,10 +2,31 @@
 
 from __future__ import annotations
 
-from typing import List, Sequence
+from array import array
+from typing import Any, NoReturn, Optional, Sequence
 
-from .color import BLACK, ColorLike, to_hex
+from .color import BLACK, ColorLike, to_rgb_bytes
 from .enums import ModuleType
+from .palette import Palette
+
+
+class ColorList(list):
+    """A read-only list of ``"#rrggbb"`` colours, as returned by :attr:`Module.colors`.
+
+    It compares, iterates and serialises like a plain list, but cannot be
+    modified, so one instance can be shared by every reader until the module
+    changes. Copy it with ``list(...)`` to edit.
+    """
+
+    def _read_only(self, *args: Any, **kwargs: Any) -> NoReturn:
+        raise TypeError("Module colours are read-only; copy them with list() to edit")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __reduce__(self):
+        # Rebuild from a plain list (the default would call the blocked extend).
+        return type(self), (list(self),)
 
 
 class Module:
@@ -15,12 +36,51 @@ class Module:
     order. For a 5x5 module that is 25 colours; for a 1x1 spotlight it is one.
     Orientation/rotation is applied by :class:`~yeelight_matrix.layout.Layout`
     at render time, which keeps editing individual dots simple and intuitive.
+
+    The colours are kept as packed RGB bytes (three per dot). A standalone
+    module owns its own buffer; once added to a layout it becomes a view into
+    the layout's frame buffer, so edits land directly in the rendered frame.
+
+    In *palette mode* (see :meth:`set_indices`) the module also keeps one
+    palette index per dot and its RGB bytes are expanded from a shared
+    :class:`~yeelight_matrix.palette.Palette`, re-expanding lazily after the
+    palette changes. Setting colours directly leaves palette mode.
     """
 
     def __init__(self, module_type: ModuleType | str, fill: ColorLike = BLACK) -> None:
         self.type = ModuleType(module_type)
-        self._colors: List[str] = [to_hex(fill)] * self.type.led_count
+        self._buffer = memoryview(bytearray(to_rgb_bytes(fill) * self.type.led_count))
         self.used = False
+        self._dirty = True
+        # Counts changes to the dots, so the colour list is only rebuilt after one.
+        self._changes = 0
+        self._colors: Optional[ColorList] = None
+        self._colors_at = -1
+        # Palette mode: indices per dot, their palette, and the palette version
+        # the RGB bytes were last expanded from (-1: not expanded yet).
+        self._palette: Optional[Palette] = None
+        self._indices: Optional[array] = None
+        self._expanded = -1
+
+    @property
+    def dirty(self) -> bool:
+        """True when the dots changed since the layout last encoded this module."""
+        return self._dirty or (
+            self._palette is not None and self._expanded != self._palette.version
+        )
+
+    @dirty.setter
+    def dirty(self, value: bool) -> None:
+        self._dirty = value
+        if value:
+            self._changes += 1
+
+    def _attach(self, buffer: memoryview) -> None:
+        """Move the dots into ``buffer`` (a slice of a layout frame) and use it."""
+        self._sync()
+        buffer[:] = self._buffer
+        self._buffer = buffer
+        self.dirty = True
 
     # -- geometry -----------------------------------------------------------
 
@@ -47,9 +107,24 @@ class Module:
     # -- colour access ------------------------------------------------------
 
     @property
-    def colors(self) -> List[str]:
-        """The logical, row-major list of LED colours (normalised hex)."""
-        return list(self._colors)
+    def colors(self) -> ColorList:
+        """The logical, row-major list of LED colours (normalised hex), read-only.
+
+        The list is built once per change to the module and shared by every
+        reader until the next one.
+        """
+        self._sync()
+        if self._colors_at != self._changes:
+            packed = self._buffer.hex()
+            self._colors = ColorList("#" + packed[i : i + 6] for i in range(0, len(packed), 6))
+            self._colors_at = self._changes
+        return self._colors
+
+    @property
+    def rgb(self) -> memoryview:
+        """Read-only view of the logical, row-major RGB bytes (three per dot)."""
+        self._sync()
+        return self._buffer.toreadonly()
 
     def _index(self, x: int, y: int) -> int:
         if not (0 <= x < self.width and 0 <= y < self.height):
@@ -60,12 +135,17 @@ class Module:
 
     def get_pixel(self, x: int, y: int) -> str:
         """Return the colour of the dot at column ``x``, row ``y``."""
-        return self._colors[self._index(x, y)]
+        offset = 3 * self._index(x, y)
+        self._sync()
+        return "#" + self._buffer[offset : offset + 3].hex()
 
     def set_pixel(self, x: int, y: int, color: ColorLike) -> None:
         """Set a single dot at column ``x``, row ``y``."""
-        self._colors[self._index(x, y)] = to_hex(color)
+        offset = 3 * self._index(x, y)
+        self._leave_palette()
+        self._buffer[offset : offset + 3] = to_rgb_bytes(color)
         self.used = True
+        self.dirty = True
 
     def set_grid(self, colors: Sequence[ColorLike]) -> None:
         """Replace the whole grid with ``colors`` (row-major, ``led_count`` long)."""
@@ -74,18 +154,100 @@ class Module:
                 f"{self.type.value} module expects {self.led_count} colours, "
                 f"got {len(colors)}"
             )
-        self._colors = [to_hex(color) for color in colors]
+        self._leave_palette()
+        self._buffer[:] = b"".join(map(to_rgb_bytes, colors))
         self.used = True
+        self.dirty = True
+
+    def set_rgb(self, data: bytes) -> None:
+        """Replace the whole grid with packed, row-major RGB bytes (three per dot)."""
+        if len(data) != len(self._buffer):
+            raise ValueError(
+                f"{self.type.value} module expects {len(self._buffer)} bytes of RGB data, "
+                f"got {len(data)}"
+            )
+        self._leave_palette()
+        self._buffer[:] = data
+        self.used = True
+        self.dirty = True
 
     def fill(self, color: ColorLike) -> None:
         """Set every dot in the module to ``color``."""
-        self._colors = [to_hex(color)] * self.led_count
+        self._leave_palette()
+        self._buffer[:] = to_rgb_bytes(color) * self.led_count
         self.used = True
+        self.dirty = True
 
     def clear(self) -> None:
         """Turn every dot off and mark the module unused."""
-        self._colors = [BLACK] * self.led_count
+        self._leave_palette()
+        self._buffer[:] = bytes(len(self._buffer))
         self.used = False
+        self.dirty = True
+
+    # -- palette mode ---------------------------------------------------------
+
+    @property
+    def palette(self) -> Optional[Palette]:
+        """The palette the dots are indexed into, or ``None`` outside palette mode."""
+        return self._palette
+
+    @property
+    def indices(self) -> Optional[array]:
+        """A copy of the row-major palette indices (``array('B')``), or ``None``."""
+        return None if self._indices is None else array("B", self._indices)
+
+    def set_indices(self, indices: Sequence[int], palette: Palette) -> None:
+        """Enter palette mode: colour every dot from ``palette`` by index.
+
+        Raises:
+            ValueError: If the count does not match the module or an index is
+                not a palette entry.
+        """
+        try:
+            indices = array("B", indices)
+        except OverflowError as exc:
+            raise ValueError(f"Palette indices must be 0-255: {exc}") from exc
+        if len(indices) != self.led_count:
+            raise ValueError(
+                f"{self.type.value} module expects {self.led_count} indices, "
+                f"got {len(indices)}"
+            )
+        self._buffer[:] = palette.expand(indices)
+        self._palette, self._indices, self._expanded = palette, indices, palette.version
+        self.used = True
+        self.dirty = True
+
+    def set_pixel_index(self, x: int, y: int, index: int) -> None:
+        """Set one dot of a palette-mode module to palette entry ``index``."""
+        if self._indices is None:
+            raise ValueError("Module is not in palette mode")
+        if not 0 <= index < len(self._palette):
+            raise ValueError(f"Palette index {index} out of range (size {len(self._palette)})")
+        dot = self._index(x, y)
+        self._sync()
+        self._indices[dot] = index
+        self._buffer[3 * dot : 3 * dot + 3] = self._palette.expand(bytes((index,)))
+        self.used = True
+        self.dirty = True
+
+    def to_palette(self, palette: Palette) -> None:
+        """Enter palette mode keeping the current colours (added to ``palette``)."""
+        self.set_indices(palette.index_rgb(self.rgb), palette)
+
+    def _sync(self) -> None:
+        """Re-expand the RGB bytes if the palette changed since the last expansion."""
+        palette = self._palette
+        if palette is not None and self._expanded != palette.version:
+            self._buffer[:] = palette.expand(self._indices)
+            self._expanded = palette.version
+            self._changes += 1
+
+    def _leave_palette(self) -> None:
+        """Keep the current colours as plain RGB and drop the palette indices."""
+        if self._palette is not None:
+            self._sync()
+            self._palette = self._indices = None
 
     def __repr__(self) -> str:  # pragma: no cover - debugging aid
         return f"Module(type={self.type.value!r}, used={self.used})"
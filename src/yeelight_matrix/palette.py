@@ -0,0 +1,127 @@
+"""Indexed colours shared by palette-mode modules.
+
+Pixel art and colour-cycling animations use a handful of colours. In palette
+mode a :class:`~yeelight_matrix.module.Module` keeps one byte per dot — an
+index into a :class:`Palette` shared by the whole layout — and its RGB dots are
+expanded from the palette with one ``bytes.translate`` per channel. Changing a
+palette entry recolours every dot using it without touching the dots: the
+swap costs O(palette), and modules re-expand lazily the next time they are
+read or rendered::
+
+    layout.palette.extend(["#000000", "#ff0000", "#00ff00"])
+    layout.set_module_indices(0, [1] * 25)    # module 0 all red
+    layout.palette[1] = "#0000ff"             # ... now all blue
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Dict, Iterable, Iterator, List
+
+from .color import ColorLike, to_rgb_bytes
+
+#: Largest number of entries in a palette (indices are single bytes).
+MAX_PALETTE_SIZE = 256
+
+
+class Palette:
+    """An ordered list of up to 256 colours addressed by index.
+
+    Args:
+        colors: Initial entries, in index order.
+    """
+
+    def __init__(self, colors: Iterable[ColorLike] = ()) -> None:
+        self._entries: List[bytes] = []
+        self._lookup: Dict[bytes, int] = {}
+        # Per-channel translation tables: index byte -> channel byte.
+        self._tables = [bytearray(MAX_PALETTE_SIZE) for _ in range(3)]
+        #: Incremented on every change; modules compare it to know when to re-expand.
+        self.version = 0
+        self.extend(colors)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.colors)
+
+    def __getitem__(self, index: int) -> str:
+        return "#" + self._entries[index].hex()
+
+    def __setitem__(self, index: int, color: ColorLike) -> None:
+        """Replace an entry; every dot using it changes colour."""
+        if not 0 <= index < len(self._entries):
+            raise IndexError(f"Palette index {index} out of range (size {len(self)})")
+        self._store(index, to_rgb_bytes(color))
+        self.version += 1
+
+    @property
+    def colors(self) -> List[str]:
+        """The entries as normalised hex strings, in index order."""
+        return ["#" + entry.hex() for entry in self._entries]
+
+    def add(self, color: ColorLike) -> int:
+        """Return the index of ``color``, appending it if it is not present.
+
+        Raises:
+            ValueError: If the colour is new and the palette is full.
+        """
+        return self._add_rgb(to_rgb_bytes(color))
+
+    def extend(self, colors: Iterable[ColorLike]) -> None:
+        """Add several colours (see :meth:`add`)."""
+        for color in colors:
+            self.add(color)
+
+    def index_rgb(self, data: bytes) -> array:
+        """Return the indices of packed RGB ``data`` (three bytes per dot).
+
+        Colours not yet in the palette are added.
+        """
+        data = bytes(data)
+        return array("B", (self._add_rgb(data[i : i + 3]) for i in range(0, len(data), 3)))
+
+    def expand(self, indices: bytes | array) -> bytearray:
+        """Return the packed RGB bytes for a sequence of indices.
+
+        Raises:
+            ValueError: If an index is not a palette entry.
+        """
+        raw = bytes(indices)
+        if raw and max(raw) >= len(self._entries):
+            raise ValueError(f"Palette index {max(raw)} out of range (size {len(self)})")
+        rgb = bytearray(3 * len(raw))
+        for channel, table in enumerate(self._tables):
+            rgb[channel::3] = raw.translate(table)
+        return rgb
+
+    def _add_rgb(self, rgb: bytes) -> int:
+        index = self._lookup.get(rgb)
+        if index is not None:
+            return index
+        index = len(self._entries)
+        if index >= MAX_PALETTE_SIZE:
+            raise ValueError(f"Palette is full ({MAX_PALETTE_SIZE} colours)")
+        # A new entry changes no existing dot, so the version stays the same.
+        self._entries.append(rgb)
+        self._store(index, rgb)
+        return index
+
+    def _store(self, index: int, rgb: bytes) -> None:
+        old = self._entries[index]
+        self._entries[index] = rgb
+        if old != rgb and self._lookup.get(old) == index:
+            # Entries may repeat a colour; keep finding it while any index holds it.
+            survivor = next((i for i, entry in enumerate(self._entries) if entry == old), None)
+            if survivor is None:
+                del self._lookup[old]
+            else:
+                self._lookup[old] = survivor
+        self._lookup.setdefault(rgb, index)
+        for table, value in zip(self._tables, rgb):
+            table[index] = value
+
+    def __repr__(self) -> str:  # pragma: no cover - debugging aid
+        return f"Palette({self.colors!r})"
+
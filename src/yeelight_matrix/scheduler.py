@@ -0,0 +1,158 @@
+"""Coalescing, rate-limited frame pushing for an :class:`AsyncCubeMatrix`.
+
+Edits made between draws only *request* a frame. A :class:`FrameScheduler`
+runs one draw task at a time, which renders the newest frame and pushes it no
+more often than ``max_fps``; requests made while a frame is being sent are
+covered by the next one, so a burst of edits costs at most one extra frame
+rather than one frame per edit (latest wins). A frame identical to the last one
+sent is not sent again unless forced. Once the device may no longer be showing
+that frame (it left direct mode, was power cycled) call
+:meth:`FrameScheduler.invalidate` so the next draw is sent regardless; a
+reconnect of the cube (its ``reconnects`` counter) does the same by itself::
+
+    scheduler = FrameScheduler(cube, layout.render_frame, max_fps=20)
+    layout.set_pixel(0, 2, 2, "#ff0000")
+    await scheduler.draw()                  # the frame is on the device
+    layout.set_pixel(0, 3, 2, "#ff0000")
+    scheduler.request_draw()                # don't wait for it
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Callable, Coroutine, List, Optional
+
+#: Starts the background draw task (e.g. a framework's tracked-task helper).
+TaskFactory = Callable[[Coroutine[Any, Any, None]], "asyncio.Task[None]"]
+
+
+class FrameScheduler:
+    """Pushes the newest rendered frame to a cube, coalescing draw requests.
+
+    Must be used from the event loop the cube runs on.
+
+    Args:
+        cube: The device (anything with a coroutine ``update_leds(payload)``).
+        render: Returns the current frame payload, e.g. ``layout.render_frame``.
+        max_fps: Maximum frames per second pushed (``0`` for no limit).
+        on_sent: Called after every frame actually sent to the device.
+        create_task: Starts the draw task; defaults to the running loop's
+            ``create_task``.
+    """
+
+    def __init__(
+        self,
+        cube: Any,
+        render: Callable[[], str],
+        max_fps: float = 0.0,
+        on_sent: Optional[Callable[[], None]] = None,
+        create_task: Optional[TaskFactory] = None,
+    ) -> None:
+        self._cube = cube
+        self._render = render
+        self._min_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self._on_sent = on_sent
+        self._create_task = create_task
+        # Callers waiting for the next frame, and the task serving them.
+        self._waiters: List[asyncio.Future] = []
+        self._task: Optional[asyncio.Task] = None
+        self._force_next = False
+        self._last_push = float("-inf")
+        self._last_frame: Optional[str] = None
+        self._reconnects = getattr(cube, "reconnects", 0)
+        self._frames_sent = 0
+        self._frames_suppressed = 0
+
+    @property
+    def last_frame(self) -> Optional[str]:
+        """The last frame sent to the device (``None`` before any, or once invalidated)."""
+        return self._last_frame
+
+    @property
+    def frames_sent(self) -> int:
+        """Number of frames sent to the device."""
+        return self._frames_sent
+
+    @property
+    def frames_suppressed(self) -> int:
+        """Number of draws skipped because the frame matched the last one sent."""
+        return self._frames_suppressed
+
+    def invalidate(self) -> None:
+        """Forget the last frame sent, so the next one is sent even if unchanged.
+
+        Call it whenever the device may have stopped showing that frame, e.g.
+        after switching effect mode or powering it back on.
+        """
+        self._last_frame = None
+
+    def request_draw(self, force: bool = False) -> asyncio.Future:
+        """Schedule a draw of the current frame without waiting for it.
+
+        Returns a future resolved once a frame rendered after this call has
+        been pushed (or suppressed as unchanged), or failed with the error the
+        push raised. With ``force`` that frame is sent even if unchanged.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._waiters.append(future)
+        self._force_next = self._force_next or force
+        if self._task is None or self._task.done():
+            coro = self._run()
+            create_task = self._create_task or loop.create_task
+            self._task = create_task(coro)
+        return future
+
+    async def draw(self, force: bool = False) -> None:
+        """Push the current frame and wait until it reaches the device."""
+        await self.request_draw(force)
+
+    async def show(self, frame: str) -> bool:
+        """Push a pre-rendered ``frame`` (e.g. from an animation) at the frame rate.
+
+        Returns False if it was suppressed as identical to the last frame sent.
+        """
+        await self._wait_for_slot()
+        return await self._push(frame, force=False)
+
+    async def _run(self) -> None:
+        """Push the newest frame until no caller is waiting."""
+        while self._waiters:
+            await self._wait_for_slot()
+            # Everything requested up to now is covered by the frame rendered here.
+            waiters, self._waiters = self._waiters, []
+            force, self._force_next = self._force_next, False
+            try:
+                await self._push(self._render(), force)
+            except Exception as exc:  # noqa: BLE001 - hand the error to the callers
+                self._last_push = asyncio.get_running_loop().time()
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_exception(exc)
+                continue
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+
+    async def _wait_for_slot(self) -> None:
+        delay = self._last_push + self._min_interval - asyncio.get_running_loop().time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _push(self, frame: str, force: bool) -> bool:
+        """Send ``frame``; return False if it was suppressed as unchanged."""
+        reconnects = getattr(self._cube, "reconnects", 0)
+        if reconnects != self._reconnects:
+            # A rebuilt connection may face a device that restarted.
+            self._reconnects = reconnects
+            self._last_frame = None
+        if not force and frame == self._last_frame:
+            self._frames_suppressed += 1
+            return False
+        await self._cube.update_leds(frame)
+        self._last_push = asyncio.get_running_loop().time()
+        self._last_frame = frame
+        self._frames_sent += 1
+        if self._on_sent is not None:
+            self._on_sent()
+        return True
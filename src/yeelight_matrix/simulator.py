@@ -0,0 +1,302 @@
+"""A local, hardware-free stand-in for a Yeelight Cube Matrix.
+
+:class:`CubeSimulator` listens on localhost and implements the subset of the
+Yeelight JSON-over-TCP control protocol used by this library: power,
+brightness, colour, ``get_prop``, ``activate_fx_mode``, ``update_leds`` and
+music mode (it connects back to the address given to ``set_music`` and then
+applies commands from that connection without answering them).
+
+It records what it receives so tests can assert on it::
+
+    async with CubeSimulator() as device:
+        async with AsyncCubeMatrix("127.0.0.1", device.port) as cube:
+            await cube.update_leds(frame)
+        assert device.frames == [frame]
+
+Network and firmware behaviour can be imitated: a per-command ``latency``, the
+device's ``rate_limit`` on control connections (answered with the same
+"client quota exceeded" error as the hardware; music mode is exempt, as on the
+real cube) and random ``packet_loss``. :class:`SimulatorThread` runs a
+simulator on its own event loop thread, for synchronous clients such as
+:class:`~yeelight_matrix.cube_matrix.CubeMatrix`::
+
+    with SimulatorThread(CubeSimulator(latency=0.005)) as device:
+        cube = CubeMatrix("127.0.0.1", device.port)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CubeSimulator:
+    """Fake cube matrix device serving the control protocol on ``host:port``.
+
+    Args:
+        host: Interface to listen on.
+        port: Port to listen on (``0`` picks a free one, see :attr:`port`).
+        latency: Seconds the device takes to process each command. Commands on
+            one connection are processed in order, so this also caps the
+            throughput of a connection.
+        rate_limit: Maximum commands per second accepted on control
+            connections (``None`` for no limit). Excess commands get a
+            "client quota exceeded" error. Music-mode connections are exempt.
+        packet_loss: Probability (0-1) that a command is silently lost: not
+            applied and not answered.
+        seed: Seed for the packet-loss randomness, for reproducible runs.
+    """
+
+    #: Error returned for commands over :attr:`rate_limit`, as sent by the device.
+    QUOTA_ERROR = {"code": -1, "message": "client quota exceeded"}
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        rate_limit: Optional[float] = None,
+        packet_loss: float = 0.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.host = host
+        self._requested_port = port
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._writers: Set[asyncio.StreamWriter] = set()
+
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.packet_loss = packet_loss
+        self._random = random.Random(seed)
+        # Arrival times of the control commands in the last second.
+        self._recent: Deque[float] = deque()
+        #: Commands lost to :attr:`packet_loss`.
+        self.dropped = 0
+        #: Commands refused by :attr:`rate_limit`.
+        self.rate_limited = 0
+
+        #: Device properties as reported by ``get_prop``.
+        self.properties: Dict[str, str] = {
+            "power": "off",
+            "bright": "100",
+            "rgb": "16777215",
+            "color_mode": "2",
+        }
+        #: The active FX mode (``activate_fx_mode``).
+        self.fx_mode: Optional[str] = None
+        #: Every ``update_leds`` payload received, in order.
+        self.frames: List[str] = []
+        #: Every command received as ``(method, params)``, in order.
+        self.commands: List[Tuple[str, list]] = []
+        #: True while a music-mode connection is open.
+        self.music_mode = False
+        #: Control connections accepted so far.
+        self.connections = 0
+
+    @property
+    def port(self) -> int:
+        """The port the simulator is listening on."""
+        if self._server is None:
+            return self._requested_port
+        return self._server.sockets[0].getsockname()[1]
+
+    @property
+    def last_frame(self) -> Optional[str]:
+        """The most recent ``update_leds`` payload, if any."""
+        return self.frames[-1] if self.frames else None
+
+    async def start(self) -> None:
+        """Start listening for control connections."""
+        self._server = await asyncio.start_server(
+            self._on_control, self.host, self._requested_port
+        )
+
+    async def stop(self) -> None:
+        """Stop listening and drop every open connection.
+
+        A later :meth:`start` listens on the same port again, so a stop/start
+        pair simulates the device dropping off the network and coming back.
+        """
+        if self._server is not None:
+            self._requested_port = self.port
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for writer in list(self._writers):
+            writer.close()
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def __aenter__(self) -> "CubeSimulator":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    def drop_connections(self) -> None:
+        """Abruptly close every client and music connection (like a Wi-Fi drop)."""
+        for writer in list(self._writers):
+            writer.close()
+
+    # -- protocol -----------------------------------------------------------
+
+    def _track(self, coro) -> None:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _on_control(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        await self._serve(reader, writer, reply=True)
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, reply: bool
+    ) -> None:
+        self._writers.add(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    command = json.loads(line)
+                except ValueError:
+                    continue
+                if self.packet_loss and self._random.random() < self.packet_loss:
+                    self.dropped += 1
+                    continue
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                if reply and self._over_quota():
+                    self.rate_limited += 1
+                    response = {"id": command.get("id"), "error": dict(self.QUOTA_ERROR)}
+                else:
+                    response = self._handle(command, writer)
+                if reply and response is not None:
+                    writer.write((json.dumps(response) + "\r\n").encode("utf8"))
+                    await writer.drain()
+        except (OSError, asyncio.CancelledError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+            if not reply:
+                self.music_mode = False
+
+    def _over_quota(self) -> bool:
+        """Record a control command; True if it exceeds :attr:`rate_limit`."""
+        if self.rate_limit is None:
+            return False
+        now = time.monotonic()
+        while self._recent and now - self._recent[0] >= 1.0:
+            self._recent.popleft()
+        if len(self._recent) >= self.rate_limit:
+            return True
+        self._recent.append(now)
+        return False
+
+    def _handle(self, command: Dict[str, Any], writer: asyncio.StreamWriter) -> Dict[str, Any]:
+        method = command.get("method")
+        params = command.get("params") or []
+        self.commands.append((method, params))
+        result: Any = ["ok"]
+
+        if method == "get_prop":
+            result = [self.properties.get(name, "") for name in params]
+        elif method == "set_power":
+            self.properties["power"] = params[0]
+        elif method == "set_bright":
+            self.properties["bright"] = str(params[0])
+        elif method == "set_rgb":
+            self.properties["rgb"] = str(params[0])
+        elif method == "activate_fx_mode":
+            self.fx_mode = params[0].get("mode")
+        elif method == "update_leds":
+            self.frames.append(params[0])
+        elif method == "set_music":
+            if params and params[0] == 1:
+                self._track(self._open_music(params[1], params[2]))
+        else:
+            return {
+                "id": command.get("id"),
+                "error": {"code": -1, "message": "method not supported"},
+            }
+        return {"id": command.get("id"), "result": result}
+
+    async def _open_music(self, host: str, port: int) -> None:
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+        except OSError as exc:
+            _LOGGER.debug("Simulator could not open music connection: %s", exc)
+            return
+        self.music_mode = True
+        await self._serve(reader, writer, reply=False)
+
+
+class SimulatorThread:
+    """Runs a :class:`CubeSimulator` on an event loop in a background thread.
+
+    Use it as a context manager around synchronous clients::
+
+        with SimulatorThread() as device:
+            cube = CubeMatrix("127.0.0.1", device.port, music_mode=False)
+            cube.update_leds(frame)
+            assert device.simulator.frames == [frame]
+
+    Args:
+        simulator: The simulator to run (a default one if omitted).
+    """
+
+    def __init__(self, simulator: Optional[CubeSimulator] = None) -> None:
+        self.simulator = simulator or CubeSimulator()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        """The port the simulator is listening on."""
+        return self.simulator.port
+
+    def start(self) -> None:
+        """Start the loop thread and the simulator."""
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="yeelight-matrix-simulator", daemon=True
+        )
+        self._thread.start()
+        self.call(self.simulator.start())
+
+    def stop(self) -> None:
+        """Stop the simulator and the loop thread."""
+        if self._loop is None:
+            return
+        self.call(self.simulator.stop())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = self._thread = None
+
+    def call(self, coro, timeout: float = 10.0) -> Any:
+        """Run a coroutine on the simulator's loop and return its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+    def __enter__(self) -> "SimulatorThread":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
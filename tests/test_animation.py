@@ -0,0 +1,165 @@
+"""Tests for frame-sequence playback."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from yeelight_matrix.animation import Animation, AnimationPlayer, PlaybackMode
+from yeelight_matrix.async_cube_matrix import AsyncCubeMatrix
+from yeelight_matrix.simulator import CubeSimulator
+
+
+class RecordingCube:
+    """Synchronous stand-in for CubeMatrix that timestamps every frame."""
+
+    def __init__(self, send_time=0.0):
+        self.send_time = send_time
+        self.frames = []
+        self.times = []
+
+    def update_leds(self, payload):
+        self.times.append(time.monotonic())
+        self.frames.append(payload)
+        if self.send_time:
+            time.sleep(self.send_time)
+
+
+@pytest.mark.parametrize(
+    "mode, loops, expected",
+    [
+        (PlaybackMode.ONCE, None, ["a", "b", "c"]),
+        (PlaybackMode.LOOP, 2, ["a", "b", "c", "a", "b", "c"]),
+        (PlaybackMode.PING_PONG, 2, ["a", "b", "c", "b", "a", "b", "c", "b"]),
+    ],
+)
+def test_playback_order(mode, loops, expected):
+    cube = RecordingCube()
+    AnimationPlayer(cube, Animation(["a", "b", "c"], 0.001), mode, loops=loops).play()
+    assert cube.frames == expected
+
+
+def test_generator_is_pulled_lazily_and_replayed():
+    pulled = []
+
+    def frames():
+        for name in "abc":
+            pulled.append(name)
+            yield name
+
+    animation = Animation(frames(), 0.001)
+    assert pulled == []
+    cube = RecordingCube()
+    AnimationPlayer(cube, animation, "loop", loops=2).play()
+    assert cube.frames == list("abcabc")
+    assert pulled == list("abc")
+
+
+def test_streaming_animation_cannot_loop():
+    with pytest.raises(ValueError):
+        AnimationPlayer(RecordingCube(), Animation(iter(["a"]), keep_frames=False), "loop")
+
+
+def test_per_frame_durations_without_drift():
+    # Each send takes 10 ms; deadlines are absolute, so that time is absorbed.
+    cube = RecordingCube(send_time=0.01)
+    durations = [0.02, 0.04, 0.02, 0.02, 0.02]
+    AnimationPlayer(cube, Animation(list("abcde"), durations)).play()
+    offsets = [t - cube.times[0] for t in cube.times]
+    expected = [0.0, 0.02, 0.06, 0.08, 0.10]
+    for offset, due in zip(offsets, expected):
+        assert due - 0.002 <= offset < due + 0.015
+
+
+def test_slow_sends_resynchronise_instead_of_bursting():
+    cube = RecordingCube(send_time=0.03)
+    player = AnimationPlayer(cube, Animation(list("abcd"), 0.01))
+    player.play()
+    assert cube.frames == list("abcd")
+    assert player.late_frames > 0
+    gaps = [b - a for a, b in zip(cube.times, cube.times[1:])]
+    assert min(gaps) >= 0.03
+
+
+def test_pause_resume_and_stop_from_another_thread():
+    cube = RecordingCube()
+    player = AnimationPlayer(cube, Animation(["a", "b"], 0.02), "loop")
+    thread = player.start()
+    time.sleep(0.05)
+    player.pause()
+    time.sleep(0.01)
+    sent = player.frames_played
+    time.sleep(0.08)
+    assert player.paused
+    assert player.frames_played == sent
+    player.resume()
+    time.sleep(0.05)
+    assert player.frames_played > sent
+    player.stop()
+    thread.join(1)
+    assert not thread.is_alive()
+    assert player.stopped
+
+
+def test_async_playback_on_simulator():
+    async def scenario():
+        async with CubeSimulator() as device:
+            async with AsyncCubeMatrix("127.0.0.1", device.port, music_mode=False) as cube:
+                player = AnimationPlayer(cube, Animation(["a", "b"], 0.01), "ping_pong", loops=2)
+                await player.async_play()
+                looping = AnimationPlayer(cube, Animation(["x"], 0.01), "loop")
+                task = asyncio.ensure_future(looping.async_play())
+                await asyncio.sleep(0.05)
+                threading.Thread(target=looping.stop).start()
+                await asyncio.wait_for(task, 1)
+            return device, looping
+
+    device, looping = asyncio.run(asyncio.wait_for(scenario(), 10))
+    assert device.frames[:4] == ["a", "b", "a", "b"]
+    assert looping.frames_played >= 2
+    assert device.frames[4:] == ["x"] * looping.frames_played
+
+
+def test_async_playback_decodes_off_loop_and_renders_on_it():
+    threads = {"source": set(), "render": set()}
+
+    def source():
+        for name in "abc":
+            threads["source"].add(threading.get_ident())
+            yield name, 0.001
+
+    def render(item):
+        threads["render"].add(threading.get_ident())
+        return item.upper()
+
+    class AsyncCube:
+        def __init__(self):
+            self.frames = []
+
+        async def update_leds(self, payload):
+            self.frames.append(payload)
+
+    cube = AsyncCube()
+    animation = Animation.from_frames(source(), render=render)
+    asyncio.run(AnimationPlayer(cube, animation, "loop", loops=2).async_play())
+    assert cube.frames == list("ABCABC")
+    assert threads["render"] == {threading.get_ident()}
+    assert threading.get_ident() not in threads["source"]
+
+
+def test_stop_before_start_prevents_playback():
+    cube = RecordingCube()
+    player = AnimationPlayer(cube, Animation(["a", "b"], 0.01), "loop")
+    player.stop()
+    player.play()
+    assert cube.frames == []
+
+    class AsyncCube:
+        async def update_leds(self, payload):
+            cube.frames.append(payload)
+
+    late = AnimationPlayer(AsyncCube(), Animation(["a", "b"], 0.01), "loop")
+    late.stop()
+    asyncio.run(asyncio.wait_for(late.async_play(), 1))
+    assert cube.frames == [] and late.frames_played == 0
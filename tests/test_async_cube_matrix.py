@@ -0,0 +1,164 @@
+"""Tests for the asyncio driver, run against the local device simulator."""
+
+import asyncio
+
+import pytest
+
+from yeelight_matrix.async_cube_matrix import AsyncCubeMatrix, ConnectionState
+from yeelight_matrix.color import encode_many
+from yeelight_matrix.exceptions import CubeMatrixError
+from yeelight_matrix.simulator import CubeSimulator
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 10))
+
+
+def test_commands_over_control_connection():
+    async def scenario():
+        async with CubeSimulator() as device:
+            cube = AsyncCubeMatrix("127.0.0.1", device.port, music_mode=False)
+            await cube.connect()
+            await cube.turn_on()
+            await cube.set_fx_mode("direct")
+            await cube.set_pixels(["#ff0000", "#00ff00"])
+            properties = await cube.get_properties()
+            await cube.close()
+            return device, properties
+
+    device, properties = run(scenario())
+    assert device.fx_mode == "direct"
+    assert device.frames == [encode_many(["#ff0000", "#00ff00"])]
+    assert properties["power"] == "on"
+
+
+def test_music_mode_uses_reverse_connection():
+    async def scenario():
+        async with CubeSimulator() as device:
+            async with AsyncCubeMatrix("127.0.0.1", device.port) as cube:
+                assert cube.music_mode
+                assert device.music_mode
+                for n in range(5):
+                    await cube.update_leds(f"frame{n}")
+                # Music-mode commands are not answered; wait for them to land.
+                for _ in range(100):
+                    if len(device.frames) == 5:
+                        break
+                    await asyncio.sleep(0.01)
+            return device
+
+    device = run(scenario())
+    assert device.frames == [f"frame{n}" for n in range(5)]
+    assert ("set_music", [1, "127.0.0.1", device.commands[0][1][2]]) in device.commands
+
+
+def test_device_error_raises():
+    async def scenario():
+        async with CubeSimulator() as device:
+            async with AsyncCubeMatrix("127.0.0.1", device.port, music_mode=False) as cube:
+                await cube.send_command("no_such_method")
+
+    with pytest.raises(CubeMatrixError):
+        run(scenario())
+
+
+def test_lazy_connection_reopens_after_drop():
+    async def scenario():
+        async with CubeSimulator() as device:
+            # Without connect() the connection is opened on demand, unsupervised.
+            cube = AsyncCubeMatrix("127.0.0.1", device.port, music_mode=False)
+            await cube.update_leds("a")
+            device.drop_connections()
+            for _ in range(100):
+                if not cube.connected:
+                    break
+                await asyncio.sleep(0.01)
+            await cube.update_leds("b")
+            await cube.close()
+            return device
+
+    assert run(scenario()).frames == ["a", "b"]
+
+
+def test_concurrent_first_commands_share_one_connection():
+    async def scenario():
+        async with CubeSimulator() as device:
+            cube = AsyncCubeMatrix("127.0.0.1", device.port, music_mode=False)
+            await asyncio.gather(cube.update_leds("a"), cube.turn_on())
+            await cube.close()
+            return device
+
+    device = run(scenario())
+    assert device.connections == 1
+    assert device.frames == ["a"]
+
+
+def test_unreachable_device_raises():
+    async def scenario():
+        server = await asyncio.start_server(lambda r, w: None, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        server.close()
+        await server.wait_closed()
+        await AsyncCubeMatrix("127.0.0.1", port, timeout=1).connect()
+
+    with pytest.raises(CubeMatrixError):
+        run(scenario())
+
+
+async def _wait_for(predicate, timeout=5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+def test_music_session_reconnects_and_replays_last_frame():
+    async def scenario():
+        async with CubeSimulator() as device:
+            cube = AsyncCubeMatrix("127.0.0.1", device.port, reconnect_delay=0.01)
+            await cube.connect()
+            await cube.update_leds("frame")
+            await _wait_for(lambda: device.frames == ["frame"])
+
+            device.drop_connections()
+            await _wait_for(lambda: cube.state is ConnectionState.CONNECTING)
+            await _wait_for(lambda: cube.state is ConnectionState.MUSIC)
+            await _wait_for(lambda: device.frames == ["frame", "frame"])
+            await _wait_for(lambda: cube.reconnects == 1)
+            reconnects = cube.reconnects
+            await cube.close()
+            return reconnects, device
+
+    reconnects, device = run(scenario())
+    assert reconnects == 1
+    assert [method for method, _ in device.commands].count("set_music") == 2
+
+
+def test_reconnect_backs_off_until_device_returns():
+    async def scenario():
+        device = CubeSimulator()
+        await device.start()
+        cube = AsyncCubeMatrix(
+            "127.0.0.1", device.port, timeout=1, reconnect_delay=0.01, max_reconnect_delay=0.05
+        )
+        await cube.connect()
+        await device.stop()
+        await _wait_for(lambda: cube.state is ConnectionState.CONNECTING)
+
+        # Commands fail fast while the session is being re-established, but the
+        # frame is still remembered for the replay.
+        with pytest.raises(CubeMatrixError):
+            await cube.update_leds("latest")
+        await asyncio.sleep(0.1)
+        assert cube.last_error
+
+        await device.start()
+        await _wait_for(lambda: cube.state is ConnectionState.MUSIC)
+        await _wait_for(lambda: device.frames == ["latest"])
+        await cube.close()
+        await device.stop()
+        return cube
+
+    cube = run(scenario())
+    assert cube.state is ConnectionState.DISCONNECTED
+    assert cube.latency is not None
@@ -1,10 +1,22 @@
 """Tests for colour parsing and encoding."""
 
 import base64
+import random
 
 import pytest
 
-from yeelight_matrix.color import encode, encode_many, to_hex, to_rgb
+from yeelight_matrix.color import (
+    clear_color_cache,
+    color_cache_info,
+    decode_rle,
+    encode,
+    encode_many,
+    encode_rle,
+    encode_rgb,
+    to_hex,
+    to_rgb,
+    to_rgb_bytes,
+)
 
 
 @pytest.mark.parametrize(
@@ -38,3 +50,57 @@ def test_encode_matches_base64():
 
 def test_encode_many_concatenates():
     assert encode_many(["#010203", "#040506"]) == encode("#010203") + encode("#040506")
+
+
+def test_encode_many_single_pass_matches_per_led_encoding():
+    # Property check: for random colour sequences of every length the one-shot
+    # encoding is byte-identical to concatenating per-LED encodings.
+    rng = random.Random(0)
+    for length in list(range(8)) + [25, 26, 150, 151]:
+        for _ in range(20):
+            colors = [
+                (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+                if rng.random() < 0.5
+                else f"#{rng.randrange(1 << 24):06x}"
+                for _ in range(length)
+            ]
+            assert encode_many(colors) == "".join(encode(c) for c in colors)
+
+
+def test_encode_rgb_matches_encode_many():
+    assert encode_rgb(bytes([1, 2, 3, 4, 5, 6])) == encode_many(["#010203", "#040506"])
+
+
+def test_color_cache_counts_repeated_colours():
+    clear_color_cache()
+    for _ in range(10):
+        assert to_rgb("#123456") == (18, 52, 86)
+        assert to_hex("#123456") == "#123456"
+        assert to_rgb_bytes("#123456") == bytes((18, 52, 86))
+    info = color_cache_info()
+    assert (info.misses, info.hits, info.entries) == (1, 29, 1)
+    assert info.hit_rate == pytest.approx(29 / 30)
+    clear_color_cache()
+    assert color_cache_info().hit_rate == 0.0
+
+
+def test_color_cache_does_not_keep_failures():
+    clear_color_cache()
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            to_rgb("#zzzzzz")
+    with pytest.raises(ValueError):
+        to_rgb({"r": 1})  # unhashable
+    assert color_cache_info().entries == 0
+
+
+def test_rle_round_trip():
+    rgb = b"\x01\x02\x03" * 300 + b"\xff\x00\x00" + b"\x01\x02\x03"
+    runs = encode_rle(rgb)
+    assert runs == b"\xff\x01\x02\x03" + b"\x2d\x01\x02\x03" + b"\x01\xff\x00\x00\x01\x01\x02\x03"
+    assert decode_rle(runs) == rgb
+    assert encode_rle(b"") == decode_rle(b"") == b""
+    with pytest.raises(ValueError):
+        decode_rle(b"\x01\x02")
+    with pytest.raises(ValueError):
+        encode_rle(b"\x01\x02")
@@ -0,0 +1,88 @@
+"""Tests for the DDP realtime frame receiver."""
+
+import asyncio
+import socket
+import struct
+
+import pytest
+
+from yeelight_matrix.ddp import (
+    FLAG_TIMECODE,
+    FLAG_VERSION_1,
+    DdpReceiver,
+    build_packet,
+    create_ddp_endpoint,
+    parse_packet,
+)
+from yeelight_matrix.layout import Layout
+
+
+def test_parse_round_trip_and_timecode():
+    packet = parse_packet(build_packet(b"\x01\x02\x03", offset=6, sequence=17))
+    assert (packet.offset, packet.data, packet.sequence) == (6, b"\x01\x02\x03", 1)
+    assert packet.push
+
+    header = struct.pack(">BBBBIH", FLAG_VERSION_1 | FLAG_TIMECODE, 0, 1, 1, 0, 3)
+    assert parse_packet(header + b"\x00" * 4 + b"abc").data == b"abc"
+
+
+@pytest.mark.parametrize(
+    "packet",
+    [b"\x41\x00", build_packet(b"abc")[:-1], b"\x81" + build_packet(b"abc")[1:]],
+)
+def test_parse_rejects_bad_packets(packet):
+    with pytest.raises(ValueError):
+        parse_packet(packet)
+
+
+def test_receiver_assembles_split_frames():
+    frames = []
+    receiver = DdpReceiver(6, frames.append)
+    receiver.datagram_received(build_packet(b"abc", push=False), ("sender", 1))
+    assert frames == []
+    receiver.datagram_received(build_packet(b"def", offset=3, push=False), ("sender", 1))
+    receiver.datagram_received(build_packet(b"xy", offset=0), ("sender", 1))
+    receiver.datagram_received(b"garbage", ("sender", 1))
+    receiver.datagram_received(build_packet(b"zzzzzzzz", offset=4), ("sender", 1))
+    assert frames == [b"abcdef", b"xycdef", b"xycdzz"]
+    assert (receiver.packets, receiver.frames, receiver.errors) == (4, 3, 1)
+
+
+def test_paused_receiver_holds_back_frames():
+    frames = []
+    receiver = DdpReceiver(3, frames.append)
+    receiver.paused = True
+    receiver.datagram_received(build_packet(b"abc"), ("sender", 1))
+    assert frames == [] and receiver.frames == 0
+    receiver.paused = False
+    receiver.datagram_received(build_packet(b"d", offset=2), ("sender", 1))
+    assert frames == [b"abd"]
+
+
+def test_layout_set_rgb_uses_logical_order():
+    layout = Layout("vertical", "bottom", ["5x5_clear", "1x1"])
+    layout.render_frame()
+    layout.set_rgb(b"\xff\x00\x00" * 25 + b"\x00\x00\xff")
+    assert layout.modules[0].colors == ["#ff0000"] * 25
+    assert layout.modules[1].colors == ["#0000ff"]
+    assert all(module.used for module in layout.modules)
+
+    layout.render_frame()
+    layout.set_rgb(b"\xff\x00\x00" * 25 + b"\x00\xff\x00")
+    assert [module.dirty for module in layout.modules] == [False, True]
+    with pytest.raises(ValueError):
+        layout.set_rgb(b"\x00" * 3)
+
+
+def test_udp_endpoint_delivers_frames():
+    async def run():
+        received = asyncio.Queue()
+        transport, _ = await create_ddp_endpoint(6, received.put_nowait, "127.0.0.1", 0)
+        port = transport.get_extra_info("sockname")[1]
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sender:
+            sender.sendto(build_packet(b"\x01\x02\x03\x04\x05\x06"), ("127.0.0.1", port))
+            frame = await asyncio.wait_for(received.get(), 2)
+        transport.close()
+        return frame
+
+    assert asyncio.run(run()) == b"\x01\x02\x03\x04\x05\x06"
@@ -0,0 +1,64 @@
+"""Tests for the procedural effects."""
+
+import numpy as np
+import pytest
+
+from yeelight_matrix.effects import EFFECTS, Breathing, Fire, RainbowScroll, effect_animation
+from yeelight_matrix.layout import Layout
+
+
+_RANDOM = ["fire", "matrix_rain", "sparkle"]
+
+
+@pytest.mark.parametrize("name", sorted(EFFECTS))
+@pytest.mark.parametrize("size", [(5, 15), (20, 5)])
+def test_effects_render_full_canvas_frames(name, size):
+    effect = EFFECTS[name](size, **({"seed": 0} if name in _RANDOM else {}))
+    frames = [effect.render(n / 30) for n in range(60)]
+    for frame in frames:
+        assert frame.shape == (size[1], size[0], 3)
+        assert frame.dtype == np.uint8
+    # Every effect changes over two seconds.
+    assert any(not np.array_equal(frames[0], frame) for frame in frames[1:])
+
+
+@pytest.mark.parametrize("name", _RANDOM)
+def test_random_effects_are_reproducible_with_a_seed(name):
+    first, second = EFFECTS[name]((5, 10), seed=3), EFFECTS[name]((5, 10), seed=3)
+    for n in range(20):
+        assert np.array_equal(first.render(n / 30), second.render(n / 30))
+
+
+def test_rainbow_spans_the_stack_seamlessly():
+    frame = RainbowScroll((5, 20), spread=1.0).render(0.0).astype(int)
+    # Rows change gradually across module boundaries (rows 4 -> 5 etc.).
+    steps = np.abs(np.diff(frame[:, 0], axis=0)).max(axis=1)
+    assert steps.max() < 100
+    assert np.array_equal(frame[:, 0], frame[:, 4])
+
+
+def test_breathing_fades_in_and_out():
+    effect = Breathing((5, 5), color="#ff0000", period=2.0)
+    assert effect.render(0.0).max() == 0
+    assert tuple(effect.render(1.0)[0, 0]) == (255, 0, 0)
+
+
+def test_fire_rises_from_the_bottom():
+    effect = Fire((5, 20), seed=1)
+    for n in range(10):
+        frame = effect.render(n / 30)
+    assert frame[-5:].sum() > frame[:5].sum()
+
+
+def test_effect_animation_streams_layout_frames():
+    layout = Layout("vertical", "bottom", ["5x5_clear", "5x5_clear", "1x1"])
+    effect = RainbowScroll(layout.canvas_size)
+    animation = effect_animation(layout, effect, fps=10, duration=0.5)
+    frames = list(animation.forward())
+    assert len(frames) == 5
+    assert all(duration == pytest.approx(0.1) for _, duration in frames)
+    assert not animation.keep_frames and animation.frames == []
+
+    expected = Layout("vertical", "bottom", ["5x5_clear", "5x5_clear", "1x1"])
+    expected.set_canvas(RainbowScroll(layout.canvas_size).render(0.4))
+    assert frames[-1][0] == expected.render_frame()
@@ -0,0 +1,72 @@
+"""Tests for driving several cubes as one display."""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from yeelight_matrix.animation import AnimationPlayer
+from yeelight_matrix.async_cube_matrix import AsyncCubeMatrix
+from yeelight_matrix.effects import RainbowScroll, effect_animation
+from yeelight_matrix.group import CubeGroup
+from yeelight_matrix.layout import Layout
+from yeelight_matrix.simulator import CubeSimulator
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 10))
+
+
+def test_canvas_is_split_across_members():
+    left = Layout("horizontal", "left", ["5x5_clear", "5x5_clear"])
+    right = Layout("vertical", "bottom", ["5x5_clear"])
+    group = CubeGroup([(None, left), (None, right)], "horizontal")
+    assert group.canvas_size == (15, 5)
+
+    canvas = np.random.default_rng(0).integers(0, 256, (5, 15, 3), dtype=np.uint8)
+    group.set_canvas(canvas)
+    expected_left = Layout("horizontal", "left", ["5x5_clear", "5x5_clear"])
+    expected_left.set_canvas(canvas[:, :10])
+    expected_right = Layout("vertical", "bottom", ["5x5_clear"])
+    expected_right.set_canvas(canvas[:, 10:])
+    assert group.render_frame() == [expected_left.render_frame(), expected_right.render_frame()]
+
+    with pytest.raises(ValueError):
+        group.set_canvas(np.zeros((15, 5, 3)))
+
+
+def test_vertical_group_pads_narrow_members():
+    tall = Layout("vertical", "top", ["5x5_clear", "5x5_clear"])
+    wide = Layout("horizontal", "left", ["5x5_clear", "5x5_clear"])
+    group = CubeGroup([(None, tall), (None, wide)], "vertical")
+    assert group.canvas_size == (10, 15)
+    group.set_canvas(np.full((15, 10, 3), 7, dtype=np.uint8))
+    assert set(wide.frame.tobytes()) == {7}
+
+
+def test_frames_are_pushed_to_every_device_concurrently():
+    async def scenario():
+        async with CubeSimulator() as first, CubeSimulator() as second:
+            members = [
+                (
+                    AsyncCubeMatrix("127.0.0.1", device.port, music_mode=False),
+                    Layout("vertical", "top", ["5x5_clear"]),
+                )
+                for device in (first, second)
+            ]
+            async with CubeGroup(members, "horizontal") as group:
+                await group.set_fx_mode()
+                effect = RainbowScroll(group.canvas_size)
+                animation = effect_animation(group, effect, fps=50, duration=0.1)
+                await AnimationPlayer(group, animation).async_play()
+                frames = group.render_frame()
+            return first, second, group, frames
+
+    first, second, group, frames = run(scenario())
+    assert first.fx_mode == second.fx_mode == "direct"
+    assert len(first.frames) == len(second.frames) == 5
+    assert [first.last_frame, second.last_frame] == frames
+    assert first.last_frame != second.last_frame
+    stats = group.stats()
+    assert stats.frames == 5
+    assert 0 <= stats.mean_skew <= stats.max_skew < 0.5
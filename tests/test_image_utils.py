@@ -0,0 +1,105 @@
+"""Tests for the image and rotation helpers."""
+
+import io
+
+import pytest
+from PIL import Image
+
+from yeelight_matrix.animation import DEFAULT_FRAME_DURATION
+from yeelight_matrix.enums import Orientation
+from yeelight_matrix.image_utils import (
+    ImageCache,
+    image_to_hex,
+    iter_image_frames,
+    load_image_grids,
+    load_image_tiles,
+    rotation_table,
+)
+
+
+@pytest.mark.parametrize("degrees", [0, 90, 180, 270])
+def test_rotation_table_matches_pil(degrees):
+    img = Image.new("RGB", (5, 5))
+    img.putdata([(i, 0, 0) for i in range(25)])
+    rotated = img.rotate(degrees).tobytes()[0::3]
+    assert rotation_table(degrees, 5) == tuple(rotated)
+
+
+def test_rotation_table_rejects_odd_angles():
+    with pytest.raises(ValueError):
+        rotation_table(45, 5)
+
+
+@pytest.mark.parametrize("orientation", list(Orientation))
+def test_load_image_tiles_matches_cropping(tmp_path, orientation):
+    path = tmp_path / "art.png"
+    source = Image.new("RGB", (7, 13))
+    source.putdata([(i, 255 - i, (i * 7) % 256) for i in range(7 * 13)])
+    source.save(path)
+
+    tiles = load_image_tiles(str(path), 3, orientation)
+    assert tiles.shape == (3, 5, 5, 3)
+
+    size = (5, 15) if orientation is Orientation.VERTICAL else (15, 5)
+    resized = source.resize(size, Image.Resampling.LANCZOS)
+    for i, tile in enumerate(tiles):
+        if orientation is Orientation.VERTICAL:
+            box = (0, i * 5, 5, (i + 1) * 5)
+        else:
+            box = (i * 5, 0, (i + 1) * 5, 5)
+        assert tile.tobytes() == resized.crop(box).tobytes()
+    assert load_image_grids(str(path), 3, orientation)[1] == image_to_hex(resized.crop(
+        (0, 5, 5, 10) if orientation is Orientation.VERTICAL else (5, 0, 10, 5)
+    ))
+
+
+def _save_image(path, color):
+    Image.new("RGB", (10, 10), color).save(path)
+    return str(path)
+
+
+def test_load_image_tiles_hits_cache_by_content(tmp_path):
+    cache = ImageCache()
+    first = _save_image(tmp_path / "a.png", (255, 0, 0))
+    copy = _save_image(tmp_path / "b.png", (255, 0, 0))
+
+    tiles = load_image_tiles(first, 2, Orientation.VERTICAL, cache=cache)
+    assert load_image_tiles(copy, 2, Orientation.VERTICAL, cache=cache) is tiles
+    assert not tiles.flags.writeable
+    # A different geometry is a different entry.
+    load_image_tiles(first, 2, Orientation.HORIZONTAL, cache=cache)
+
+    info = cache.info()
+    assert (info.hits, info.misses, info.entries) == (1, 2, 2)
+    assert info.size == 2 * tiles.nbytes
+
+
+def test_image_cache_evicts_least_recently_used(tmp_path):
+    tile_bytes = 2 * 5 * 5 * 3
+    cache = ImageCache(max_size=2 * tile_bytes)
+    paths = [_save_image(tmp_path / f"{n}.png", (n, n, n)) for n in range(3)]
+
+    load_image_tiles(paths[0], 2, Orientation.VERTICAL, cache=cache)
+    load_image_tiles(paths[1], 2, Orientation.VERTICAL, cache=cache)
+    load_image_tiles(paths[0], 2, Orientation.VERTICAL, cache=cache)  # refresh 0
+    load_image_tiles(paths[2], 2, Orientation.VERTICAL, cache=cache)  # evicts 1
+    load_image_tiles(paths[0], 2, Orientation.VERTICAL, cache=cache)
+
+    info = cache.info()
+    assert (info.hits, info.evictions, info.entries) == (2, 1, 2)
+    assert info.size <= info.max_size
+
+
+def test_iter_image_frames_yields_tiles_and_delays():
+    frames = [Image.new("RGB", (10, 5), color) for color in ("red", "blue")]
+    data = io.BytesIO()
+    frames[0].save(data, "PNG", save_all=True, append_images=frames[1:], duration=[40, 0])
+    result = list(iter_image_frames(data.getvalue(), 2, Orientation.HORIZONTAL))
+    assert len(result) == 2
+    assert result[0][0].shape == (2, 5, 5, 3)
+    assert tuple(result[0][0][1, 0, 0]) == (255, 0, 0)
+    assert tuple(result[1][0][0, 4, 4]) == (0, 0, 255)
+    assert [duration for _, duration in result] == [0.04, DEFAULT_FRAME_DURATION]
+
+    still = list(iter_image_frames(Image.new("RGB", (5, 5)), 1, Orientation.VERTICAL))
+    assert len(still) == 1
@@ -0,0 +1,81 @@
+"""Tests for the frame change journal."""
+
+from yeelight_matrix.journal import FrameJournal
+from yeelight_matrix.layout import Layout
+
+
+def test_commit_records_only_changed_dots():
+    layout = Layout("vertical", "bottom", ["5x5_clear", "1x1"])
+    journal = FrameJournal(layout)
+    assert journal.commit() is None
+    assert journal.snapshot() == (0, [["#000000"] * 25, ["#000000"]])
+
+    layout.set_pixel(0, 3, 1, "#ff0000")
+    layout.set_module_colors(1, "#00ff00")
+    assert journal.commit() == (1, [(0, 3, 1, "#ff0000"), (1, 0, 0, "#00ff00")])
+
+    layout.set_module_colors(1, "#00ff00")  # rewritten, but unchanged
+    assert journal.commit() is None
+    assert journal.sequence == 1
+    sequence, modules = journal.snapshot()
+    assert sequence == 1 and modules[0][8] == "#ff0000"
+
+
+def test_changes_since_merges_and_expires():
+    layout = Layout("horizontal", "left", ["5x5_clear"])
+    journal = FrameJournal(layout, history=3)
+    for n in range(1, 5):
+        layout.set_pixel(0, 0, 0, f"#0000{n:02x}")
+        layout.set_pixel(0, n, 0, "#ffffff")
+        journal.commit()
+
+    assert journal.sequence == 4
+    assert journal.changes_since(4) == []
+    assert sorted(journal.changes_since(2)) == [
+        (0, 0, 0, "#000004"),
+        (0, 3, 0, "#ffffff"),
+        (0, 4, 0, "#ffffff"),
+    ]
+    assert journal.changes_since(1) is not None
+    assert journal.changes_since(0) is None  # older than the history kept
+    assert journal.changes_since(5) is None
+    assert journal.changes_since(2, journal.session) is not None
+    assert journal.changes_since(2, FrameJournal(layout).session) is None
+
+
+def test_module_changes_reset_history():
+    layout = Layout("vertical", "top", ["5x5_clear"])
+    journal = FrameJournal(layout)
+    layout.fill("#010101")
+    journal.commit()
+    layout.add_module("1x1")
+    sequence, changes = journal.commit()
+    assert sequence == 2 and len(changes) == 26
+    assert journal.changes_since(1) is None
+    assert journal.changes_since(2) == []
+
+
+def test_dot_listeners_hear_only_their_changed_dot():
+    layout = Layout("vertical", "bottom", ["5x5_clear", "1x1"])
+    journal = FrameJournal(layout)
+    heard = {}
+
+    def listener(dot):
+        return lambda color: heard.setdefault(dot, []).append(color)
+
+    dots = [(0, x, y) for y in range(5) for x in range(5)] + [(1, 0, 0)]
+    removers = {dot: journal.add_dot_listener(*dot, listener(dot)) for dot in dots}
+
+    layout.set_pixel(0, 3, 1, "#ff0000")
+    journal.commit()
+    assert heard == {(0, 3, 1): ["#ff0000"]}
+
+    layout.set_pixel(0, 3, 1, "#ff0000")  # same colour: nobody is called
+    layout.set_module_colors(1, "#00ff00")
+    journal.commit()
+    assert heard == {(0, 3, 1): ["#ff0000"], (1, 0, 0): ["#00ff00"]}
+
+    removers[(1, 0, 0)]()
+    layout.set_module_colors(1, "#0000ff")
+    journal.commit()
+    assert heard[(1, 0, 0)] == ["#00ff00"]
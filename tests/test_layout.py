@@ -1,11 +1,20 @@
 """Tests for layout rendering and addressing."""
 
+import io
+import os
+
+import numpy as np
 import pytest
+from PIL import Image
 
+from yeelight_matrix.color import encode
 from yeelight_matrix.enums import BasePosition, Orientation
 from yeelight_matrix.exceptions import LayoutError
+from yeelight_matrix.image_utils import load_image_tiles, rotate_grid
 from yeelight_matrix.layout import Layout
 
+_ORIENTATIONS = [("vertical", "top"), ("vertical", "bottom"), ("horizontal", "left"), ("horizontal", "right")]
+
 
 def test_modules_logical_order_independent_of_base():
     types = ["5x5_clear", "5x5_blur", "1x1"]
@@ -37,11 +46,41 @@ def test_render_frame_length():
 
 def test_set_pixel_then_render_is_stable():
     layout = Layout("vertical", "top", ["5x5_clear"])
-    layout.set_pixel(2, 2, "#ff0000")
+    layout.set_pixel(0, 2, 2, "#ff0000")
     frame = layout.render_frame()
     assert isinstance(frame, str) and len(frame) == 25 * 4
 
 
+def test_modules_are_views_into_frame_buffer():
+    layout = Layout("vertical", "top", ["5x5_clear", "1x1"])
+    layout.set_pixel(0, 1, 0, "#010203")
+    layout.set_module_colors(1, "#aabbcc")
+    assert layout.frame[3:6].tobytes() == bytes([1, 2, 3])
+    assert layout.frame[75:78].tobytes() == bytes([0xAA, 0xBB, 0xCC])
+
+
+def test_add_module_keeps_existing_colours():
+    layout = Layout("vertical", "bottom", ["5x5_clear"])
+    layout.set_pixel(0, 4, 4, "#00ff00")
+    layout.add_module("1x1")
+    assert layout.module_at(0).get_pixel(4, 4) == "#00ff00"
+    assert len(layout.frame) == 26 * 3
+
+
+@pytest.mark.parametrize("orientation,base", _ORIENTATIONS)
+def test_render_frame_matches_per_led_encoding(orientation, base):
+    layout = Layout(orientation, base, ["5x5_clear", "1x1", "5x5_blur"])
+    for i, module in enumerate(layout.modules):
+        module.set_grid([f"#{i:02x}{n:02x}{n * 3:02x}" for n in range(module.led_count)])
+
+    expected = ""
+    for module in layout.modules:
+        colors = rotate_grid(module.colors, layout.rotation, module.width) if module.is_matrix \
+            else module.colors
+        expected += "".join(encode(color) for color in colors)
+    assert layout.render_frame() == expected
+
+
 def test_invalid_base_for_orientation():
     with pytest.raises(LayoutError):
         Layout("vertical", "left", ["5x5_clear"])
@@ -51,3 +90,200 @@ def test_set_image_requires_free_clear_module(tmp_path):
     layout = Layout("vertical", "top", ["1x1"])
     with pytest.raises(LayoutError):
         layout.set_image("does_not_matter.png", 0, 1)
+
+
+def test_render_only_reencodes_dirty_modules():
+    layout = Layout("vertical", "bottom", ["5x5_clear", "5x5_clear", "1x1"])
+    first = layout.render_frame()
+    assert not any(module.dirty for module in layout.modules)
+
+    layout.set_pixel(1, 0, 0, "#ffffff")
+    assert [module.dirty for module in layout.modules] == [False, True, False]
+    second = layout.render_frame()
+    assert second != first
+    assert second[:100] == first[:100] and second[200:] == first[200:]
+
+    layout.clear()
+    assert layout.render_frame() == first
+
+
+def test_set_image_accepts_bytes_file_objects_and_pil_images():
+    path = os.path.join(os.path.dirname(__file__), "..", "examples", "assets", "art.png")
+    with open(path, "rb") as handle:
+        data = handle.read()
+
+    frames = []
+    for source in (path, data, io.BytesIO(data), Image.open(path)):
+        layout = Layout("vertical", "bottom", ["5x5_clear", "5x5_clear"])
+        layout.set_image(source, 0, 2)
+        frames.append(layout.render_frame())
+    assert len(set(frames)) == 1
+
+
+@pytest.mark.parametrize("orientation, base", _ORIENTATIONS)
+def test_set_image_in_steps_matches_set_image(orientation, base):
+    path = os.path.join(os.path.dirname(__file__), "..", "examples", "assets", "art.png")
+    modules = ["5x5_clear", "1x1", "5x5_clear", "5x5_clear"]
+    layout = Layout(orientation, base, modules)
+    targets = layout.image_modules(0, 2)
+    assert targets and all(module.is_matrix for module in targets)
+    layout.set_image_tiles(targets, load_image_tiles(path, len(targets), layout.orientation))
+
+    expected = Layout(orientation, base, modules)
+    expected.set_image(path, 0, 2)
+    assert layout.render_frame() == expected.render_frame()
+
+
+def test_load_animation_plays_every_gif_frame():
+    colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255)]
+    images = [Image.new("RGB", (5, 10), color) for color in colors]
+    data = io.BytesIO()
+    images[0].save(data, "GIF", save_all=True, append_images=images[1:], duration=[50, 120, 80])
+
+    layout = Layout("vertical", "bottom", ["5x5_clear", "5x5_clear", "1x1"])
+    animation = layout.load_animation(data.getvalue(), 0, 2)
+    # The modules are claimed immediately; frames are decoded on demand.
+    with pytest.raises(LayoutError):
+        layout.set_image(data.getvalue(), 0, 2)
+    assert animation.frames == []
+
+    frames = animation.render_ahead().frames
+    assert [duration for _, duration in frames] == [0.05, 0.12, 0.08]
+    for (payload, _), image in zip(frames, images):
+        expected = Layout("vertical", "bottom", ["5x5_clear", "5x5_clear", "1x1"])
+        expected.set_image(image, 0, 2)
+        assert payload == expected.render_frame()
+
+
+@pytest.mark.parametrize("orientation, base", _ORIENTATIONS)
+def test_set_canvas_matches_set_image(orientation, base):
+    modules = ["5x5_clear", "5x5_clear", "5x5_clear"]
+    layout = Layout(orientation, base, modules)
+    width, height = layout.canvas_size
+    assert sorted((width, height)) == [5, 15]
+    canvas = np.random.default_rng(1).integers(0, 256, (height, width, 3), dtype=np.uint8)
+    layout.set_canvas(canvas)
+
+    expected = Layout(orientation, base, modules)
+    expected.set_image(Image.fromarray(canvas), 0, 3)
+    assert layout.render_frame() == expected.render_frame()
+
+
+def test_set_canvas_spotlight_takes_centre_and_checks_shape():
+    layout = Layout("vertical", "top", ["5x5_clear", "1x1"])
+    canvas = np.zeros((10, 5, 3), dtype=np.uint8)
+    canvas[7, 2] = (1, 2, 3)
+    layout.set_canvas(canvas)
+    assert layout.modules[1].colors == ["#010203"]
+    with pytest.raises(ValueError):
+        layout.set_canvas(np.zeros((5, 10, 3)))
+
+
+def _canvas_to_module(layout, x, y):
+    """Reference mapping of a canvas position to (logical module, x, y)."""
+    if layout.orientation.value == "vertical":
+        storage, local_x, local_y = y // 5, x, y % 5
+    else:
+        storage, local_x, local_y = x // 5, x % 5, y
+    logical = len(layout) - 1 - storage if layout._flipped else storage
+    return logical, local_x, local_y
+
+
+@pytest.mark.parametrize("orientation, base", _ORIENTATIONS)
+def test_canvas_primitives_match_per_dot_edits(orientation, base):
+    modules = ["5x5_clear", "5x5_blur", "5x5_clear"]
+    layout = Layout(orientation, base, modules)
+    expected = Layout(orientation, base, modules)
+    width, height = layout.canvas_size
+
+    rect = (1, 3, 4, 9) if height > width else (3, 1, 9, 4)
+    layout.fill_rect(*rect, "#102030")
+    for x in range(rect[0], rect[0] + rect[2]):
+        for y in range(rect[1], rect[1] + rect[3]):
+            expected.set_pixel(*_canvas_to_module(expected, x, y), "#102030")
+
+    layout.draw_line(0, 0, width - 1, height - 1, "#ff0000")
+    steps = max(width, height) - 1
+    for i in range(steps + 1):
+        x, y = round(i * (width - 1) / steps), round(i * (height - 1) / steps)
+        expected.set_pixel(*_canvas_to_module(expected, x, y), "#ff0000")
+
+    assert layout.render_frame() == expected.render_frame()
+    assert layout.get_canvas_pixel(0, 0) == "#ff0000"
+    assert layout.get_canvas()[0, 0].tolist() == [255, 0, 0]
+
+
+def test_blit_clips_and_marks_only_touched_modules_dirty():
+    layout = Layout("vertical", "top", ["5x5_clear", "5x5_clear", "5x5_clear"])
+    layout.render_frame()
+    patch = np.full((4, 8, 3), 9, dtype=np.uint8)
+    layout.blit(patch, x=2, y=-2)
+    assert [module.dirty for module in layout.modules] == [True, False, False]
+    canvas = layout.get_canvas()
+    assert (canvas[0:2, 2:5] == 9).all()
+    assert (canvas[0:2, 0:2] == 0).all() and (canvas[2:] == 0).all()
+    with pytest.raises(ValueError):
+        layout.blit(np.zeros((2, 2)))
+
+
+def test_shift_scrolls_with_fill_or_wrap():
+    layout = Layout("horizontal", "left", ["5x5_clear", "5x5_clear"])
+    canvas = np.random.default_rng(2).integers(0, 256, (5, 10, 3), dtype=np.uint8)
+    layout.set_canvas(canvas)
+
+    layout.shift(-3, 0, wrap=True)
+    assert np.array_equal(layout.get_canvas(), np.roll(canvas, -3, axis=1))
+
+    layout.set_canvas(canvas)
+    layout.shift(2, 1, fill="#010101")
+    shifted = layout.get_canvas()
+    assert np.array_equal(shifted[1:, 2:], canvas[:-1, :-2])
+    assert (shifted[0] == 1).all() and (shifted[:, :2] == 1).all()
+
+
+def test_canvas_spotlight_block_uses_its_centre():
+    layout = Layout("vertical", "bottom", ["5x5_clear", "1x1"])
+    # Bottom base: the spotlight (logical 1) is the top block of the canvas.
+    layout.fill_rect(0, 0, 5, 2, "#00ff00")
+    assert layout.module_at(1).colors == ["#000000"]
+    layout.set_canvas_pixel(2, 2, "#00ff00")
+    assert layout.module_at(1).colors == ["#00ff00"]
+    assert layout.get_canvas_pixel(4, 4) == "#00ff00"
+    layout.draw_line(0, 0, 4, 4, "#0000ff")
+    assert layout.module_at(1).colors == ["#0000ff"]
+    with pytest.raises(LayoutError):
+        layout.get_canvas_pixel(5, 0)
+
+
+def test_set_rgb_from_start_module_and_set_pixels():
+    layout = Layout("horizontal", "right", ["5x5_clear", "5x5_clear", "1x1"])
+    layout.set_rgb(b"\x00\x00\xff" * 25 + b"\xff\x00\x00", start_module=1)
+    assert [module.used for module in layout.modules] == [False, True, True]
+    assert layout.modules[1].colors == ["#0000ff"] * 25
+    assert layout.modules[2].colors == ["#ff0000"]
+    with pytest.raises(ValueError):
+        layout.set_rgb(b"\x00" * 30, start_module=1)
+    with pytest.raises(LayoutError):
+        layout.set_rgb(b"\x00" * 3, start_module=3)
+
+    layout.set_pixels([(0, 1, 2, "#00ff00"), (2, 0, 0, "#ffffff")])
+    assert layout.modules[0].get_pixel(1, 2) == "#00ff00"
+    assert layout.modules[2].colors == ["#ffffff"]
+
+
+def test_modules_view_is_shared_and_colors_follow_canvas_writes():
+    layout = Layout("vertical", "bottom", ["5x5_clear", "5x5_clear"])
+    modules = layout.modules
+    assert layout.modules is modules
+    assert isinstance(modules, tuple)
+    assert modules[0] is layout.module_at(0)
+
+    before = [module.colors for module in modules]
+    layout.fill_rect(0, 0, 1, 1, "#ff0000")
+    after = [module.colors for module in modules]
+    changed = [a is not b for a, b in zip(after, before)]
+    assert changed.count(True) == 1
+    assert any("#ff0000" in colors for colors in after)
+
+    layout.add_module("1x1")
+    assert len(layout.modules) == 3 and layout.modules is not modules
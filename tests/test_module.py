@@ -47,3 +47,39 @@ def test_fill_and_clear():
     m.clear()
     assert m.colors == ["#000000"] * 25
     assert m.used is False
+
+
+def test_rgb_is_packed_row_major():
+    m = Module(ModuleType.CLEAR)
+    m.set_pixel(1, 0, (1, 2, 3))
+    assert m.rgb[3:6].tobytes() == bytes([1, 2, 3])
+    assert len(m.rgb) == 75
+
+
+def test_set_rgb_validates_length():
+    m = Module(ModuleType.CLEAR)
+    m.set_rgb(bytes(range(75)))
+    assert m.get_pixel(0, 0) == "#000102"
+    assert m.used is True
+    with pytest.raises(ValueError):
+        m.set_rgb(bytes(3))
+
+
+def test_colors_are_shared_read_only_until_changed():
+    import copy
+    import json
+
+    m = Module(ModuleType.CLEAR)
+    colors = m.colors
+    assert m.colors is colors
+    assert colors == ["#000000"] * 25
+    with pytest.raises(TypeError):
+        colors[0] = "#ffffff"
+    with pytest.raises(TypeError):
+        colors.append("#ffffff")
+    assert json.loads(json.dumps(colors)) == colors
+    assert copy.deepcopy(colors) == colors
+
+    m.set_pixel(0, 0, "#ffffff")
+    assert m.colors is not colors
+    assert m.colors[0] == "#ffffff" and colors[0] == "#000000"
@@ -0,0 +1,119 @@
+"""Tests for palette-indexed colours."""
+
+import pytest
+
+from yeelight_matrix.layout import Layout
+from yeelight_matrix.module import Module
+from yeelight_matrix.palette import MAX_PALETTE_SIZE, Palette
+
+
+def test_palette_add_reuses_entries():
+    palette = Palette(["#000000", (255, 0, 0)])
+    assert palette.add("#ff0000") == 1
+    assert palette.add("00ff00") == 2
+    assert palette.colors == ["#000000", "#ff0000", "#00ff00"]
+    assert palette[2] == "#00ff00"
+
+
+def test_overwriting_one_of_two_identical_entries_keeps_the_other_findable():
+    palette = Palette(["#ff0000", "#00ff00"])
+    palette[1] = "#ff0000"  # now two reds
+    palette[0] = "#0000ff"  # the entry the lookup pointed at
+    assert palette.add("#ff0000") == 1
+    assert palette.add("#0000ff") == 0
+    assert len(palette) == 2
+
+    palette[1] = "#0000ff"  # overwrite the duplicate that is not looked up
+    palette[0] = "#ffffff"
+    assert palette.add("#0000ff") == 1
+    assert palette.add("#ff0000") == 2
+    assert palette.colors == ["#ffffff", "#0000ff", "#ff0000"]
+
+
+def test_palette_expand_and_index_rgb_round_trip():
+    palette = Palette()
+    rgb = bytes([1, 2, 3, 4, 5, 6, 1, 2, 3])
+    indices = palette.index_rgb(rgb)
+    assert list(indices) == [0, 1, 0]
+    assert bytes(palette.expand(indices)) == rgb
+    with pytest.raises(ValueError):
+        palette.expand(bytes([2]))
+
+
+def test_palette_is_bounded():
+    palette = Palette((i, 0, 0) for i in range(MAX_PALETTE_SIZE))
+    with pytest.raises(ValueError):
+        palette.add("#0000ff")
+    assert palette.add((5, 0, 0)) == 5
+
+
+def test_module_palette_mode_follows_palette_swaps():
+    palette = Palette(["#000000", "#ff0000"])
+    module = Module("5x5_clear")
+    module.set_indices([1] * 5 + [0] * 20, palette)
+    module.dirty = False
+    assert module.colors[:6] == ["#ff0000"] * 5 + ["#000000"]
+
+    palette[1] = "#0000ff"
+    assert module.dirty
+    assert module.get_pixel(4, 0) == "#0000ff"
+    module.set_pixel_index(0, 1, 1)
+    assert module.colors[5] == "#0000ff"
+    assert list(module.indices[:6]) == [1] * 6
+
+
+def test_module_leaves_palette_mode_on_direct_colours():
+    palette = Palette(["#000000", "#ff0000"])
+    module = Module("5x5_clear")
+    module.set_indices([1] * 25, palette)
+    palette[1] = "#00ff00"
+    module.set_pixel(0, 0, "#ffffff")
+    assert module.palette is None and module.indices is None
+    palette[1] = "#ff00ff"
+    assert module.colors[:2] == ["#ffffff", "#00ff00"]
+    with pytest.raises(ValueError):
+        module.set_pixel_index(0, 0, 1)
+
+
+def test_module_set_indices_validates():
+    palette = Palette(["#000000"])
+    module = Module("5x5_clear")
+    with pytest.raises(ValueError):
+        module.set_indices([0] * 10, palette)
+    with pytest.raises(ValueError):
+        module.set_indices([1] * 25, palette)
+    with pytest.raises(ValueError):
+        module.set_indices([300] * 25, palette)
+
+
+def test_layout_palette_swap_rerenders_only_palette_modules():
+    layout = Layout("vertical", "bottom", ["5x5_clear", "5x5_clear", "1x1"])
+    layout.palette.extend(["#000000", "#ff0000"])
+    layout.set_module_indices(0, [1] * 25)
+    layout.set_module_colors(1, "#ff0000")
+    layout.render_frame()
+
+    layout.palette[1] = "#00ff00"
+    assert [module.dirty for module in layout.modules] == [True, False, False]
+    expected = Layout("vertical", "bottom", ["5x5_clear", "5x5_clear", "1x1"])
+    expected.set_module_colors(0, "#00ff00")
+    expected.set_module_colors(1, "#ff0000")
+    assert layout.render_frame() == expected.render_frame()
+    assert (layout.get_canvas() == (0, 255, 0)).all(axis=2).sum() == 25
+
+
+def test_layout_to_palette_keeps_picture_and_canvas_writes_leave_palette():
+    layout = Layout("horizontal", "left", ["5x5_clear", "5x5_clear"])
+    layout.set_module_colors(0, ["#ff0000", "#0000ff"] * 12 + ["#ff0000"])
+    layout.set_module_colors(1, "#0000ff")
+    before = layout.render_frame()
+    layout.to_palette()
+    assert layout.palette.colors == ["#ff0000", "#0000ff"]
+    assert layout.render_frame() == before
+
+    layout.fill_rect(5, 0, 1, 1, "#ffffff")
+    layout.palette[1] = "#00ff00"
+    first, second = layout.modules
+    assert first.colors[1] == "#00ff00"
+    assert second.palette is None
+    assert second.colors[:2] == ["#ffffff", "#0000ff"]
@@ -0,0 +1,133 @@
+"""Tests for the coalescing frame scheduler, run against the device simulator."""
+
+import asyncio
+
+import pytest
+
+from yeelight_matrix.async_cube_matrix import AsyncCubeMatrix
+from yeelight_matrix.color import encode_many
+from yeelight_matrix.exceptions import CubeMatrixError
+from yeelight_matrix.scheduler import FrameScheduler
+from yeelight_matrix.simulator import CubeSimulator
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 10))
+
+
+def frame(n):
+    return encode_many([f"#0000{n:02x}"])
+
+
+def test_requests_during_a_send_coalesce_into_the_newest_frame():
+    async def scenario():
+        async with CubeSimulator(latency=0.05) as device:
+            async with AsyncCubeMatrix("127.0.0.1", device.port, music_mode=False) as cube:
+                current = [frame(0)]
+                scheduler = FrameScheduler(cube, lambda: current[0])
+                waiters = []
+                for n in range(10):
+                    current[0] = frame(n)
+                    waiters.append(scheduler.request_draw())
+                    await asyncio.sleep(0.005)
+                await asyncio.gather(*waiters)
+            return device, scheduler
+
+    device, scheduler = run(scenario())
+    # The first request is sent at once; the rest are covered by one more frame.
+    assert device.frames == [frame(0), frame(9)]
+    assert scheduler.frames_sent == 2
+
+
+def test_max_fps_spaces_frames():
+    async def scenario():
+        async with CubeSimulator() as device:
+            async with AsyncCubeMatrix("127.0.0.1", device.port, music_mode=False) as cube:
+                current = [frame(0)]
+                scheduler = FrameScheduler(cube, lambda: current[0], max_fps=20)
+                loop = asyncio.get_running_loop()
+                times = []
+                for n in range(4):
+                    current[0] = frame(n)
+                    await scheduler.draw()
+                    times.append(loop.time())
+            return device, times
+
+    device, times = run(scenario())
+    assert len(device.frames) == 4
+    assert min(b - a for a, b in zip(times, times[1:])) >= 0.045
+
+
+def test_unchanged_frames_are_suppressed_unless_forced():
+    async def scenario():
+        async with CubeSimulator() as device:
+            async with AsyncCubeMatrix("127.0.0.1", device.port, music_mode=False) as cube:
+                sent = []
+                scheduler = FrameScheduler(cube, lambda: frame(1), on_sent=lambda: sent.append(1))
+                await scheduler.draw()
+                await scheduler.draw()
+                assert not await scheduler.show(frame(1))
+                await scheduler.draw(force=True)
+                assert await scheduler.show(frame(2))
+            return device, scheduler, sent
+
+    device, scheduler, sent = run(scenario())
+    assert device.frames == [frame(1), frame(1), frame(2)]
+    assert scheduler.frames_suppressed == 2
+    assert scheduler.last_frame == frame(2)
+    assert len(sent) == 3
+
+
+def test_send_errors_reach_the_waiting_callers():
+    async def scenario():
+        async with CubeSimulator(rate_limit=1) as device:
+            async with AsyncCubeMatrix("127.0.0.1", device.port, music_mode=False) as cube:
+                current = [frame(0)]
+                scheduler = FrameScheduler(cube, lambda: current[0])
+                await scheduler.draw()
+                current[0] = frame(1)
+                with pytest.raises(CubeMatrixError):
+                    await scheduler.draw()
+                return scheduler
+
+    scheduler = run(scenario())
+    assert scheduler.frames_sent == 1
+
+
+def test_invalidate_resends_the_same_frame_after_a_mode_switch():
+    async def scenario():
+        async with CubeSimulator() as device:
+            async with AsyncCubeMatrix("127.0.0.1", device.port, music_mode=False) as cube:
+                scheduler = FrameScheduler(cube, lambda: frame(1))
+                await cube.set_fx_mode("direct")
+                await scheduler.draw()
+                await cube.set_fx_mode("static")
+                await cube.set_fx_mode("direct")
+                await scheduler.draw()  # not invalidated: suppressed
+                scheduler.invalidate()
+                await scheduler.draw()
+            return device, scheduler
+
+    device, scheduler = run(scenario())
+    assert device.frames == [frame(1), frame(1)]
+    assert device.fx_mode == "direct"
+    assert scheduler.frames_suppressed == 1
+
+
+def test_reconnect_invalidates_the_last_frame():
+    async def scenario():
+        async with CubeSimulator() as device:
+            cube = AsyncCubeMatrix("127.0.0.1", device.port, reconnect_delay=0.01)
+            await cube.connect()
+            scheduler = FrameScheduler(cube, lambda: frame(1))
+            await scheduler.draw()
+            device.drop_connections()
+            while cube.reconnects == 0:
+                await asyncio.sleep(0.01)
+            await scheduler.draw()
+            await cube.close()
+            return scheduler
+
+    scheduler = run(scenario())
+    assert scheduler.frames_sent == 2
+    assert scheduler.frames_suppressed == 0
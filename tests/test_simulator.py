@@ -0,0 +1,93 @@
+"""Tests for the device simulator, and for CubeMatrix driven against it."""
+
+import asyncio
+import time
+
+import pytest
+
+from yeelight_matrix.async_cube_matrix import AsyncCubeMatrix
+from yeelight_matrix.color import encode_many
+from yeelight_matrix.cube_matrix import CubeMatrix
+from yeelight_matrix.exceptions import CubeMatrixError
+from yeelight_matrix.layout import Layout
+from yeelight_matrix.simulator import CubeSimulator, SimulatorThread
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 10))
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_cube_matrix_control_connection():
+    layout = Layout("vertical", "bottom", ["5x5_clear", "1x1"])
+    layout.fill("#123456")
+    with SimulatorThread() as device:
+        cube = CubeMatrix("127.0.0.1", device.port, music_mode=False)
+        cube.set_fx_mode()
+        cube.update_leds(layout.render_frame())
+        cube.set_pixels(["#ff0000"])
+        cube.bulb.turn_on()
+    assert device.simulator.fx_mode == "direct"
+    assert device.simulator.frames == [layout.render_frame(), encode_many(["#ff0000"])]
+    assert device.simulator.properties["power"] == "on"
+
+
+def test_cube_matrix_music_mode():
+    with SimulatorThread() as device:
+        cube = CubeMatrix("127.0.0.1", device.port)
+        _wait_for(lambda: device.simulator.music_mode)
+        for n in range(20):
+            cube.update_leds(f"frame{n}")
+        _wait_for(lambda: len(device.simulator.frames) == 20)
+    assert device.simulator.frames == [f"frame{n}" for n in range(20)]
+
+
+def test_rate_limit_refuses_control_commands():
+    with SimulatorThread(CubeSimulator(rate_limit=3)) as device:
+        cube = CubeMatrix("127.0.0.1", device.port, music_mode=False)
+        for _ in range(3):
+            cube.update_leds("ok")
+        with pytest.raises(CubeMatrixError, match="quota"):
+            cube.update_leds("refused")
+    assert device.simulator.frames == ["ok"] * 3
+    assert device.simulator.rate_limited == 1
+
+
+def test_latency_delays_each_command():
+    async def scenario():
+        async with CubeSimulator(latency=0.02) as device:
+            async with AsyncCubeMatrix("127.0.0.1", device.port, music_mode=False) as cube:
+                start = time.monotonic()
+                for _ in range(3):
+                    await cube.update_leds("frame")
+                return time.monotonic() - start, cube.latency
+
+    elapsed, latency = run(scenario())
+    assert elapsed >= 0.06
+    assert latency >= 0.02
+
+
+def test_packet_loss_drops_commands_reproducibly():
+    async def scenario():
+        async with CubeSimulator(seed=4) as device:
+            async with AsyncCubeMatrix("127.0.0.1", device.port) as cube:
+                device.packet_loss = 0.5
+                for n in range(50):
+                    await cube.update_leds(str(n))
+                for _ in range(200):
+                    if len(device.frames) + device.dropped >= 50:
+                        break
+                    await asyncio.sleep(0.01)
+            return device
+
+    device = run(scenario())
+    again = run(scenario())
+    assert 0 < device.dropped < 50
+    assert len(device.frames) + device.dropped == 50
+    assert again.frames == device.frames